@@ -0,0 +1,64 @@
+"""
+Times the audit command over a user with many stored passwords, a quarter of them reused and a few breached,
+checking breaches against a local breach corpus.
+
+Usage: python benchmarks/auditBenchmark.py [entries]
+"""
+import os
+import sys
+import time
+import hashlib
+import secrets
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from commands.command import Command
+from commands.password.passwordAuditor import PasswordAuditor
+from commands.password.passwordSafetyChecker import SafetyChecker
+from commands.vault.vaultCategoryEnum import VaultCategoryEnum
+from cryptographing.crypting import Crypt
+from cryptographing.vaultKeyring import VaultKeyring
+from storage.breachCorpus import BreachCorpusImporter
+from storage.logStore import LogStore
+from storage.vaultStorage import VaultStorage
+
+def main() -> None:
+    entries: int = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    user: str = "auditBenchmark"
+    categories: list = [category.value for category in VaultCategoryEnum]
+
+    with tempfile.TemporaryDirectory() as directory:
+        dumpPath: str = os.path.join(directory, "dump.txt")
+        with open(dumpPath, "w") as dump:
+            for i in range(100_000):
+                dump.write(f"{hashlib.sha256(f'breached{i}'.encode()).hexdigest()}:{i % 100 + 1}\n")
+        BreachCorpusImporter(os.path.join(directory, "corpus")).importFiles([dumpPath])
+        os.environ[SafetyChecker.CORPUS_ENV] = os.path.join(directory, "corpus")
+
+        VaultStorage.useEngine(LogStore(os.path.join(directory, "vaults")))
+        keyring = VaultKeyring.forUser(user)
+        passwords: list = [f"breached{i}" if i % 100 == 0 else secrets.token_urlsafe(12) for i in range(entries)]
+        passwords = [passwords[i // 4 * 4] if i % 4 == 3 else password for i, password in enumerate(passwords)]
+
+        for index, category in enumerate(categories):
+            VaultStorage.createVault(user, category)
+            share: list = passwords[index::len(categories)]
+            tokens: list = Crypt.encryptMany(share, keyring.cipherFor(category))
+            VaultStorage.applyRecords(user, category, [
+                {"op": "put", "url": f"site{index}-{i}.com", "entry": {"username": "user", "password": token.decode()}}
+                for i, token in enumerate(tokens)
+            ])
+
+        VaultStorage.cache.clear()
+        updates: list = []
+        start: float = time.perf_counter()
+        response = PasswordAuditor.audit(user, Command("audit"), VaultKeyring.forUser(user), updates.append)
+        elapsed: float = time.perf_counter() - start
+
+        print(response.description.split("\n")[0])
+        print(f"{entries} entries audited in {elapsed:.2f}s, {len(updates)} progress updates")
+        SafetyChecker.corpus.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Builds a breach corpus from random SHA-256 hashes with the streaming importer and measures lookup latency
+for breached and unknown passwords, with and without the Bloom filter.
+
+Usage: python benchmarks/breachCorpusBenchmark.py [hashes]
+"""
+import os
+import sys
+import time
+import hashlib
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from storage.breachCorpus import BreachCorpus, BreachCorpusImporter
+
+def timeLookups(corpus: BreachCorpus, digests: list) -> float:
+    start: float = time.perf_counter()
+    for digest in digests:
+        corpus.lookup(digest)
+    return (time.perf_counter() - start) / len(digests) * 1e6
+
+def main() -> None:
+    hashes: int = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        dumpPath: str = os.path.join(directory, "dump.txt")
+        with open(dumpPath, "w") as dump:
+            for i in range(hashes):
+                dump.write(f"{hashlib.sha256(f'breached{i}'.encode()).hexdigest()}:{i % 100 + 1}\n")
+
+        for falsePositiveRate in (0.001, None):
+            corpusDirectory: str = os.path.join(directory, f"corpus-{falsePositiveRate}")
+            start: float = time.perf_counter()
+            BreachCorpusImporter(corpusDirectory, runRecords=max(1, hashes // 8), falsePositiveRate=falsePositiveRate).importFiles([dumpPath])
+            importElapsed: float = time.perf_counter() - start
+
+            corpus = BreachCorpus(corpusDirectory)
+            breached: list = [hashlib.sha256(f"breached{i}".encode()).digest() for i in range(0, hashes, max(1, hashes // 10_000))]
+            unknown: list = [hashlib.sha256(f"unknown{i}".encode()).digest() for i in range(10_000)]
+
+            print(f"bloom={falsePositiveRate}: imported {hashes} hashes in {importElapsed:.1f}s, "
+                  f"breached lookup {timeLookups(corpus, breached):.1f} us, unknown lookup {timeLookups(corpus, unknown):.1f} us")
+            corpus.close()
+
+if __name__ == "__main__":
+    main()
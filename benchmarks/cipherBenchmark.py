@@ -0,0 +1,42 @@
+"""
+Compares the legacy Fernet token format with the versioned AES-GCM format: per-entry encrypt and decrypt
+throughput, and the size of a stored entry as written to the vault.
+
+Usage: python benchmarks/cipherBenchmark.py [entries]
+"""
+import os
+import sys
+import json
+import time
+import secrets
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from cryptography.fernet import Fernet
+from cryptographing.vaultCipher import VaultCipher
+
+def measure(name: str, cipher, passwords: list) -> None:
+    start: float = time.perf_counter()
+    tokens: list = [cipher.encrypt(password) for password in passwords]
+    encryptElapsed: float = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for token in tokens:
+        cipher.decrypt(token)
+    decryptElapsed: float = time.perf_counter() - start
+
+    entrySize: float = sum(len(json.dumps({"username": "user@example.com", "password": token.decode()})) for token in tokens) / len(tokens)
+    print(f"{name:>8}: encrypt {len(passwords) / encryptElapsed:9.0f}/s, decrypt {len(passwords) / decryptElapsed:9.0f}/s, "
+          f"token {sum(len(token) for token in tokens) / len(tokens):5.1f} B, stored entry {entrySize:5.1f} B")
+
+def main() -> None:
+    entries: int = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    key: bytes = VaultCipher.generateKey()
+    passwords: list = [secrets.token_urlsafe(12).encode() for _ in range(entries)]
+
+    print(f"{entries} passwords of {len(passwords[0])} characters")
+    measure("fernet", Fernet(key), passwords)
+    measure("aes-gcm", VaultCipher(key), passwords)
+
+if __name__ == "__main__":
+    main()
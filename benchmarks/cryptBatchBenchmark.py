@@ -0,0 +1,52 @@
+"""
+Measures how Crypt.encryptMany/decryptMany scale with the number of threads, against the one-entry-at-a-time
+Crypt.encryptPassword/decryptPassword baseline that builds a new cipher per call.
+
+Usage: python benchmarks/cryptBatchBenchmark.py [entries] [max threads]
+"""
+import os
+import sys
+import time
+import secrets
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from cryptographing.crypting import Crypt
+from cryptographing.vaultCipher import VaultCipher
+
+def main() -> None:
+    entries: int = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    maxThreads: int = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    key: bytes = VaultCipher.generateKey()
+    cipher = VaultCipher(key)
+    passwords: list = [secrets.token_urlsafe(12) for _ in range(entries)]
+    print(f"{entries} passwords, {os.cpu_count()} CPU(s)")
+
+    sample: list = passwords[:min(entries, 10_000)]
+    start: float = time.perf_counter()
+    tokens: list = [Crypt.encryptPassword(password, key).decode() for password in sample]
+    for token in tokens:
+        Crypt.decryptPassword(token, key)
+    elapsed: float = time.perf_counter() - start
+    print(f"  per-entry calls: {2 * len(sample) / elapsed:10.0f} operations/s")
+
+    threads: int = 1
+    while threads <= maxThreads:
+        Crypt.configureBatch(threads)
+
+        start = time.perf_counter()
+        tokens = [token.decode() for token in Crypt.encryptMany(passwords, cipher)]
+        encryptElapsed: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decrypted: list = Crypt.decryptMany(tokens, cipher)
+        decryptElapsed: float = time.perf_counter() - start
+
+        assert decrypted == passwords
+        print(f"  {threads:3} thread(s): encrypt {entries / encryptElapsed:10.0f}/s, decrypt {entries / decryptElapsed:10.0f}/s")
+        threads *= 2
+
+    Crypt.configureBatch(Crypt.DEFAULT_BATCH_WORKERS)
+
+if __name__ == "__main__":
+    main()
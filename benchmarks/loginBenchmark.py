@@ -0,0 +1,37 @@
+"""
+Measures how many logins per second the argon2 login hash sustains at each cost setting,
+with several clients logging in concurrently.
+
+Usage: python benchmarks/loginBenchmark.py [logins per profile] [concurrent clients]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from cryptographing.loginHasher import LoginHasher
+
+def main() -> None:
+    logins: int = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    clients: int = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    print(f"{LoginHasher.workers} hashing process(es), {clients} concurrent client(s), {logins} logins per profile")
+
+    for profile, cost in LoginHasher.COST_PROFILES.items():
+        LoginHasher.configure(profile)
+        storedHash: str = LoginHasher.hashPassword("correct horse battery staple")
+
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            start: float = time.perf_counter()
+            results = list(executor.map(lambda _: LoginHasher.verifyPassword(storedHash, "correct horse battery staple"), range(logins)))
+            elapsed: float = time.perf_counter() - start
+
+        assert all(isValid for isValid, _ in results)
+        print(f"{profile:>8} (t={cost['timeCost']}, m={cost['memoryCost']} KiB, p={cost['parallelism']}): "
+              f"{logins / elapsed:8.1f} logins/s, {elapsed / logins * 1000:7.1f} ms per login")
+
+    LoginHasher.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Measures the latency of URL searches against a single user with many stored entries.
+
+Usage: python benchmarks/searchBenchmark.py [entries]
+"""
+import os
+import sys
+import time
+import random
+import string
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from storage.searchIndex import SearchIndex
+
+CATEGORIES = ["default", "work", "social", "finance", "shopping"]
+QUERIES = ["github", "git", "mail.goo", "githb.com", "example-123", "zz", "a"]
+
+def randomUrl(rng: random.Random) -> str:
+    name: str = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+    return f"https://www.{name}-{rng.randint(0, 999)}.{rng.choice(['com', 'org', 'net', 'io'])}"
+
+def main() -> None:
+    entries: int = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(42)
+    vaults: dict = {category: [] for category in CATEGORIES}
+    for _ in range(entries):
+        vaults[rng.choice(CATEGORIES)].append(randomUrl(rng))
+    vaults["work"] += ["https://github.com", "gist.github.com", "mail.google.com"]
+
+    index = SearchIndex()
+    start: float = time.perf_counter()
+    index.search("bench", "warmup", lambda user: vaults)
+    print(f"Indexed {entries} entries in {time.perf_counter() - start:.2f}s")
+
+    rounds: int = 200
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            page, hasMore = index.search("bench", query, lambda user: vaults)
+        elapsed: float = (time.perf_counter() - start) / rounds
+        print(f"{query!r:>14}: {elapsed * 1000:.3f} ms per first page, {len(page)} match(es){' and more' if hasMore else ''}")
+
+if __name__ == "__main__":
+    main()
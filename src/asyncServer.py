@@ -0,0 +1,155 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from clientSession import ClientSession
+from commands.command import Command
+from response.response import Response
+from serverlog.connectionStats import ConnectionStats
+from protocol.framing import FramingError, MessageFraming
+from cryptographing.loginHasher import LoginHasher
+from serverlog.logger import Logger
+
+class AsyncServer:
+    """
+    An asyncio based server that serves every client from a single event loop.
+    Idle connections only cost a coroutine, while the blocking vault and crypto work
+    of each command runs on a bounded thread pool. Logins and registrations wait for their password hash
+    on a separate pool, so a burst of them never holds the threads serving vault commands.
+
+    Attributes:
+        host (str): The IP address the server binds to.
+        port (int): The port the server listens on (resolved after startup when 0 is given).
+        maxConnections (int): Clients served at once before new ones get a "server busy" response.
+        stats (ConnectionStats): Active and rejected connection counters.
+    """
+
+    DEFAULT_MAX_WORKERS: int = 8
+    DEFAULT_MAX_CONNECTIONS: int = 4096
+    AUTHENTICATION_COMMANDS: tuple = ("login", "register")
+    BUSY_MESSAGE: str = "Server is busy, please try again later."
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 5555, maxWorkers: int = DEFAULT_MAX_WORKERS,
+                 maxConnections: int = DEFAULT_MAX_CONNECTIONS, loginWorkers: Optional[int] = None) -> None:
+        """
+        Initializes the server; the listening socket is created once the event loop runs.
+
+        :param host: The IP address to bind the server to.
+        :param port: The port to listen on, 0 picks a free port.
+        :param maxWorkers: Number of threads executing blocking command work.
+        :param maxConnections: Number of clients served at once.
+        :param loginWorkers: Number of threads waiting for password hashes, by default one per hashing process.
+        """
+        self.host = host
+        self.port = port
+        self.maxConnections = maxConnections
+        self.stats = ConnectionStats()
+        self.workerPool = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix="vault-worker")
+        self.loginPool = ThreadPoolExecutor(max_workers=loginWorkers or LoginHasher.workers, thread_name_prefix="login-worker")
+        self.server: Optional[asyncio.base_events.Server] = None
+
+    @property
+    def connectionsCount(self) -> int:
+        """
+        Returns the number of connections currently being served.
+        """
+        return self.stats.active
+
+    def getStats(self) -> dict:
+        """
+        Returns the current connection counters.
+
+        :return: Dictionary with the active, queued, rejected and served counts.
+        """
+        return self.stats.snapshot()
+
+    def executorFor(self, message: str) -> ThreadPoolExecutor:
+        """
+        Picks the pool a command runs on: the login pool for commands that hash a password, the worker pool
+        for everything else, including messages that cannot be parsed.
+
+        :param message: JSON string received from the client.
+        :return: The executor.
+        """
+        try:
+            commandType = Command.fromJson(message).commandType
+        except (ValueError, KeyError, TypeError):
+            return self.workerPool
+        return self.loginPool if commandType in AsyncServer.AUTHENTICATION_COMMANDS else self.workerPool
+
+    async def handleClient(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Handles communication with a connected client, processing commands until the connection is closed.
+
+        :param reader: Stream the client's commands are read from.
+        :param writer: Stream the responses are written to.
+        """
+        address = writer.get_extra_info("peername")
+        session = ClientSession(address)
+        loop = asyncio.get_running_loop()
+
+        def sendProgress(update: Response) -> None:
+            asyncio.run_coroutine_threadsafe(MessageFraming.writeMessageAsync(writer, update.toJson()), loop).result()
+
+        if self.stats.active >= self.maxConnections:
+            self.stats.connectionRejected()
+            try:
+                await MessageFraming.writeMessageAsync(writer, Response(False, AsyncServer.BUSY_MESSAGE).toJson())
+            except ConnectionError:
+                pass
+            writer.close()
+            print(f"Rejected connection from {address}, {self.stats}")
+            return
+
+        self.stats.connectionStarted(wasQueued=False)
+        print(f"Accepted connection from {address}, {self.stats}")
+
+        try:
+            while True:
+                message = await MessageFraming.readMessageAsync(reader)
+                if message is None:
+                    break
+
+                response = await loop.run_in_executor(self.executorFor(message), session.processMessage, message, sendProgress)
+                await MessageFraming.writeMessageAsync(writer, response.toJson())
+        except (ConnectionError, FramingError):
+            pass
+        finally:
+            session.close()
+            self.stats.connectionFinished()
+            print(f"Client {address} has just closed their connection, {self.stats}")
+            writer.close()
+
+    async def startServing(self) -> None:
+        """
+        Binds the listening socket and starts accepting clients on the running event loop.
+        """
+        self.server = await asyncio.start_server(self.handleClient, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        print(f"Server listening on {self.host}:{self.port} (async mode)...")
+
+    async def serve(self) -> None:
+        """
+        Starts the server and serves clients until cancelled.
+        """
+        await self.startServing()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def stop(self) -> None:
+        """
+        Stops accepting clients and releases the worker pool.
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.workerPool.shutdown(wait=False)
+        self.loginPool.shutdown(wait=False)
+        LoginHasher.shutdown()
+        Logger.shutdown()
+
+    def start(self) -> None:
+        """
+        Runs the event loop, accepting client connections until interrupted.
+        """
+        asyncio.run(self.serve())
@@ -1,9 +1,16 @@
 import socket
+from collections import deque
+from typing import List
 from commands.password.passwordSafetyChecker import SafetyChecker
 from commands.command import Command
+from commands.pagination import Pagination
 from response.response import Response
+from protocol.framing import FramedSocket
 
 class EchoClient:
+    MAX_IN_FLIGHT: int = 32
+    MAX_IN_FLIGHT_BYTES: int = 64 * 1024
+
     def __init__(self, host: str = "127.0.0.1", port: int = 5555) -> None:
         """
         Initializes the EchoClient with a given host and port.
@@ -13,6 +20,7 @@ class EchoClient:
         """
         self.client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.client.connect((host, port))
+        self.connection = FramedSocket(self.client)
         self.isLoggedIn: bool = False
 
     def initiateConnection(self) -> None:
@@ -20,9 +28,10 @@ class EchoClient:
         Initiates the client connection and manages user authentication and commands.
         """
         self.promptWelcomeMessage()
-        self.authenticateUser()
 
         try:
+            self.authenticateUser()
+
             while self.isLoggedIn:
                 print("-----------------------------------------------------")
                 message: str = input("$: ").strip()
@@ -35,14 +44,14 @@ class EchoClient:
                     continue
 
                 if command.commandType == "disconnect":
-                    self.client.send(Command("logout").toJson().encode())
+                    self.connection.sendMessage(Command("logout").toJson())
                     break
                 elif command.commandType == "help":
                     self.listCommands()
                     continue
                 elif command.commandType == "logout":
                     self.isLoggedIn = False
-                    self.client.send(Command("logout").toJson().encode())
+                    print(self.sendCommand(Command("logout")).description)
                     self.authenticateUser()
                     continue
 
@@ -52,18 +61,115 @@ class EchoClient:
                         print(response.description)
                         continue
 
-                self.client.send(command.toJson().encode())
-                responseJson: str = self.client.recv(1024).decode()
-                responseDeserialized = Response.fromJson(responseJson)
+                responseDeserialized = self.sendCommand(command)
 
                 print(responseDeserialized.description)
+
+                while responseDeserialized.nextCursor is not None and self.promptNextPage():
+                    responseDeserialized = self.sendCommand(self.nextPageCommand(command, responseDeserialized.nextCursor))
+                    print(responseDeserialized.description)
+
                 print("-----------------------------------------------------")
+        except OSError:
+            print("The connection to the server was lost.")
         finally:
-            self.client.close()
+            self.connection.close()
+
+    def sendCommand(self, command: Command) -> Response:
+        """
+        Sends a single command to the server and waits for its response.
+
+        :param command: The command to send.
+        :return: The server's response.
+        """
+        return self.pipeline([command])[0]
+
+    def pipeline(self, commands: List[Command]) -> List[Response]:
+        """
+        Sends several commands back to back and collects their responses, saving a network round trip per
+        command. The server answers in the same order.
+        At most MAX_IN_FLIGHT commands, holding at most MAX_IN_FLIGHT_BYTES, are sent ahead of their replies. The server
+        answers each command as it arrives, so sending a whole large pipeline first would fill both socket buffers
+        and leave client and server blocked on each other's writes.
+        Partial responses streamed by long-running commands are printed as progress.
+
+        :param commands: The commands to send, in order.
+        :return: The responses, in the same order as the commands.
+        """
+        messages: List[str] = [command.toJson() for command in commands]
+        responses: List[Response] = []
+        inFlight: deque = deque()
+        sent: int = 0
+
+        while len(responses) < len(messages):
+            window: List[str] = []
+            while sent < len(messages) and len(inFlight) < EchoClient.MAX_IN_FLIGHT:
+                if inFlight and sum(inFlight) + len(messages[sent]) > EchoClient.MAX_IN_FLIGHT_BYTES:
+                    break
+                window.append(messages[sent])
+                inFlight.append(len(messages[sent]))
+                sent += 1
+            if window:
+                self.connection.sendMessages(window)
+
+            answer = self.connection.receiveMessage()
+            if answer is None:
+                raise ConnectionError("The server closed the connection.")
+
+            response = Response.fromJson(answer)
+            if response.partial:
+                print(response.description)
+                continue
+            responses.append(response)
+            inFlight.popleft()
+
+        return responses
+
+    def sendBatch(self, commands: List[Command]) -> List[Response]:
+        """
+        Sends several vault commands as one batch, so the server loads and writes each vault only once.
+
+        :param commands: The commands to execute, in order.
+        :return: One response per command, in the same order.
+        """
+        response = self.sendCommand(Command.createBatch(commands))
+
+        if response.results is None:
+            return [response] * len(commands)
+
+        return response.results
+
+    @staticmethod
+    def promptNextPage() -> bool:
+        """
+        Asks the user whether the next page of a listing should be fetched.
+
+        :return: True if the user wants to see more.
+        """
+        user_choice: str = ""
+        while user_choice not in ("yes", "no"):
+            user_choice = input("More results are available. Show the next page? (yes/no): ").strip().lower()
+
+        return user_choice == "yes"
+
+    @staticmethod
+    def nextPageCommand(command: Command, cursor: str) -> Command:
+        """
+        Builds the command fetching the page that follows a paginated response.
+
+        :param command: The listing command that was sent, e.g. list-category or list-vaults.
+        :param cursor: The nextCursor of the last response.
+        :return: The same listing command, continuing after the cursor.
+        """
+        fixedParameters: int = 1 if command.commandType == "list-category" else 0
+        pageSize: str = command.parameters[fixedParameters] if len(command.parameters) > fixedParameters else str(Pagination.DEFAULT_PAGE_SIZE)
+
+        return Command(command.commandType, command.parameters[:fixedParameters] + [pageSize, cursor])
 
     def checkSafety(self, command: Command) -> Response:
         """
-        Checks the security of a password before saving or updating it.
+        Checks the security of a password before saving or updating it: its strength locally, then whether it
+        was breached when a breach corpus or API key is configured.
         
         :param command: The command object containing the password parameters.
         :return: Response indicating whether the password is safe to proceed.
@@ -71,7 +177,9 @@ class EchoClient:
         if len(command.parameters) < 3:
             return Response(False, "No password was provided!")
 
-        securityStatusResponse = SafetyChecker.checkPasswordSecurity(command.parameters[2])
+        securityStatusResponse = SafetyChecker.checkPasswordStrength(command.parameters[2])
+        if securityStatusResponse.status and SafetyChecker.breachCheckConfigured():
+            securityStatusResponse = SafetyChecker.checkPasswordSecurity(command.parameters[2])
 
         if not securityStatusResponse.status:
             user_choice: str = ""
@@ -103,10 +211,7 @@ class EchoClient:
                 self.invalidActionPrompt()
                 continue
 
-            self.client.send(command.toJson().encode())
-            answer: str = self.client.recv(1024).decode()
-
-            response = Response.fromJson(answer)
+            response = self.sendCommand(command)
 
             if response.status:
                 self.isLoggedIn = True
@@ -0,0 +1,73 @@
+from typing import Callable, Optional
+from commands.command import Command
+from response.response import Response
+from serverlog.logger import Logger
+from commands.commandExecutor import CommandExecutor
+from storage.vaultStorage import VaultStorage
+from cryptographing.crypting import Crypt
+
+class ClientSession:
+    """
+    Holds the state of a single client connection and turns incoming command messages into responses.
+    Shared by the threaded and the asyncio server so both speak exactly the same protocol.
+
+    Attributes:
+        address (tuple[str, int]): The client's address (IP, port).
+        executor (CommandExecutor): The executor bound to the currently authenticated user.
+    """
+
+    def __init__(self, address: tuple[str, int]) -> None:
+        """
+        Initializes an unauthenticated session for a newly connected client.
+
+        :param address: The client's address (IP, port).
+        """
+        self.address = address
+        self.executor = CommandExecutor("")
+
+    @property
+    def currentUser(self) -> str:
+        """
+        Returns the username bound to the session, or an empty string before login.
+        """
+        return self.executor.currentUser
+
+    def processMessage(self, message: str, progress: Optional[Callable[[Response], None]] = None) -> Response:
+        """
+        Executes a single serialized command and logs its outcome.
+        Every command gets exactly one final response, so clients can pipeline commands and match replies by order;
+        long-running commands may send partial responses through `progress` before it.
+
+        :param message: JSON string received from the client.
+        :param progress: Sends a partial response to the client right away.
+        :return: The Response to send back.
+        """
+        command = Command.fromJson(message)
+
+        if command.commandType == "logout":
+            response = Response(True, f"User {self.executor.currentUser} has logged out!")
+            Logger.log(self.executor.currentUser, "logout", response)
+            self.close()
+            return response
+
+        response = self.executor.executeOperation(command, progress)
+
+        if response.status and command.commandType in ("login", "register"):
+            self.close()
+            self.executor = CommandExecutor(command.parameters[0])
+            VaultStorage.warmCache(self.executor.currentUser)
+
+        if response.status or command.commandType != "register":
+            Logger.log(self.executor.currentUser, command.commandType, response)
+
+        return response
+
+    def close(self) -> None:
+        """
+        Ends the authenticated part of the session: the user's key is dropped and the session becomes anonymous.
+        Called on logout and when the client disconnects.
+        """
+        if self.executor.currentUser:
+            self.executor.keyring.lock()
+            Crypt.dropCipher(self.executor.currentUser)
+        self.executor = CommandExecutor("")
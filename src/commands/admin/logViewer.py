@@ -0,0 +1,112 @@
+import os
+import datetime
+from typing import Callable, List, Optional, Tuple
+
+from response.response import Response
+from serverlog.logger import Logger
+
+class LogViewer:
+    """
+    Lets administrators read the audit log of one user in a time window.
+    The records are streamed as partial responses of CHUNK_SIZE lines while the log is being read, so neither the
+    server nor the client ever holds the user's whole history.
+    Administrators are the users named, comma separated, by the PASSWORD_VAULT_ADMINS environment variable.
+    """
+
+    ADMINS_ENV: str = "PASSWORD_VAULT_ADMINS"
+    CHUNK_SIZE: int = 200
+
+    @staticmethod
+    def isAdmin(user: str) -> bool:
+        """
+        Checks whether a user is an administrator.
+
+        :param user: The username.
+        :return: True if the user is listed in PASSWORD_VAULT_ADMINS.
+        """
+        admins: List[str] = [admin.strip() for admin in os.getenv(LogViewer.ADMINS_ENV, "").split(",")]
+        return bool(user) and user in admins
+
+    @staticmethod
+    def parseTime(text: str, endOfDay: bool) -> float:
+        """
+        Parses an ISO 8601 date or date and time, in the server's local time unless it names a time zone.
+
+        :param text: The date (2026-10-18) or date and time (2026-10-18T14:30).
+        :param endOfDay: Whether a bare date stands for the end of that day rather than its start.
+        :return: Seconds since the epoch.
+        :raises ValueError: If the text is not an ISO 8601 date.
+        """
+        moment = datetime.datetime.fromisoformat(text)
+        if endOfDay and len(text) == 10:
+            moment += datetime.timedelta(days=1, microseconds=-1)
+        return moment.timestamp()
+
+    @staticmethod
+    def parseWindow(parameters: List[str]) -> Tuple[float, float]:
+        """
+        Parses the optional start and end of the time window.
+
+        :param parameters: [from (optional), to (optional)].
+        :return: The window, from the first record to now when not given.
+        :raises ValueError: If a bound is not an ISO 8601 date or the window is empty.
+        """
+        start: float = LogViewer.parseTime(parameters[0], endOfDay=False) if len(parameters) > 0 else 0.0
+        end: float = LogViewer.parseTime(parameters[1], endOfDay=True) if len(parameters) > 1 else datetime.datetime.now().timestamp()
+        if start > end:
+            raise ValueError("the start of the window is after its end")
+        return start, end
+
+    @staticmethod
+    def formatRecord(record: dict) -> str:
+        """
+        Formats a record as one readable line.
+        """
+        timestamp: str = datetime.datetime.fromtimestamp(record["ts"]).strftime("%Y-%m-%d %H:%M:%S")
+        return (f"[{timestamp}] User: {record['user']} | Command: {record.get('command')} | "
+                f"Status: {'Success' if record.get('status') else 'Failed'} | Message: {record.get('message')}")
+
+    @staticmethod
+    def viewLogs(user: str, command, progress: Optional[Callable[[Response], None]] = None) -> Response:
+        """
+        Streams the log records of a user in a time window.
+
+        :param user: The administrator running the command.
+        :param command: Command object with parameters [user, from (optional), to (optional)].
+        :param progress: Receives the records, CHUNK_SIZE lines per partial Response. Without it only the first
+                         CHUNK_SIZE records are returned.
+        :return: Response object with the number of records found, or failure message.
+        """
+        if not LogViewer.isAdmin(user):
+            return Response(False, "Only administrators can read the logs.")
+
+        if not 1 <= len(command.parameters) <= 3:
+            return Response(False, "Invalid parameters. Expected: user, [optional: from], [optional: to].")
+
+        try:
+            start, end = LogViewer.parseWindow(command.parameters[1:])
+        except ValueError as e:
+            return Response(False, f"Invalid time window: {str(e)}")
+
+        loggedUser: str = command.parameters[0]
+        lines: List[str] = []
+        found: int = 0
+
+        for record in Logger.query(loggedUser, start, end):
+            found += 1
+            if progress is not None:
+                lines.append(LogViewer.formatRecord(record))
+                if len(lines) == LogViewer.CHUNK_SIZE:
+                    progress(Response(True, "\n".join(lines), partial=True))
+                    lines = []
+            elif len(lines) < LogViewer.CHUNK_SIZE:
+                lines.append(LogViewer.formatRecord(record))
+
+        if progress is not None and lines:
+            progress(Response(True, "\n".join(lines), partial=True))
+            lines = []
+
+        summary: str = f"Found {found} log record(s) of '{loggedUser}'."
+        if lines:
+            summary = "\n".join(lines + [summary + (f" Showing the first {len(lines)}." if found > len(lines) else "")])
+        return Response(True, summary)
@@ -1,20 +1,21 @@
-import os
 import json
+from typing import Optional
 from cryptographing.crypting import Crypt
+from cryptographing.loginHasher import LoginHasher
 from response.response import Response
-from commands.vault.vaultCreator import VaultCreator
+from storage.accountStore import AccountStore
 
 class Login:
     """
-    Handles user authentication by verifying stored encrypted credentials.
+    Handles user authentication by verifying the stored argon2 password hash.
+    Accounts created before password hashing still hold a Fernet-encrypted password; they are
+    verified the old way once and then upgraded to a hash.
     """
 
-    ACCOUNTS_FILE: str = VaultCreator.VAULTS_BASE_DIR + "/ApplicationStorage/accounts/accounts.json"
-
     @staticmethod
     def loginUser(command) -> Response:
         """
-        Authenticates a user by checking the stored encrypted password.
+        Authenticates a user by checking the stored password hash.
 
         :param command: Command object containing parameters [username, password].
         :return: Response object indicating success or failure.
@@ -25,28 +26,52 @@ class Login:
         username: str = command.parameters[0]
         password: str = command.parameters[1]
 
-        if not os.path.exists(Login.ACCOUNTS_FILE):
-            return Response(False, "No registered users found. Please register first.")
-
         try:
-            with open(Login.ACCOUNTS_FILE, "r") as file:
-                accounts: dict = json.load(file)
+            if not AccountStore.hasAccounts():
+                return Response(False, "No registered users found. Please register first.")
+            account: Optional[dict] = AccountStore.getAccount(username)
         except json.JSONDecodeError:
             return Response(False, "Error reading account data. The file may be corrupted.")
 
-        if username not in accounts:
+        if account is None:
             return Response(False, f"User {username} was not found, please try again!")
 
-        encrypted_password: str = accounts[username]["password"]
+        if "passwordHash" in account:
+            isValid, newHash = LoginHasher.verifyPassword(account["passwordHash"], password)
+        else:
+            try:
+                isValid, newHash = Login.verifyLegacyPassword(username, account, password)
+            except ValueError:
+                return Response(False, "Failed to decrypt password. Possible data corruption.")
+
+        if not isValid:
+            return Response(False, "Wrong password, please try again!")
+
+        if newHash is not None:
+            updatedAccount: dict = {key: value for key, value in account.items() if key != "password"}
+            AccountStore.updateAccount(username, {**updatedAccount, "passwordHash": newHash})
+
+        return Response(True, f"You have successfully logged in! Welcome, {username}!")
 
+    @staticmethod
+    def verifyLegacyPassword(username: str, account: dict, password: str) -> tuple:
+        """
+        Verifies an account that still stores its password Fernet-encrypted with a username-derived key.
+
+        :param username: The account's username.
+        :param account: The stored account record.
+        :param password: The plaintext password to check.
+        :return: (whether the password matches, argon2 hash replacing the encrypted password).
+        :raises ValueError: If the stored password cannot be decrypted.
+        """
         encryptionKey: bytes = Crypt.generateKey(username)
 
         try:
-            decryptedPassword: str = Crypt.decryptPassword(encrypted_password, encryptionKey)
+            decryptedPassword: str = Crypt.decryptPassword(account["password"], encryptionKey)
         except Exception:
-            return Response(False, "Failed to decrypt password. Possible data corruption.")
+            raise ValueError("The stored password could not be decrypted.")
 
-        if decryptedPassword == password:
-            return Response(True, f"You have successfully logged in! Welcome, {username}!")
+        if decryptedPassword != password:
+            return False, None
 
-        return Response(False, "Wrong password, please try again!")
+        return True, LoginHasher.hashPassword(password)
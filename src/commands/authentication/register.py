@@ -1,20 +1,17 @@
-import os
 import json
-from cryptographing.crypting import Crypt
+from cryptographing.loginHasher import LoginHasher
 from response.response import Response
-from commands.vault.vaultCreator import VaultCreator
+from storage.accountStore import AccountStore
 
 class Register:
     """
-    Handles user registration by storing encrypted credentials in a JSON file.
+    Handles user registration by storing an argon2 hash of the password in the account store.
     """
-    
-    ACCOUNTS_FILE: str = VaultCreator.VAULTS_BASE_DIR + "/ApplicationStorage/accounts/accounts.json"
 
     @staticmethod
     def registerUser(command) -> Response:
         """
-        Registers a new user by storing their encrypted password.
+        Registers a new user by storing a hash of their password.
 
         :param command: Command object containing parameters [username, password, confirm-password].
         :return: Response object indicating success or failure.
@@ -29,27 +26,15 @@ class Register:
         if password != confPassword:
             return Response(False, "<password> and <confirm-password> do not match!")
 
-        accounts: dict = {}
+        try:
+            if AccountStore.accountExists(username):
+                return Response(False, f"User {username} already exists!")
+        except json.JSONDecodeError:
+            return Response(False, "Error reading account data. The file may be corrupted.")
 
-        if os.path.exists(Register.ACCOUNTS_FILE):
-            with open(Register.ACCOUNTS_FILE, "r") as file:
-                try:
-                    accounts = json.load(file)
-                except json.JSONDecodeError:
-                    accounts = {}
+        passwordHash: str = LoginHasher.hashPassword(password)
 
-        if username in accounts:
+        if not AccountStore.addAccount(username, {"passwordHash": passwordHash}):
             return Response(False, f"User {username} already exists!")
 
-        encryptionKey: bytes = Crypt.generateKey(username)
-
-        encryptedPassword: bytes = Crypt.encryptPassword(password, encryptionKey)
-
-        accounts[username] = {"password": encryptedPassword.decode()}
-
-        os.makedirs(os.path.dirname(Register.ACCOUNTS_FILE), exist_ok=True)
-        
-        with open(Register.ACCOUNTS_FILE, "w") as file:
-            json.dump(accounts, file, indent=4)
-
         return Response(True, f"Registration successful! Welcome aboard, {username}!")
@@ -50,6 +50,24 @@ class Command:
         data = json.loads(json_str)
         return Command(commandType=data["commandType"], parameters=data["parameters"])
 
+    @staticmethod
+    def createBatch(commands: List["Command"]) -> "Command":
+        """
+        Wraps several commands into a single batch command, executed by the server in one go.
+
+        :param commands: The commands to execute, in order.
+        :return: A Command of type "batch" whose parameters are the serialized commands.
+        """
+        return Command(commandType="batch", parameters=[command.toJson() for command in commands])
+
+    def getBatchCommands(self) -> List["Command"]:
+        """
+        Deserializes the commands carried by a batch command.
+
+        :return: List of the wrapped Command objects, in order.
+        """
+        return [Command.fromJson(parameter) for parameter in self.parameters]
+
     @staticmethod
     def getCommandsList() -> List[str]:
         """
@@ -58,9 +76,9 @@ class Command:
         :return: List of command names.
         """
         return [
-            "help", "save-password", "generate-password", "get",
-            "remove-all", "remove-specific", "list-category",
-            "list-vaults", "update-entry", "logout", "disconnect"
+            "help", "save-password", "generate-password", "generate-batch", "get",
+            "find", "search", "remove-all", "remove-specific", "list-category",
+            "list-vaults", "update-entry", "audit", "logs", "logout", "disconnect"
         ]
 
     @staticmethod
@@ -76,12 +94,17 @@ class Command:
             "logout",
             "save-password <URL> <Username> <Password> [optional: Category]",
             "generate-password <URL>, <Username>, [optional: category].",
+            "generate-batch <Category> <Username> <URL>... [optional: length=<n>] [optional: classes=<luds>] [optional: no-ambiguous] [optional: pronounceable]",
             "get <password/user/both> <URL> <Category>",
+            "find <URL>",
+            "search <pattern> [optional: page]",
             "remove-all <URL>",
             "remove-specific <URL> <Username> <Category>",
-            "list-category <Category>",
-            "list-vaults",
-            "update-entry <URL> <Username> <Password> <Category>"
+            "list-category <Category> [optional: pageSize] [optional: cursor]",
+            "list-vaults [optional: pageSize] [optional: cursor]",
+            "update-entry <URL> <Username> <Password> <Category>",
+            "audit",
+            "logs <User> [optional: from, e.g. 2026-10-18] [optional: to, e.g. 2026-10-18T18:00] (administrators only)"
         ]
 
     @staticmethod
@@ -1,27 +1,43 @@
+from typing import Callable, Optional
+from commands.admin.logViewer import LogViewer
 from commands.authentication.login import Login
 from commands.entry.entryExractor import Extractor
 from commands.password.passwordGenerator import PasswordGenerator
 from commands.entry.entryRemover import EntryRemover
 from commands.password.passwordUpdater import PasswordUpdater
+from commands.password.passwordAuditor import PasswordAuditor
 from commands.authentication.register import Register
 from commands.entry.entrySaver import EntrySaver
 from commands.vault.vaultCreator import VaultCreator
 from commands.vault.vaultLister import VaultLister
+from response.response import Response
+from storage.vaultStorage import VaultStorage
+from cryptographing.crypting import Crypt
+from cryptographing.vaultKeyring import VaultKeyring
 
 class CommandExecutor:
+    BATCHABLE_COMMANDS: tuple = (
+        "save-password", "generate-password", "generate-batch", "get", "find", "search",
+        "remove-all", "remove-specific", "list-category", "list-vaults", "update-entry"
+    )
+    MAX_BATCH_SIZE: int = 5000
+
     def __init__(self, user: str):
         """
-        Initializes the CommandExecutor with the current user.
+        Initializes the CommandExecutor with the current user and derives the user's cipher once for the session.
+        Vault data keys are unwrapped by the session's keyring when a vault is first used.
 
         :param user: The username of the currently logged-in user.
         """
         self.currentUser = user
+        self.keyring = VaultKeyring(user, Crypt.getCipher(user)) if user else None
 
-    def executeOperation(self, command):
+    def executeOperation(self, command, progress: Optional[Callable[[Response], None]] = None):
         """
         Executes the requested command based on command type.
 
         :param command: The command object containing the operation type and parameters.
+        :param progress: Receives the partial responses a long-running command streams before its final one.
         :return: Response object indicating the success/failure of the operation.
         """
         if command.commandType == "login":
@@ -32,11 +48,17 @@ class CommandExecutor:
                 VaultCreator.createVault(command.parameters[0])
             return response
         elif command.commandType == "save-password":
-            return EntrySaver.savePassword(self.currentUser, command)
+            return EntrySaver.savePassword(self.currentUser, command, self.keyring)
         elif command.commandType == "generate-password":
-            return PasswordGenerator.generate(self.currentUser, command)
+            return PasswordGenerator.generate(self.currentUser, command, self.keyring)
+        elif command.commandType == "generate-batch":
+            return PasswordGenerator.generateBatch(self.currentUser, command, self.keyring)
         elif command.commandType == "get":
-            return Extractor.extractCredentials(self.currentUser, command)
+            return Extractor.extractCredentials(self.currentUser, command, self.keyring)
+        elif command.commandType == "find":
+            return Extractor.findUrl(self.currentUser, command)
+        elif command.commandType == "search":
+            return Extractor.searchUrls(self.currentUser, command)
         elif command.commandType == "remove-all":
             return EntryRemover.removeAll(self.currentUser, command)
         elif command.commandType == "remove-specific":
@@ -44,6 +66,55 @@ class CommandExecutor:
         elif command.commandType == "list-category":
             return Extractor.listUrlsInCategory(self.currentUser, command)
         elif command.commandType == "list-vaults":
-            return VaultLister.listVaults(self.currentUser)
+            return VaultLister.listVaults(self.currentUser, command)
         elif command.commandType == "update-entry":
-            return PasswordUpdater.updatePassword(self.currentUser, command)
+            return PasswordUpdater.updatePassword(self.currentUser, command, self.keyring)
+        elif command.commandType == "audit":
+            if not self.currentUser:
+                return Response(False, "Please log in before running an audit.")
+            return PasswordAuditor.audit(self.currentUser, command, self.keyring, progress)
+        elif command.commandType == "logs":
+            if not self.currentUser:
+                return Response(False, "Please log in before reading the logs.")
+            return LogViewer.viewLogs(self.currentUser, command, progress)
+        elif command.commandType == "batch":
+            return self.executeBatch(command)
+
+    def executeBatch(self, command) -> Response:
+        """
+        Executes the commands wrapped in a batch command against a single load of each vault.
+        Every vault touched by the batch is read once and, if modified, written back once at the end.
+
+        :param command: The batch command whose parameters are serialized commands.
+        :return: Response summarizing the batch, with one Response per sub-command in its results.
+        """
+        if not self.currentUser:
+            return Response(False, "Please log in before executing a batch.")
+
+        try:
+            subCommands = command.getBatchCommands()
+        except (ValueError, KeyError, TypeError):
+            return Response(False, "Malformed batch, expected a list of serialized commands.")
+
+        if not subCommands:
+            return Response(False, "The batch does not contain any commands.")
+
+        if len(subCommands) > CommandExecutor.MAX_BATCH_SIZE:
+            return Response(False, f"A batch may contain at most {CommandExecutor.MAX_BATCH_SIZE} commands.")
+
+        results: list = []
+
+        try:
+            with VaultStorage.batch() as batch:
+                for subCommand in subCommands:
+                    if subCommand.commandType not in CommandExecutor.BATCHABLE_COMMANDS:
+                        results.append(Response(False, f"Command '{subCommand.commandType}' cannot be used inside a batch."))
+                        continue
+
+                    results.append(self.executeOperation(subCommand))
+        except OSError as e:
+            return Response(False, f"Batch failed while writing the vaults: {str(e)}", results)
+
+        succeeded: int = sum(1 for result in results if result.status)
+        return Response(True, f"Batch executed: {succeeded}/{len(results)} commands succeeded, "
+                              f"{batch.loads} vault(s) loaded, {batch.writes} vault(s) written.", results)
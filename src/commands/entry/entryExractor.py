@@ -1,13 +1,17 @@
-import os
 import json
+from typing import Optional
 from cryptographing.crypting import Crypt
+from cryptographing.vaultKeyring import VaultKeyring
 from response.response import Response
 from commands.vault.vaultCategoryEnum import VaultCategoryEnum
-from commands.vault.vaultCreator import VaultCreator
+from storage.vaultStorage import VaultStorage
+from commands.pagination import Pagination
 
 class Extractor:
+    SEARCH_PAGE_SIZE: int = 20
+
     @staticmethod
-    def extractCredentials(user: str, command: object) -> Response:
+    def extractCredentials(user: str, command: object, keyring: Optional[VaultKeyring] = None) -> Response:
         """
         Searches for the given URL in a specific user vault category and extracts username, password, or both.
 
@@ -16,6 +20,7 @@ class Extractor:
                         - fieldType: "user", "password", or "both".
                         - URL: The URL to search for.
                         - category: (Optional) The vault category to search in. Defaults to "default".
+        :param keyring: The session's keyring; built from the cached user cipher when not given.
         :return: Response object with extracted credentials or failure message.
         """
         if len(command.parameters) < 2:
@@ -28,19 +33,15 @@ class Extractor:
         if fieldType not in ["password", "user", "both"]:
             return Response(False, "Wrong field type, expected: password/user/both")
 
-        vaultPath: str = f"{VaultCreator.VAULTS_DIR}/{user}/{category}.json"
-
-        if not os.path.exists(vaultPath):
+        if not VaultStorage.vaultExists(user, category):
             return Response(False, f"Vault '{category}' does not exist for user '{user}'.")
 
-        key: bytes = Crypt.generateKey(user)
+        keyring = keyring if keyring is not None else VaultKeyring.forUser(user)
 
         try:
-            with open(vaultPath, "r") as file:
-                vaultData = json.load(file)
+            storedData = VaultStorage.getEntry(user, category, url)
 
-            if url in vaultData:
-                storedData = dict(vaultData[url])
+            if storedData is not None:
                 extractedInfo = {}
 
                 if fieldType in ["user", "both"]:
@@ -48,56 +49,123 @@ class Extractor:
 
                 if fieldType in ["password", "both"]:
                     encryptedPassword: str = storedData["password"]
-                    decryptedPassword: str = Crypt.decryptPassword(encryptedPassword, key)
+                    decryptedPassword: str = Crypt.decryptWithCipher(encryptedPassword, keyring.cipherFor(category))
                     extractedInfo["password"] = decryptedPassword
 
                 responseMessage: str = f"Extracted credentials for {url}: {extractedInfo}"
                 return Response(True, responseMessage)
 
-        except (json.JSONDecodeError, KeyError, FileNotFoundError):
+        except (json.JSONDecodeError, KeyError, ValueError, FileNotFoundError):
             return Response(False, "Error reading vault file.")
 
         return Response(False, f"No credentials found for {url} in category '{category}'.")
     
+    @staticmethod
+    def findUrl(user: str, command: object) -> Response:
+        """
+        Finds the categories in which a URL is stored, without the caller naming a category.
+
+        :param user: Username of the vault owner.
+        :param command: Command object with parameters [URL]
+        :return: Response object listing the categories holding the URL or failure message.
+        """
+        if len(command.parameters) != 1:
+            return Response(False, "Invalid parameters count, expected: <URL>")
+
+        url: str = command.parameters[0]
+
+        if not VaultStorage.userExists(user):
+            return Response(False, "User vault does not exist.")
+
+        categories: list = VaultStorage.findCategories(user, url)
+
+        if not categories:
+            return Response(False, f"No entries found for '{url}' in any vault.")
+
+        return Response(True, f"'{url}' is stored in: {', '.join(categories)}")
+
+    @staticmethod
+    def searchUrls(user: str, command: object) -> Response:
+        """
+        Searches the URLs of every category by prefix, substring and approximate match.
+
+        :param user: Username of the vault owner.
+        :param command: Command object with parameters [pattern, page (optional)]
+                        - pattern: The text to look for.
+                        - page: (Optional) The 1-based page of ranked results. Defaults to 1.
+        :return: Response object with the ranked matches or failure message.
+        """
+        if len(command.parameters) not in (1, 2):
+            return Response(False, "Invalid parameters count, expected: <pattern> [page]")
+
+        pattern: str = command.parameters[0]
+
+        try:
+            page: int = int(command.parameters[1]) if len(command.parameters) > 1 else 1
+        except ValueError:
+            return Response(False, "The page must be a number.")
+
+        if page < 1:
+            return Response(False, "The page must be a positive number.")
+
+        if not VaultStorage.userExists(user):
+            return Response(False, "User vault does not exist.")
+
+        matches, hasMore = VaultStorage.searchUrls(user, pattern, (page - 1) * Extractor.SEARCH_PAGE_SIZE, Extractor.SEARCH_PAGE_SIZE)
+
+        if not matches:
+            if page > 1:
+                return Response(False, f"No more entries match '{pattern}' on page {page}.")
+            return Response(False, f"No entries match '{pattern}'.")
+
+        results: str = ", ".join(f"{url} ({', '.join(categories)})" for url, categories in matches)
+        responseMessage: str = f"Matches for '{pattern}', page {page}: {results}"
+        if hasMore:
+            responseMessage += f". More results: search {pattern} {page + 1}"
+        return Response(True, responseMessage)
+
     @staticmethod
     def listUrlsInCategory(user: str, command: object) -> Response:
         """
-        Lists all URLs stored in a given category.
+        Lists the URLs stored in a given category, one page at a time in sorted order.
 
         :param user: Username of the vault owner.
-        :param command: Command object with parameters [category]
+        :param command: Command object with parameters [category, pageSize (optional), cursor (optional)]
                         - category: The category whose URLs should be listed.
-        :return: Response object with a list of URLs or failure message.
+                        - pageSize: (Optional) Maximum number of URLs to return.
+                        - cursor: (Optional) The nextCursor of the previous page.
+        :return: Response object with a page of URLs and the cursor of the next page, or failure message.
         """
-        if len(command.parameters) != 1:
-            return Response(False, "Invalid parameters count, expected: <Category>")
+        if not 1 <= len(command.parameters) <= 3:
+            return Response(False, "Invalid parameters count, expected: <Category> [pageSize] [cursor]")
         
         category: str = command.parameters[0]
+
+        try:
+            pageSize, after = Pagination.parseArguments(command.parameters[1:])
+        except ValueError as e:
+            return Response(False, f"Invalid pagination parameters: {str(e)}")
         validVaults: list = [command.value for command in VaultCategoryEnum]
 
         if category not in validVaults:
             return Response(False, f"Invalid vault category, valid categories: {validVaults}")
 
-        vaultDirectory: str = f"{VaultCreator.VAULTS_DIR}/{user}"
-        categoryFile: str = os.path.join(vaultDirectory, f"{category}.json")
-
-        if not os.path.exists(vaultDirectory):
+        if not VaultStorage.userExists(user):
             return Response(False, "User vault does not exist.")
 
-        if not os.path.exists(categoryFile):
+        if not VaultStorage.vaultExists(user, category):
             return Response(False, f"No vault found for category: {category}")
 
         try:
-            with open(categoryFile, "r") as file:
-                vaultData = json.load(file)
-
-            urls: list = list(vaultData.keys())
+            urls, hasMore = VaultStorage.pageUrls(user, category, after, pageSize)
 
             if not urls:
+                if after is not None:
+                    return Response(False, f"No more URLs stored in category: {category}")
                 return Response(False, f"No credentials stored in category: {category}")
 
             responseMessage: str = f"Stored URLs in {category}: {', '.join(urls)}"
-            return Response(True, responseMessage)
+            return Response(True, responseMessage, nextCursor=Pagination.nextCursor(urls, hasMore))
 
         except json.JSONDecodeError:
             return Response(False, "Error reading vault file. It may be corrupted.")
@@ -1,13 +1,13 @@
-import os
 import json
 from response.response import Response
-from commands.vault.vaultCreator import VaultCreator
+from storage.vaultStorage import VaultStorage
 
 class EntryRemover:
     @staticmethod
     def removeAll(user: str, command) -> Response:
         """
         Removes all entries with the given URL from every category.
+        Only the vaults the URL index lists as holding the URL are touched.
 
         :param user: The username of the vault owner.
         :param command: Command object with parameters [URL]
@@ -17,29 +17,15 @@ class EntryRemover:
             return Response(False, "Wrong parameters given, expected <URL>")
 
         url: str = command.parameters[0]
-        vaultDirectory: str = f"{VaultCreator.VAULTS_DIR}/{user}"
 
-        if not os.path.exists(vaultDirectory):
+        if not VaultStorage.userExists(user):
             return Response(False, f"Vault directory does not exist for user '{user}'.")
 
-        vaultsChecked: int = 0
         vaultsModified: int = 0
 
-        for vaultFile in os.listdir(vaultDirectory):
-            if not vaultFile.endswith(".json"):
-                continue
-
-            vaultPath: str = os.path.join(vaultDirectory, vaultFile)
-            vaultsChecked += 1
-
+        for category in VaultStorage.findCategories(user, url):
             try:
-                with open(vaultPath, "r") as file:
-                    vaultData = json.load(file)
-
-                if url in vaultData:
-                    del vaultData[url]
-                    with open(vaultPath, "w") as file:
-                        json.dump(vaultData, file, indent=4)
+                if VaultStorage.deleteEntry(user, category, url):
                     vaultsModified += 1
 
             except (json.JSONDecodeError, FileNotFoundError):
@@ -47,7 +33,7 @@ class EntryRemover:
 
         if vaultsModified > 0:
             return Response(True, f"Successfully removed all entries for '{url}' from {vaultsModified} vault(s).")
-        elif vaultsChecked > 0:
+        elif VaultStorage.listCategories(user):
             return Response(False, f"No entries found for '{url}' in any vault.")
         else:
             return Response(False, "No valid vaults found.")
@@ -68,22 +54,18 @@ class EntryRemover:
         username: str = command.parameters[1]
         category: str = command.parameters[2]
 
-        vaultPath: str = f"{VaultCreator.VAULTS_DIR}/{user}/{category}.json"
-
-        if not os.path.exists(vaultPath):
+        if not VaultStorage.vaultExists(user, category):
             return Response(False, f"Vault '{category}' does not exist for user '{user}'.")
 
         try:
-            with open(vaultPath, "r") as file:
-                vaultData = json.load(file)
-
-            if url in vaultData and vaultData[url].get("username") == username:
-                del vaultData[url]
-                with open(vaultPath, "w") as file:
-                    json.dump(vaultData, file, indent=4)
-                return Response(True, f"Successfully removed entry for '{url}' with username '{username}' from '{category}'.")
-            else:
-                return Response(False, f"No matching entry found for '{url}' with username '{username}' in '{category}'.")
+            with VaultStorage.lockVault(user, category):
+                storedData = VaultStorage.getEntry(user, category, url)
+
+                if storedData is not None and storedData.get("username") == username:
+                    VaultStorage.deleteEntry(user, category, url)
+                    return Response(True, f"Successfully removed entry for '{url}' with username '{username}' from '{category}'.")
+                else:
+                    return Response(False, f"No matching entry found for '{url}' with username '{username}' in '{category}'.")
 
         except (json.JSONDecodeError, FileNotFoundError):
             return Response(False, "Failed to read or parse the vault file.")
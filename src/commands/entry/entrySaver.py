@@ -1,18 +1,19 @@
-import json
-import os
-
+from typing import Optional
 from cryptographing.crypting import Crypt
+from cryptographing.vaultKeyring import VaultKeyring
 from response.response import Response
 from commands.vault.vaultCreator import VaultCreator
+from storage.vaultStorage import VaultStorage
 
 class EntrySaver:
     @staticmethod
-    def savePassword(currentUser: str, command) -> Response:
+    def savePassword(currentUser: str, command, keyring: Optional[VaultKeyring] = None) -> Response:
         """
         Saves a password to the appropriate vault file after checking security.
 
         :param currentUser: The username of the vault owner.
         :param command: Command object with parameters [place, userAccount, password, optional category].
+        :param keyring: The session's keyring; built from the cached user cipher when not given.
         :return: Response object indicating success or failure.
         """
         if len(command.parameters) < 3:
@@ -27,32 +28,20 @@ class EntrySaver:
             vaultResponse = VaultCreator.createCategoryVault(currentUser, category)
             if not vaultResponse.status:
                 return vaultResponse  
-            vaultFile = os.path.join(VaultCreator.VAULTS_DIR, currentUser, f"{category}.json")
         else:
             VaultCreator.createVault(currentUser)  
-            vaultFile = os.path.join(VaultCreator.VAULTS_DIR, currentUser, "default.json")
-
-        key: bytes = Crypt.generateKey(currentUser)
-        encryptedPassword: str = Crypt.encryptPassword(password, key).decode()
-
-        os.makedirs(VaultCreator.VAULTS_DIR, exist_ok=True)
-
-        if not os.path.exists(vaultFile):
-            with open(vaultFile, "w") as file:
-                json.dump({}, file)
-
-        with open(vaultFile, "r") as file:
-            try:
-                vaultData: dict = json.load(file)
-            except json.JSONDecodeError:
-                vaultData = {}
 
-        vaultData[place] = {
-            "username": userAccount,
-            "password": encryptedPassword
-        }
+        vaultCategory: str = category.lower() if category else "default"
+        keyring = keyring if keyring is not None else VaultKeyring.forUser(currentUser)
 
-        with open(vaultFile, "w") as file:
-            json.dump(vaultData, file, indent=4)
+        try:
+            with VaultStorage.lockVault(currentUser, vaultCategory):
+                encryptedPassword: str = Crypt.encryptWithCipher(password, keyring.cipherFor(vaultCategory)).decode()
+                VaultStorage.putEntry(currentUser, vaultCategory, place, {
+                    "username": userAccount,
+                    "password": encryptedPassword
+                })
+        except (ValueError, OSError):
+            return Response(False, f"Failed to save the password for {place}, the vault could not be written.")
 
-        return Response(True, f"Password for {place} saved successfully in {'default' if not category else category} vault.")
+        return Response(True, f"Password for {place} saved successfully in {vaultCategory} vault.")
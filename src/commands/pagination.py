@@ -0,0 +1,78 @@
+import json
+import base64
+import bisect
+from typing import List, Optional, Tuple
+
+class Pagination:
+    """
+    Helpers for commands returning their results one page at a time.
+    A cursor is an opaque token encoding the last item of the previous page; the next page
+    starts right after it, so pages stay consistent while items are added or removed.
+    """
+
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 500
+
+    @staticmethod
+    def parseArguments(parameters: List[str]) -> Tuple[int, Optional[str]]:
+        """
+        Parses the optional [pageSize] [cursor] parameters of a paginated command.
+
+        :param parameters: The parameters following the command's own parameters.
+        :return: (page size, last item of the previous page or None for the first page).
+        :raises ValueError: If the page size or the cursor is invalid.
+        """
+        pageSize: int = int(parameters[0]) if parameters else Pagination.DEFAULT_PAGE_SIZE
+        if not 1 <= pageSize <= Pagination.MAX_PAGE_SIZE:
+            raise ValueError(f"The page size must be between 1 and {Pagination.MAX_PAGE_SIZE}.")
+
+        after: Optional[str] = Pagination.decodeCursor(parameters[1]) if len(parameters) > 1 else None
+        return pageSize, after
+
+    @staticmethod
+    def encodeCursor(lastItem: str) -> str:
+        """
+        Encodes the last item of a page into a cursor.
+
+        :param lastItem: The last item returned.
+        :return: URL-safe cursor string.
+        """
+        return base64.urlsafe_b64encode(json.dumps({"after": lastItem}).encode()).decode()
+
+    @staticmethod
+    def decodeCursor(cursor: str) -> str:
+        """
+        Decodes a cursor produced by encodeCursor.
+
+        :param cursor: The cursor string.
+        :return: The last item of the previous page.
+        :raises ValueError: If the cursor is malformed.
+        """
+        try:
+            after = json.loads(base64.urlsafe_b64decode(cursor.encode()))["after"]
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Invalid cursor.")
+
+        if not isinstance(after, str):
+            raise ValueError("Invalid cursor.")
+        return after
+
+    @staticmethod
+    def pageOf(sortedItems: List[str], after: Optional[str], pageSize: int) -> Tuple[List[str], bool]:
+        """
+        Returns the items of an already sorted list that follow a given item.
+
+        :param sortedItems: The items in sorted order.
+        :param after: The last item of the previous page, or None for the first page.
+        :param pageSize: Maximum number of items to return.
+        :return: (items of the page, whether more items follow).
+        """
+        start: int = 0 if after is None else bisect.bisect_right(sortedItems, after)
+        return sortedItems[start:start + pageSize], start + pageSize < len(sortedItems)
+
+    @staticmethod
+    def nextCursor(page: List[str], hasMore: bool) -> Optional[str]:
+        """
+        Returns the cursor of the page following the given one, or None if it was the last page.
+        """
+        return Pagination.encodeCursor(page[-1]) if hasMore and page else None
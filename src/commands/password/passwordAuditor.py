@@ -0,0 +1,188 @@
+import os
+import hmac
+import json
+import hashlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cryptographing.crypting import Crypt
+from cryptographing.vaultKeyring import VaultKeyring
+from commands.password.passwordSafetyChecker import SafetyChecker
+from response.response import Response
+from storage.vaultStorage import VaultStorage
+from strength.strengthEstimator import StrengthEstimator
+
+class PasswordAuditor:
+    """
+    Audits the health of every password a user stored: reuse across entries, strength and breach exposure.
+    Each vault is decrypted with one bulk call. Reuse is found in a single pass by grouping the passwords on an
+    HMAC under a random per-audit key, so no plain password hash is kept around. Strength (with the local
+    StrengthEstimator) and breach status are evaluated once per distinct password, the breach lookups in
+    concurrent batches of CHUNK_SIZE, with a progress update streamed to the client after each batch.
+
+    Checking a large vault for breaches needs a local corpus (BREACH_CORPUS_DIR). The breach API allows
+    SafetyChecker.REQUESTS_PER_SECOND lookups for the whole server, so without a corpus an audit of more than
+    MAX_REMOTE_CHECKS distinct passwords skips the breach check instead of holding a worker thread for minutes.
+    """
+
+    CHUNK_SIZE: int = 1000
+    MAX_LISTED: int = 10
+    MAX_REMOTE_CHECKS: int = 100
+
+    @staticmethod
+    def audit(user: str, command: object, keyring: Optional[VaultKeyring] = None,
+              progress: Optional[Callable[[Response], None]] = None) -> Response:
+        """
+        Audits all passwords of a user.
+
+        :param user: Username of the vault owner.
+        :param command: Command object without parameters.
+        :param keyring: The session's keyring; built from the cached user cipher when not given.
+        :param progress: Called with a partial Response after every step of a large audit.
+        :return: Response object with the audit report or failure message.
+        """
+        if command.parameters:
+            return Response(False, "The audit command takes no parameters.")
+
+        if not VaultStorage.userExists(user):
+            return Response(False, "User vault does not exist.")
+
+        keyring = keyring if keyring is not None else VaultKeyring.forUser(user)
+        categories: List[str] = sorted(VaultStorage.listCategories(user))
+        entries, passwords, unreadableVaults = PasswordAuditor.decryptVaults(user, categories, keyring)
+
+        if not entries:
+            if unreadableVaults:
+                return Response(False, f"None of the {len(unreadableVaults)} vault(s) could be read.")
+            return Response(False, f"User '{user}' has no saved passwords.")
+
+        PasswordAuditor.reportProgress(progress, len(entries), f"Audit: decrypted {len(entries)} passwords, checking reuse and strength...")
+
+        groups: List[List[int]] = PasswordAuditor.groupByPassword(passwords)
+        representatives: List[str] = [passwords[group[0]] for group in groups]
+        scores: List[int] = [StrengthEstimator.estimate(password).score for password in representatives]
+        exposures, breachNote = PasswordAuditor.checkBreaches(representatives, progress, len(entries))
+
+        reused: List[List[int]] = [group for group in groups if len(group) > 1]
+        weak: List[int] = [index for group, score in zip(groups, scores) if score < StrengthEstimator.WEAK_SCORE for index in group]
+        breached: List[Tuple[int, int]] = [(index, count) for group, count in zip(groups, exposures) if count for index in group]
+        unreadable: int = sum(1 for password in passwords if password is None)
+
+        def name(index: int) -> str:
+            return "/".join(entries[index])
+
+        lines: List[str] = [
+            f"Audited {len(entries) - unreadable} passwords in {len(categories) - len(unreadableVaults)} vault(s): "
+            f"{sum(len(group) for group in reused)} reused in {len(reused)} group(s), {len(weak)} weak, {len(breached)} breached."
+        ]
+        if reused:
+            lines.append("Reused: " + PasswordAuditor.listed([", ".join(name(index) for index in group) for group in reused], "; "))
+        if weak:
+            lines.append("Weak: " + PasswordAuditor.listed([name(index) for index in sorted(weak)]))
+        if breached:
+            lines.append("Breached: " + PasswordAuditor.listed([f"{name(index)} ({count} times)" for index, count in sorted(breached)]))
+        if unreadable:
+            lines.append(f"{unreadable} password(s) could not be decrypted.")
+        if unreadableVaults:
+            lines.append(f"Unreadable vaults: {', '.join(unreadableVaults)}")
+        if breachNote is not None:
+            lines.append(breachNote)
+
+        return Response(True, "\n".join(lines))
+
+    @staticmethod
+    def decryptVaults(user: str, categories: List[str], keyring: VaultKeyring) -> Tuple[List[Tuple[str, str]], List[Optional[str]], List[str]]:
+        """
+        Decrypts the passwords of the given vaults of a user, one bulk call per vault.
+
+        :param user: Username of the vault owner.
+        :param categories: The categories of the vaults.
+        :param keyring: The keyring unwrapping the vault data keys.
+        :return: The (category, URL) of every entry, the matching passwords (None if undecryptable)
+                 and the categories that could not be read.
+        """
+        entries: List[Tuple[str, str]] = []
+        passwords: List[Optional[str]] = []
+        unreadableVaults: List[str] = []
+
+        for category in categories:
+            try:
+                vaultData: dict = VaultStorage.loadVault(user, category)
+                cipher = keyring.cipherFor(category)
+                urls: List[str] = sorted(vaultData)
+                tokens: List[str] = [vaultData[url]["password"] for url in urls]
+            except (FileNotFoundError, ValueError, KeyError, TypeError, json.JSONDecodeError):
+                unreadableVaults.append(category)
+                continue
+
+            passwords.extend(Crypt.decryptMany(tokens, cipher, strict=False))
+            entries.extend((category, url) for url in urls)
+
+        return entries, passwords, unreadableVaults
+
+    @staticmethod
+    def groupByPassword(passwords: List[Optional[str]]) -> List[List[int]]:
+        """
+        Groups the indexes of equal passwords in one pass, keyed by an HMAC under a key that only lives for the call.
+
+        :param passwords: The passwords, None for those that could not be decrypted.
+        :return: The index groups, in order of first appearance.
+        """
+        auditKey: bytes = os.urandom(32)
+        groups: Dict[bytes, List[int]] = {}
+
+        for index, password in enumerate(passwords):
+            if password is None:
+                continue
+            groups.setdefault(hmac.new(auditKey, password.encode(), hashlib.sha256).digest(), []).append(index)
+
+        return list(groups.values())
+
+    @staticmethod
+    def checkBreaches(passwords: List[str], progress: Optional[Callable[[Response], None]], total: int) -> Tuple[List[int], Optional[str]]:
+        """
+        Looks up the breach exposure of distinct passwords in concurrent batches. Without a local corpus, more
+        than MAX_REMOTE_CHECKS passwords are not looked up at all.
+
+        :param passwords: The distinct passwords.
+        :param progress: Called with a partial Response after every batch of a large audit.
+        :param total: Number of audited entries, deciding whether progress is reported.
+        :return: The exposure count of every password (0 when unchecked) and a report line when the check was
+                 skipped or a lookup failed.
+        """
+        if not SafetyChecker.corpusConfigured() and len(passwords) > PasswordAuditor.MAX_REMOTE_CHECKS:
+            return [0] * len(passwords), (
+                f"Breach check skipped: {len(passwords)} distinct passwords exceed the {PasswordAuditor.MAX_REMOTE_CHECKS} "
+                f"remote lookups an audit may make. Set {SafetyChecker.CORPUS_ENV} to a local breach corpus to check them all."
+            )
+
+        exposures: List[int] = []
+        breachError: Optional[str] = None
+
+        for start in range(0, len(passwords), PasswordAuditor.CHUNK_SIZE):
+            for count in SafetyChecker.exposureCounts(passwords[start:start + PasswordAuditor.CHUNK_SIZE]):
+                if isinstance(count, Response):
+                    breachError = breachError or count.description
+                    count = 0
+                exposures.append(count)
+
+            PasswordAuditor.reportProgress(progress, total, f"Audit: breach-checked {len(exposures)}/{len(passwords)} distinct passwords...")
+
+        return exposures, f"Breach check incomplete: {breachError}" if breachError is not None else None
+
+    @staticmethod
+    def reportProgress(progress: Optional[Callable[[Response], None]], total: int, message: str) -> None:
+        """
+        Streams a progress update, only for audits large enough to take a noticeable time.
+        """
+        if progress is not None and total >= PasswordAuditor.CHUNK_SIZE:
+            progress(Response(True, message, partial=True))
+
+    @staticmethod
+    def listed(items: List[str], separator: str = ", ") -> str:
+        """
+        Joins the first MAX_LISTED items, mentioning how many more were left out.
+        """
+        text: str = separator.join(items[:PasswordAuditor.MAX_LISTED])
+        if len(items) > PasswordAuditor.MAX_LISTED:
+            text += f" and {len(items) - PasswordAuditor.MAX_LISTED} more"
+        return text
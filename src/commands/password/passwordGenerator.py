@@ -1,31 +1,180 @@
-import json
 import os
-import random
+import math
 import string
+from typing import List, Optional, Tuple
 
 from cryptographing.crypting import Crypt
+from cryptographing.vaultKeyring import VaultKeyring
 from commands.vault.vaultCreator import VaultCreator
 from response.response import Response
+from storage.vaultStorage import VaultStorage
+
+class PasswordPolicy:
+    """
+    The rules generated passwords follow.
+
+    Attributes:
+        length (int): Number of characters.
+        requiredClasses (str): Character classes every password contains at least once:
+                               l(owercase), u(ppercase), d(igits), s(pecial).
+        excludeAmbiguous (bool): Whether characters that are easy to confuse, such as l, 1 and I, are left out.
+        pronounceable (bool): Whether the letters alternate consonants and vowels, with the required digits and
+                              special characters at the end. A required uppercase letter is the first one.
+    """
+
+    CLASSES: dict = {
+        "l": string.ascii_lowercase,
+        "u": string.ascii_uppercase,
+        "d": string.digits,
+        "s": "!@#$%^&*()-_=+[]{}|;:,.<>?/`~"
+    }
+    AMBIGUOUS: str = "Il1|O0o`'\";:,."
+    CONSONANTS: str = "bcdfghjkmnprstvwxz"
+    VOWELS: str = "aeiuy"
+    PRONOUNCEABLE_SPECIALS: str = "!@#$%&*-_=+?"
+    OPTION_PREFIXES: tuple = ("length=", "classes=")
+    OPTION_FLAGS: tuple = ("no-ambiguous", "pronounceable")
+    MIN_LENGTH: int = 4
+    MAX_LENGTH: int = 128
+
+    def __init__(self, length: int = 16, requiredClasses: str = "luds", excludeAmbiguous: bool = False, pronounceable: bool = False) -> None:
+        """
+        Initializes a policy.
+
+        :raises ValueError: If the length is out of range, a class is unknown or the classes do not fit the length.
+        """
+        if not PasswordPolicy.MIN_LENGTH <= length <= PasswordPolicy.MAX_LENGTH:
+            raise ValueError(f"The length must be between {PasswordPolicy.MIN_LENGTH} and {PasswordPolicy.MAX_LENGTH}.")
+        if not requiredClasses or any(c not in PasswordPolicy.CLASSES for c in requiredClasses):
+            raise ValueError("The classes must be a combination of l, u, d and s.")
+
+        self.length = length
+        self.requiredClasses = "".join(sorted(set(requiredClasses), key="luds".index))
+        self.excludeAmbiguous = excludeAmbiguous
+        self.pronounceable = pronounceable
+
+    @staticmethod
+    def fromOptions(options: List[str]) -> "PasswordPolicy":
+        """
+        Builds a policy from command options: length=<n>, classes=<luds>, no-ambiguous and pronounceable.
+
+        :param options: The options.
+        :return: The policy.
+        :raises ValueError: If an option is unknown or invalid.
+        """
+        arguments: dict = {}
+        for option in options:
+            name, _, value = option.partition("=")
+            if name == "length" and value.isdigit():
+                arguments["length"] = int(value)
+            elif name == "classes" and value:
+                arguments["requiredClasses"] = value
+            elif option == "no-ambiguous":
+                arguments["excludeAmbiguous"] = True
+            elif option == "pronounceable":
+                arguments["pronounceable"] = True
+            else:
+                raise ValueError(f"Unknown option '{option}'.")
+        return PasswordPolicy(**arguments)
+
+    def alphabet(self, characters: str) -> str:
+        """
+        Returns the characters of a class the policy allows.
+        """
+        if self.excludeAmbiguous:
+            return "".join(c for c in characters if c not in PasswordPolicy.AMBIGUOUS)
+        return characters
+
+    def layout(self) -> List[str]:
+        """
+        Returns the alphabet of every position before shuffling. The first positions hold one character of every
+        required class, so no password ever has to be drawn again.
+        """
+        if self.pronounceable:
+            tail: List[str] = []
+            if "d" in self.requiredClasses:
+                tail += [self.alphabet(string.digits)] * 2
+            if "s" in self.requiredClasses:
+                tail.append(PasswordPolicy.PRONOUNCEABLE_SPECIALS)
+            letters: int = self.length - len(tail)
+            if letters < ("u" in self.requiredClasses) + ("l" in self.requiredClasses):
+                raise ValueError("The length is too short for the required classes.")
+            syllables: List[str] = [self.alphabet(PasswordPolicy.CONSONANTS if i % 2 == 0 else PasswordPolicy.VOWELS) for i in range(letters)]
+            if "u" in self.requiredClasses:
+                syllables[0] = self.alphabet(PasswordPolicy.CONSONANTS.upper())
+            return syllables + tail
+
+        required: List[str] = [self.alphabet(PasswordPolicy.CLASSES[c]) for c in self.requiredClasses]
+        if len(required) > self.length:
+            raise ValueError("The length is too short for the required classes.")
+        everything: str = "".join(required)
+        return required + [everything] * (self.length - len(required))
 
 class PasswordGenerator:
+    """
+    Generates passwords from the operating system's CSPRNG.
+    A batch draws all its randomness with one os.urandom call. Every password consumes a fixed-size slice that,
+    read as one big integer, is spent by repeated division on its characters and on the shuffle moving the
+    required classes to random positions. The slice carries 64 bits more than needed, so the bias of the division
+    is below 2^-64, and no draw is ever rejected and repeated.
+    """
+
+    SLACK_BITS: int = 64
+    MAX_BATCH: int = 1000
+
     @staticmethod
     def generateStrongPassword(length=16):
         """
         Generates a strong password containing uppercase, lowercase, numbers, and special characters.
-        Filters out ambiguous characters.
         """
-        special_chars = "!@#$%^&*()-_=+[]{}|;:,.<>?/`~"
-        characters = string.ascii_letters + string.digits + special_chars
+        return PasswordGenerator.generateMany(1, PasswordPolicy(length))[0]
+
+    @staticmethod
+    def generateMany(count: int, policy: Optional[PasswordPolicy] = None) -> List[str]:
+        """
+        Generates passwords following a policy.
+
+        :param count: Number of passwords.
+        :param policy: The policy, the default strong policy when not given.
+        :return: The passwords.
+        :raises ValueError: If the policy cannot be satisfied.
+        """
+        policy = policy if policy is not None else PasswordPolicy()
+        layout: List[str] = policy.layout()
+        shuffle: bool = not policy.pronounceable
+
+        bits: float = sum(math.log2(len(alphabet)) for alphabet in layout)
+        if shuffle:
+            bits += math.lgamma(len(layout) + 1) / math.log(2)
+        width: int = math.ceil((bits + PasswordGenerator.SLACK_BITS) / 8)
+
+        pool: bytes = os.urandom(width * count)
+        return [PasswordGenerator.spend(int.from_bytes(pool[i * width:(i + 1) * width], "big"), layout, shuffle) for i in range(count)]
+
+    @staticmethod
+    def spend(number: int, layout: List[str], shuffle: bool) -> str:
+        """
+        Turns a random number into a password: one character per position, then a Fisher-Yates shuffle.
+        """
+        characters: List[str] = []
+        for alphabet in layout:
+            number, index = divmod(number, len(alphabet))
+            characters.append(alphabet[index])
 
-        return ''.join(random.choice(characters) for _ in range(length))
+        if shuffle:
+            for i in range(len(characters) - 1, 0, -1):
+                number, j = divmod(number, i + 1)
+                characters[i], characters[j] = characters[j], characters[i]
+        return "".join(characters)
 
     @staticmethod
-    def generate(user, command):
+    def generate(user, command, keyring=None):
         """
         Generates a strong password and securely saves it in the user's vault.
 
         :param user: The username of the account owner.
         :param command: Command object with parameters [website, username, optional category]
+        :param keyring: The session's keyring; built from the cached user cipher when not given.
         :return: Response object indicating success or failure.
         """
         if len(command.parameters) < 2:
@@ -33,39 +182,78 @@ class PasswordGenerator:
 
         website = command.parameters[0]
         username = command.parameters[1]
-        category = command.parameters[2] if len(command.parameters) > 2 else "default"
+        category = command.parameters[2].lower() if len(command.parameters) > 2 else "default"
 
         generatedPassword = PasswordGenerator.generateStrongPassword()
 
-        key = Crypt.generateKey(user)
-        encryptedPassword = Crypt.encryptPassword(generatedPassword, key).decode()
-
-        vaultDirectory = os.path.join(VaultCreator.VAULTS_DIR, user)
-        vaultFile = os.path.join(vaultDirectory, f"{category}.json")
-
         createResponse = VaultCreator.createCategoryVault(user, category)
         if not createResponse.status:
-            return createResponse  
-
-        try:
-            if os.path.exists(vaultFile):
-                with open(vaultFile, "r") as file:
-                    vaultData = json.load(file)
-            else:
-                vaultData = {}
+            return createResponse
 
-            if website not in vaultData:
-                vaultData[website] = []
+        keyring = keyring if keyring is not None else VaultKeyring.forUser(user)
 
-            vaultData[website] = {
-                "username": username,
-                "password": encryptedPassword
-            }
-
-            with open(vaultFile, "w") as file:
-                json.dump(vaultData, file, indent=4)
+        try:
+            with VaultStorage.lockVault(user, category):
+                encryptedPassword = Crypt.encryptWithCipher(generatedPassword, keyring.cipherFor(category)).decode()
+                VaultStorage.putEntry(user, category, website, {
+                    "username": username,
+                    "password": encryptedPassword
+                })
 
             return Response(True, f"Generated and saved a strong password for {website}.")
 
         except Exception as e:
             return Response(False, f"Error saving password: {str(e)}")
+
+    @staticmethod
+    def splitOptions(parameters: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Separates the policy options of a command from its positional parameters. Only the known option names
+        count as options, so a website such as example.com/login?next=home stays a website.
+        """
+        isOption = lambda parameter: parameter.startswith(PasswordPolicy.OPTION_PREFIXES) or parameter in PasswordPolicy.OPTION_FLAGS
+        return [p for p in parameters if not isOption(p)], [p for p in parameters if isOption(p)]
+
+    @staticmethod
+    def generateBatch(user, command, keyring=None):
+        """
+        Generates a password for each of several websites and saves them all with a single vault write.
+
+        :param user: The username of the account owner.
+        :param command: Command object with parameters [category, username, website...] followed by optional
+                        policy options: length=<n>, classes=<luds>, no-ambiguous, pronounceable.
+        :param keyring: The session's keyring; built from the cached user cipher when not given.
+        :return: Response object indicating success or failure.
+        """
+        positional, options = PasswordGenerator.splitOptions(command.parameters)
+        if len(positional) < 3:
+            return Response(False, "Invalid parameters. Expected: category, username, website... [length=<n>] [classes=<luds>] [no-ambiguous] [pronounceable].")
+
+        category, username, websites = positional[0], positional[1], list(dict.fromkeys(positional[2:]))
+        if len(websites) > PasswordGenerator.MAX_BATCH:
+            return Response(False, f"At most {PasswordGenerator.MAX_BATCH} passwords can be generated at once.")
+
+        try:
+            policy = PasswordPolicy.fromOptions(options)
+            passwords = PasswordGenerator.generateMany(len(websites), policy)
+        except ValueError as e:
+            return Response(False, f"Invalid password policy: {str(e)}")
+
+        createResponse = VaultCreator.createCategoryVault(user, category)
+        if not createResponse.status:
+            return createResponse
+
+        category = category.lower()
+        keyring = keyring if keyring is not None else VaultKeyring.forUser(user)
+
+        try:
+            with VaultStorage.lockVault(user, category):
+                encryptedPasswords = Crypt.encryptMany(passwords, keyring.cipherFor(category))
+                VaultStorage.applyRecords(user, category, [
+                    {"op": "put", "url": website, "entry": {"username": username, "password": encryptedPassword.decode()}}
+                    for website, encryptedPassword in zip(websites, encryptedPasswords)
+                ])
+        except (ValueError, OSError) as e:
+            return Response(False, f"Error saving passwords: {str(e)}")
+
+        return Response(True, f"Generated and saved {len(websites)} strong passwords in the {category} vault: {', '.join(websites)}.")
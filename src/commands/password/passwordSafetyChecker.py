@@ -1,11 +1,52 @@
+import asyncio
 import hashlib
 import requests
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Union
+from requests.adapters import HTTPAdapter
 
 from response.response import Response
+from storage.breachCorpus import BreachCorpus
+from strength.strengthEstimator import StrengthEstimator
+from utils.lruCache import LruCache
+from utils.tokenBucket import TokenBucket
+
+class RateLimitedError(Exception):
+    """
+    Raised when the breach API keeps answering 429 Too Many Requests.
+    """
 
 class SafetyChecker:
+    """
+    Checks passwords against breach data: a local breach corpus when one is configured, the Enzoic API otherwise.
+    API lookups share one pooled HTTP session with explicit timeouts, so consecutive checks reuse open
+    connections, and the candidate list of every hash prefix is cached for CACHE_TTL seconds. All lookups of the
+    process draw from one token bucket; a 429 answer empties it for the Retry-After delay, so concurrent
+    checks back off together instead of hammering the API.
+    """
+
     API_URL = "https://api.enzoic.com/v1/passwords"
+    API_URL_ENV = "ENZOIC_API_URL"
+    CORPUS_ENV = "BREACH_CORPUS_DIR"
+    PREFIX_LENGTH = 10
+    TIMEOUT = (3.05, 10)
+    POOL_SIZE = 16
+    CACHE_SIZE = 4096
+    CACHE_TTL = 3600
+    REQUESTS_PER_SECOND = 10
+    BATCH_CONCURRENCY = 8
+    MAX_RATE_LIMIT_RETRIES = 3
+    DEFAULT_RETRY_AFTER = 1.0
+    MAX_RETRY_AFTER = 30.0
+
+    corpus: Optional[BreachCorpus] = None
+    corpusLock = threading.Lock()
+    session: Optional[requests.Session] = None
+    sessionLock = threading.Lock()
+    candidateCache = LruCache(CACHE_SIZE, ttl=CACHE_TTL)
+    rateLimiter = TokenBucket(REQUESTS_PER_SECOND)
     
     @staticmethod
     def get_api_key():
@@ -13,48 +54,281 @@ class SafetyChecker:
         return os.getenv("ENZOIC_API_KEY")
 
     @staticmethod
-    def checkPasswordSecurity(password: str):
+    def getApiUrl() -> str:
         """
-        Checks if a password has been exposed in data breaches using Enzoic API.
+        Returns the password API endpoint, which the ENZOIC_API_URL environment variable can override.
         """
-        api_key = SafetyChecker.get_api_key()
-        if not api_key:
-            return Response(False, "API key is missing. Set ENZOIC_API_KEY in environment variables.")
+        return os.getenv(SafetyChecker.API_URL_ENV) or SafetyChecker.API_URL
 
-        headers = {
-            "Authorization": f"Basic {api_key}",
-            "Content-Type": "application/json"
-        }
+    @staticmethod
+    def getSession() -> requests.Session:
+        """
+        Returns the HTTP session shared by all API lookups, creating it on first use.
+        Its connection pool keeps up to POOL_SIZE connections open, enough for a full batch.
 
-        hashedPassword = hashlib.sha256(password.encode()).hexdigest()
+        :return: The session.
+        """
+        with SafetyChecker.sessionLock:
+            if SafetyChecker.session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=SafetyChecker.POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                SafetyChecker.session = session
+            return SafetyChecker.session
+
+    @staticmethod
+    def getCorpus() -> Optional[BreachCorpus]:
+        """
+        Returns the local breach corpus named by the BREACH_CORPUS_DIR environment variable, opening it on first use
+        and again whenever an import has replaced it. The previous corpus is only dropped, not closed, so lookups
+        still running on it finish; its files are unmapped once the last of them returns.
+
+        :return: The corpus, or None if no corpus is configured.
+        :raises FileNotFoundError: If the directory holds no complete corpus.
+        :raises ValueError: If the corpus cannot be read.
+        """
+        directory = os.getenv(SafetyChecker.CORPUS_ENV)
+        if not directory:
+            return None
+
+        with SafetyChecker.corpusLock:
+            if SafetyChecker.corpus is None or SafetyChecker.corpus.directory != directory or not SafetyChecker.corpus.isCurrent():
+                SafetyChecker.corpus = BreachCorpus(directory)
+            return SafetyChecker.corpus
+
+    @staticmethod
+    def corpusConfigured() -> bool:
+        """
+        Tells whether breach checks run against a local breach corpus rather than the rate limited API.
+        """
+        return bool(os.getenv(SafetyChecker.CORPUS_ENV))
+
+    @staticmethod
+    def breachCheckConfigured() -> bool:
+        """
+        Tells whether breach checks can run, i.e. a breach corpus or an API key is configured.
+        """
+        return bool(os.getenv(SafetyChecker.CORPUS_ENV) or SafetyChecker.get_api_key())
 
-        partialHash = hashedPassword[:10]
+    @staticmethod
+    def checkPasswordStrength(password: str) -> Response:
+        """
+        Checks if a password is hard enough to guess with the local strength estimator, without any network.
+        """
+        estimate = StrengthEstimator.estimate(password)
+        if estimate.score < StrengthEstimator.WEAK_SCORE:
+            return Response(False, f"This password is weak ({estimate.score}/4): {estimate.warning}")
+        return Response(True, f"Password strength: {estimate.score}/4.")
+
+    @staticmethod
+    def exposureResponse(exposureCount: int) -> Response:
+        """
+        Builds the answer for a password exposed a given number of times.
+        """
+        if exposureCount > 0:
+            return Response(False, f"This password has been exposed {exposureCount} times! Choose a stronger password.")
+        return Response(True, "Password was checked and it is secure!")
+
+    @staticmethod
+    def checkPasswordOffline(password: str, corpus: BreachCorpus) -> Response:
+        """
+        Checks if a password has been exposed in data breaches using the local breach corpus, without any network.
+        """
+        return SafetyChecker.exposureResponse(corpus.lookupPassword(password))
+
+    @staticmethod
+    def retryDelay(response: requests.Response, attempt: int) -> float:
+        """
+        Returns how long to back off after a 429 answer: its Retry-After header if it holds a number of seconds,
+        an exponential delay otherwise.
 
+        :param response: The 429 response.
+        :param attempt: Number of rate limited attempts before this one.
+        :return: The delay in seconds, at most MAX_RETRY_AFTER.
+        """
         try:
-            response = requests.post(
-                SafetyChecker.API_URL,
+            delay = float(response.headers.get("Retry-After", ""))
+        except ValueError:
+            delay = SafetyChecker.DEFAULT_RETRY_AFTER * 2 ** attempt
+        return min(max(delay, 0.0), SafetyChecker.MAX_RETRY_AFTER)
+
+    @staticmethod
+    def fetchCandidates(prefix: str, apiKey: str, retries: int = 0) -> list:
+        """
+        Returns the API's candidates for a SHA-256 prefix, from the cache when it was looked up recently.
+
+        :param prefix: The first PREFIX_LENGTH hex digits of the password hash.
+        :param apiKey: The Enzoic API key.
+        :param retries: How many times to retry a rate limited request.
+        :return: The candidates, dictionaries with the full "sha256" hash and its "exposureCount".
+        :raises RateLimitedError: If the API is still rate limiting after the retries.
+        :raises requests.HTTPError: If the API answers with another error.
+        :raises requests.RequestException: On network errors and timeouts.
+        """
+        candidates = SafetyChecker.candidateCache.get(prefix)
+        if candidates is not None:
+            return candidates
+
+        headers = {
+            "Authorization": f"Basic {apiKey}",
+            "Content-Type": "application/json"
+        }
+
+        for attempt in range(retries + 1):
+            SafetyChecker.rateLimiter.acquire()
+            response = SafetyChecker.getSession().post(
+                SafetyChecker.getApiUrl(),
                 headers=headers,
-                json={"partialSHA256": partialHash}
+                json={"partialSHA256": prefix},
+                timeout=SafetyChecker.TIMEOUT
             )
 
             if response.status_code == 429:
-                return Response(False, "Too many requests. Please try again later.")
+                SafetyChecker.rateLimiter.penalize(SafetyChecker.retryDelay(response, attempt))
+                continue
 
             if response.status_code != 200:
-                return Response(False, f"Error checking password security: {response.text}")
+                raise requests.HTTPError(response.text, response=response)
+
+            candidates = response.json().get("candidates", [])
+            SafetyChecker.candidateCache.put(prefix, candidates)
+            return candidates
+
+        raise RateLimitedError(prefix)
+
+    @staticmethod
+    def remoteCandidates(prefix: str, apiKey: str, retries: int = 0) -> Union[list, Response]:
+        """
+        Fetches the candidates of a hash prefix, turning failures into the answer to give the user.
 
-            data = response.json()
+        :return: The candidates, or the error response.
+        """
+        try:
+            return SafetyChecker.fetchCandidates(prefix, apiKey, retries)
 
-            for candidate in data.get("candidates", []):
-                if candidate["sha256"] == hashedPassword:
-                    exposure_count = candidate.get('exposureCount', 0)
-                    if exposure_count > 0:
-                        return Response(False, f"This password has been exposed {exposure_count} times! Choose a stronger password.")
+        except RateLimitedError:
+            return Response(False, "Too many requests. Please try again later.")
 
-            return Response(True, "Password was checked and it is secure!")
+        except requests.HTTPError as e:
+            return Response(False, f"Error checking password security: {str(e)}")
 
         except requests.exceptions.RequestException as e:
             return Response(False, f"Network error while checking password security: {str(e)}")
 
         except Exception as e:
             return Response(False, f"Unexpected error: {str(e)}")
+
+    @staticmethod
+    def exposureCountOf(hashedPassword: str, candidates: list) -> int:
+        """
+        Returns how often a password hash was exposed, according to the candidates of its prefix.
+        """
+        for candidate in candidates:
+            if candidate["sha256"] == hashedPassword:
+                return candidate.get('exposureCount', 0)
+        return 0
+
+    @staticmethod
+    def matchCandidates(hashedPassword: str, candidates: list) -> Response:
+        """
+        Builds the answer for a password hash from the candidates of its prefix.
+        """
+        return SafetyChecker.exposureResponse(SafetyChecker.exposureCountOf(hashedPassword, candidates))
+
+    @staticmethod
+    def checkPasswordSecurity(password: str):
+        """
+        Checks if a password has been exposed in data breaches, using the local breach corpus when one is
+        configured and the Enzoic API otherwise.
+        """
+        try:
+            corpus = SafetyChecker.getCorpus()
+        except (OSError, ValueError) as e:
+            return Response(False, f"The breach corpus could not be opened: {str(e)}")
+
+        if corpus is not None:
+            return SafetyChecker.checkPasswordOffline(password, corpus)
+
+        api_key = SafetyChecker.get_api_key()
+        if not api_key:
+            return Response(False, "API key is missing. Set ENZOIC_API_KEY in environment variables.")
+
+        hashedPassword = hashlib.sha256(password.encode()).hexdigest()
+
+        candidates = SafetyChecker.remoteCandidates(hashedPassword[:SafetyChecker.PREFIX_LENGTH], api_key)
+        if isinstance(candidates, Response):
+            return candidates
+
+        return SafetyChecker.matchCandidates(hashedPassword, candidates)
+
+    @staticmethod
+    async def exposureCountsAsync(passwords: List[str], concurrency: int = BATCH_CONCURRENCY) -> List[Union[int, Response]]:
+        """
+        Looks up many passwords concurrently. Passwords sharing a hash prefix cost a single API lookup, at most
+        `concurrency` lookups are in flight at once, and rate limited lookups are retried after backing off.
+
+        :param passwords: The passwords to check.
+        :param concurrency: Maximum number of simultaneous API requests.
+        :return: Per password, in order, the number of times it was exposed or the error response of its lookup.
+        """
+        try:
+            corpus = SafetyChecker.getCorpus()
+        except (OSError, ValueError) as e:
+            return [Response(False, f"The breach corpus could not be opened: {str(e)}")] * len(passwords)
+
+        if corpus is not None:
+            return [corpus.lookupPassword(password) for password in passwords]
+
+        api_key = SafetyChecker.get_api_key()
+        if not api_key:
+            return [Response(False, "API key is missing. Set ENZOIC_API_KEY in environment variables.")] * len(passwords)
+
+        hashes = [hashlib.sha256(password.encode()).hexdigest() for password in passwords]
+        prefixes = list(dict.fromkeys(hashed[:SafetyChecker.PREFIX_LENGTH] for hashed in hashes))
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            async def lookup(prefix: str):
+                async with semaphore:
+                    return await loop.run_in_executor(executor, SafetyChecker.remoteCandidates, prefix, api_key, SafetyChecker.MAX_RATE_LIMIT_RETRIES)
+
+            results = dict(zip(prefixes, await asyncio.gather(*(lookup(prefix) for prefix in prefixes))))
+
+        counts = []
+        for hashed in hashes:
+            candidates = results[hashed[:SafetyChecker.PREFIX_LENGTH]]
+            counts.append(candidates if isinstance(candidates, Response) else SafetyChecker.exposureCountOf(hashed, candidates))
+        return counts
+
+    @staticmethod
+    def exposureCounts(passwords: List[str], concurrency: int = BATCH_CONCURRENCY) -> List[Union[int, Response]]:
+        """
+        Blocking form of exposureCountsAsync, for threads that do not run an event loop such as command workers.
+        """
+        return asyncio.run(SafetyChecker.exposureCountsAsync(passwords, concurrency))
+
+    @staticmethod
+    async def checkPasswordsAsync(passwords: List[str], concurrency: int = BATCH_CONCURRENCY) -> List[Response]:
+        """
+        Checks many passwords concurrently, see exposureCountsAsync.
+
+        :param passwords: The passwords to check.
+        :param concurrency: Maximum number of simultaneous API requests.
+        :return: One response per password, in order.
+        """
+        counts = await SafetyChecker.exposureCountsAsync(passwords, concurrency)
+        return [count if isinstance(count, Response) else SafetyChecker.exposureResponse(count) for count in counts]
+
+    @staticmethod
+    def checkPasswordsSecurity(passwords: List[str], concurrency: int = BATCH_CONCURRENCY) -> List[Response]:
+        """
+        Blocking form of checkPasswordsAsync, for threads that do not run an event loop such as command workers.
+
+        :param passwords: The passwords to check.
+        :param concurrency: Maximum number of simultaneous API requests.
+        :return: One response per password, in order.
+        """
+        return asyncio.run(SafetyChecker.checkPasswordsAsync(passwords, concurrency))
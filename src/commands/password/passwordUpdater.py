@@ -1,17 +1,19 @@
-import os
 import json
+from typing import Optional
 from cryptographing.crypting import Crypt
+from cryptographing.vaultKeyring import VaultKeyring
 from response.response import Response
-from commands.vault.vaultCreator import VaultCreator
+from storage.vaultStorage import VaultStorage
 
 class PasswordUpdater:
     @staticmethod
-    def updatePassword(user: str, command) -> Response:
+    def updatePassword(user: str, command, keyring: Optional[VaultKeyring] = None) -> Response:
         """
         Updates a password entry for a given URL and username in the specified category.
 
         :param user: The username of the vault owner.
         :param command: Command object containing parameters [URL, Username, New Password, Category].
+        :param keyring: The session's keyring; built from the cached user cipher when not given.
         :return: Response object indicating success or failure.
         """
         if len(command.parameters) != 4:
@@ -22,30 +24,25 @@ class PasswordUpdater:
         newPassword: str = command.parameters[2]
         category: str = command.parameters[3]
 
-        vaultPath: str = f"{VaultCreator.VAULTS_DIR}/{user}/{category}.json"
-
-        if not os.path.exists(vaultPath):
+        if not VaultStorage.vaultExists(user, category):
             return Response(False, f"Vault '{category}' does not exist for user '{user}'.")
 
         try:
-            with open(vaultPath, "r") as file:
-                vaultData: dict = json.load(file)
-
-            if url not in vaultData:
-                return Response(False, f"No entry found for '{url}' in '{category}'.")
+            with VaultStorage.lockVault(user, category):
+                storedData = VaultStorage.getEntry(user, category, url)
 
-            if dict(vaultData[url]).get("username") != username:
-                return Response(False, f"No matching username '{username}' found for '{url}' in '{category}'.")
+                if storedData is None:
+                    return Response(False, f"No entry found for '{url}' in '{category}'.")
 
-            key: bytes = Crypt.generateKey(user)
-            encryptedPassword: str = Crypt.encryptPassword(newPassword, key).decode()
+                if storedData.get("username") != username:
+                    return Response(False, f"No matching username '{username}' found for '{url}' in '{category}'.")
 
-            vaultData[url]["password"] = encryptedPassword
+                keyring = keyring if keyring is not None else VaultKeyring.forUser(user)
+                encryptedPassword: str = Crypt.encryptWithCipher(newPassword, keyring.cipherFor(category)).decode()
 
-            with open(vaultPath, "w") as file:
-                json.dump(vaultData, file, indent=4)
+                VaultStorage.putEntry(user, category, url, {**storedData, "password": encryptedPassword})
 
             return Response(True, f"Successfully updated password for '{username}' under '{url}' in '{category}'.")
 
-        except (json.JSONDecodeError, FileNotFoundError):
+        except (json.JSONDecodeError, ValueError, FileNotFoundError):
             return Response(False, "Failed to read or update the vault file.")
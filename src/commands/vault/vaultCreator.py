@@ -1,11 +1,11 @@
 import os
-import json
 from response.response import Response
 from commands.vault.vaultCategoryEnum import VaultCategoryEnum
+from storage.vaultStorage import VaultStorage
 
 class VaultCreator:
     VAULTS_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    VAULTS_DIR = os.path.join(VAULTS_BASE_DIR, "ApplicationStorage", "account_vaults")
+    VAULTS_DIR = VaultStorage.VAULTS_DIR
 
     @staticmethod
     def createVault(username):
@@ -15,16 +15,8 @@ class VaultCreator:
         :param username: The username for which the vault should be created.
         :return: Response object indicating success or failure.
         """
-        userVaultPath = os.path.join(VaultCreator.VAULTS_DIR, username)
-        defaultFilePath = os.path.join(userVaultPath, "default.json")
-
         try:
-            os.makedirs(userVaultPath, exist_ok=True)
-
-            if not os.path.exists(defaultFilePath):
-                with open(defaultFilePath, "w") as file:
-                    json.dump({}, file, indent=4)
-
+            if VaultStorage.createVault(username, VaultCategoryEnum.DEFAULT.value):
                 return Response(True, f"Default vault created for user '{username}'.")
             
             return Response(True, f"Vault already exists for user '{username}'.")
@@ -49,15 +41,8 @@ class VaultCreator:
             allowedCategories = [cat.value for cat in VaultCategoryEnum]
             return Response(False, f"Invalid category. Allowed categories: {', '.join(allowedCategories)}")
 
-        userVaultPath = os.path.join(VaultCreator.VAULTS_DIR, username)
-        categoryFilePath = os.path.join(userVaultPath, f"{category.value}.json")
-
         try:
-            os.makedirs(userVaultPath, exist_ok=True)
-
-            if not os.path.exists(categoryFilePath):
-                with open(categoryFilePath, "w") as file:
-                    json.dump({}, file, indent=4)
+            if VaultStorage.createVault(username, category.value):
                 return Response(True, f"Vault for category '{category.value}' created successfully for user '{username}'.")
             else:
                 return Response(True, f"Vault for category '{category.value}' already exists for user '{username}'.")
@@ -1,24 +1,35 @@
-import os
 from response.response import Response
-from commands.vault.vaultCreator import VaultCreator
+from storage.vaultStorage import VaultStorage
+from commands.pagination import Pagination
 
 class VaultLister:
     @staticmethod
-    def listVaults(user):
+    def listVaults(user, command=None):
         """
-        Lists all available vaults for the given user.
+        Lists the available vaults for the given user, one page at a time in sorted order.
 
         :param user: The username whose vaults should be listed.
-        :return: Response object containing the list of vaults or an error message.
+        :param command: Optional command object with parameters [pageSize (optional), cursor (optional)].
+        :return: Response object containing a page of vaults and the cursor of the next page, or an error message.
         """
-        vaultDirectory = os.path.join(VaultCreator.VAULTS_DIR, user)
+        parameters: list = command.parameters if command is not None else []
 
-        if not os.path.exists(vaultDirectory):
+        if len(parameters) > 2:
+            return Response(False, "Invalid parameters count, expected: [pageSize] [cursor]")
+
+        try:
+            pageSize, after = Pagination.parseArguments(parameters)
+        except ValueError as e:
+            return Response(False, f"Invalid pagination parameters: {str(e)}")
+
+        if not VaultStorage.userExists(user):
             return Response(False, f"No vaults found for user '{user}'.")
 
-        vaults = [file.replace(".json", "") for file in os.listdir(vaultDirectory) if file.endswith(".json")]
+        vaults, hasMore = Pagination.pageOf(sorted(VaultStorage.listCategories(user)), after, pageSize)
 
         if not vaults:
+            if after is not None:
+                return Response(False, f"User '{user}' has no more vaults.")
             return Response(False, f"User '{user}' exists but has no saved vaults.")
 
-        return Response(True, f"Available vaults: {', '.join(vaults)}")
+        return Response(True, f"Available vaults: {', '.join(vaults)}", nextCursor=Pagination.nextCursor(vaults, hasMore))
@@ -0,0 +1,20 @@
+import os
+import argparse
+
+from strength.strengthData import StrengthData
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compiles the word lists and keyboard graphs of the strength estimator.")
+    parser.add_argument("--source", default=StrengthData.SOURCE_DIR, help="Directory with the rank-ordered <dictionary>.txt word lists.")
+    parser.add_argument("--output", default=StrengthData.COMPILED_PATH, help="Compiled file the estimator loads.")
+    arguments = parser.parse_args()
+
+    compiled = StrengthData.compile(arguments.source)
+    temporaryPath = arguments.output + ".tmp"
+    with open(temporaryPath, "wb") as output:
+        output.write(compiled)
+    os.replace(temporaryPath, arguments.output)
+
+    data = StrengthData.parse(compiled)
+    print(f"Compiled {len(data.words)} words from {len(data.dictionaryNames)} dictionaries and "
+          f"{len(data.graphs)} keyboard graphs into {arguments.output} ({len(compiled)} bytes).")
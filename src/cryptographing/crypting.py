@@ -1,13 +1,33 @@
+import os
 import base64
 import hashlib
-from cryptography.fernet import Fernet
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from cryptography.fernet import InvalidToken
+from cryptographing.vaultCipher import VaultCipher
+from utils.lruCache import LruCache
 
 class Crypt:
     """
     A utility class for encryption and decryption of passwords.
-    Uses SHA-256 hashing and Fernet symmetric encryption.
+    Uses SHA-256 hashing and VaultCipher symmetric encryption (AES-GCM, legacy Fernet tokens stay readable).
+    Sessions derive their user's cipher once at login and keep it; code running without a session
+    shares ready ciphers through a bounded cache instead of deriving the key on every call.
+    Bulk operations use encryptMany/decryptMany: one cipher for the whole list, split over a shared
+    thread pool once the list is long enough for the fan-out to pay off (OpenSSL runs without the GIL).
     """
 
+    MAX_CACHED_CIPHERS: int = 256
+    BATCH_THRESHOLD: int = 512
+    DEFAULT_BATCH_WORKERS: int = max(1, min(8, os.cpu_count() or 1))
+
+    cipherCache = LruCache(MAX_CACHED_CIPHERS)
+    batchWorkers: int = DEFAULT_BATCH_WORKERS
+    batchPool: Optional[ThreadPoolExecutor] = None
+    batchPoolLock = threading.Lock()
+
     @staticmethod
     def generateKey(username: str) -> bytes:
         """
@@ -32,8 +52,8 @@ class Crypt:
         :param key: The encryption key used for decryption.
         :return: The decrypted password as a string.
         """
-        fernet = Fernet(key)
-        decryptedPassword: str = fernet.decrypt(encryptedPassword.encode()).decode()
+        cipher = VaultCipher(key)
+        decryptedPassword: str = cipher.decrypt(encryptedPassword.encode()).decode()
         return decryptedPassword
 
     @staticmethod
@@ -45,6 +65,127 @@ class Crypt:
         :param key: The encryption key used for encryption.
         :return: The encrypted password as a byte string.
         """
-        fernet = Fernet(key)
-        encryptedPassword: bytes = fernet.encrypt(password.encode())
+        cipher = VaultCipher(key)
+        encryptedPassword: bytes = cipher.encrypt(password.encode())
         return encryptedPassword
+
+    @staticmethod
+    def getCipher(username: str) -> VaultCipher:
+        """
+        Returns a ready cipher for a user, deriving its key only if no cipher is cached.
+
+        :param username: The username the key is derived from.
+        :return: The user's cipher.
+        """
+        return Crypt.cipherCache.getOrCreate(username, lambda: VaultCipher(Crypt.generateKey(username)))
+
+    @staticmethod
+    def dropCipher(username: str) -> None:
+        """
+        Removes a user's cipher from the cache, e.g. when the user logs out.
+
+        :param username: The username whose cipher should be dropped.
+        """
+        Crypt.cipherCache.pop(username)
+
+    @staticmethod
+    def encryptWithCipher(password: str, cipher: VaultCipher) -> bytes:
+        """
+        Encrypts a given password with a ready cipher.
+
+        :param password: The plaintext password to encrypt.
+        :param cipher: The cipher returned by getCipher.
+        :return: The encrypted password as a byte string.
+        """
+        return cipher.encrypt(password.encode())
+
+    @staticmethod
+    def decryptWithCipher(encryptedPassword: str, cipher: VaultCipher) -> str:
+        """
+        Decrypts an encrypted password with a ready cipher.
+
+        :param encryptedPassword: The encrypted password (base64 encoded).
+        :param cipher: The cipher returned by getCipher.
+        :return: The decrypted password as a string.
+        """
+        return cipher.decrypt(encryptedPassword.encode()).decode()
+
+    @staticmethod
+    def encryptMany(passwords: List[str], cipher: VaultCipher) -> List[bytes]:
+        """
+        Encrypts many passwords with one cipher.
+
+        :param passwords: The plaintext passwords.
+        :param cipher: The cipher returned by getCipher or a vault keyring.
+        :return: The encrypted passwords, in the order of the input.
+        """
+        return Crypt.mapChunks(lambda chunk: [cipher.encrypt(password.encode()) for password in chunk], passwords)
+
+    @staticmethod
+    def decryptMany(encryptedPasswords: List[str], cipher: VaultCipher, strict: bool = True) -> List[Optional[str]]:
+        """
+        Decrypts many passwords with one cipher.
+
+        :param encryptedPasswords: The encrypted passwords.
+        :param cipher: The cipher returned by getCipher or a vault keyring.
+        :param strict: Whether a token that cannot be decrypted raises; otherwise its result is None.
+        :return: The decrypted passwords, in the order of the input.
+        :raises InvalidToken: If strict and a token cannot be decrypted.
+        """
+        def decryptChunk(chunk: List[str]) -> List[Optional[str]]:
+            results: List[Optional[str]] = []
+            for token in chunk:
+                try:
+                    results.append(cipher.decrypt(token.encode()).decode())
+                except InvalidToken:
+                    if strict:
+                        raise
+                    results.append(None)
+            return results
+
+        return Crypt.mapChunks(decryptChunk, encryptedPasswords)
+
+    @staticmethod
+    def mapChunks(function: Callable[[list], list], items: list) -> list:
+        """
+        Applies a list function to items, inline for short lists and split into one chunk per
+        worker of the batch pool otherwise.
+
+        :param function: Maps a chunk of items to a list of results of the same length.
+        :param items: The items to process.
+        :return: The concatenated results, in the order of the input.
+        """
+        if len(items) < Crypt.BATCH_THRESHOLD or Crypt.batchWorkers <= 1:
+            return function(items)
+
+        chunkSize: int = -(-len(items) // Crypt.batchWorkers)
+        chunks: List[list] = [items[start:start + chunkSize] for start in range(0, len(items), chunkSize)]
+
+        results: list = []
+        for chunkResults in Crypt.getBatchPool().map(function, chunks):
+            results.extend(chunkResults)
+        return results
+
+    @staticmethod
+    def getBatchPool() -> ThreadPoolExecutor:
+        """
+        Returns the thread pool used by the batch operations, starting it on first use.
+        """
+        with Crypt.batchPoolLock:
+            if Crypt.batchPool is None:
+                Crypt.batchPool = ThreadPoolExecutor(max_workers=Crypt.batchWorkers, thread_name_prefix="crypt-batch")
+            return Crypt.batchPool
+
+    @staticmethod
+    def configureBatch(workers: int) -> None:
+        """
+        Sets the number of threads the batch operations fan out to.
+
+        :param workers: Number of threads, 1 disables the fan-out.
+        """
+        with Crypt.batchPoolLock:
+            pool, Crypt.batchPool = Crypt.batchPool, None
+            Crypt.batchWorkers = max(1, workers)
+
+        if pool is not None:
+            pool.shutdown(wait=True)
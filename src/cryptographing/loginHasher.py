@@ -0,0 +1,135 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+def hashPasswordTask(password: str, cost: Dict[str, int]) -> str:
+    """
+    Hashes a password with argon2id. Runs inside a worker process.
+
+    :param password: The plaintext password.
+    :param cost: The argon2 parameters (timeCost, memoryCost, parallelism).
+    :return: The encoded argon2 hash, including its salt and parameters.
+    """
+    return PasswordHasher(time_cost=cost["timeCost"], memory_cost=cost["memoryCost"], parallelism=cost["parallelism"]).hash(password)
+
+def verifyPasswordTask(storedHash: str, password: str, cost: Dict[str, int]) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password against an argon2 hash and rehashes it if it was made with other parameters.
+    Runs inside a worker process.
+
+    :param storedHash: The encoded argon2 hash of the account.
+    :param password: The plaintext password to check.
+    :param cost: The argon2 parameters currently configured.
+    :return: (whether the password matches, new hash if the stored one should be replaced).
+    """
+    hasher = PasswordHasher(time_cost=cost["timeCost"], memory_cost=cost["memoryCost"], parallelism=cost["parallelism"])
+
+    try:
+        hasher.verify(storedHash, password)
+    except (VerificationError, InvalidHashError):
+        return False, None
+
+    if hasher.check_needs_rehash(storedHash):
+        return True, hasher.hash(password)
+    return True, None
+
+class LoginHasher:
+    """
+    Memory-hard (argon2id) hashing of account passwords.
+    Hashing is deliberately expensive, so it runs in a dedicated process pool: a burst of logins
+    only occupies those processes and never the threads serving vault reads.
+    The cost is tunable; hashes made with other parameters are upgraded on the next successful login.
+    """
+
+    COST_PROFILES: Dict[str, Dict[str, int]] = {
+        "low": {"timeCost": 1, "memoryCost": 8 * 1024, "parallelism": 1},
+        "default": {"timeCost": 2, "memoryCost": 64 * 1024, "parallelism": 2},
+        "high": {"timeCost": 3, "memoryCost": 256 * 1024, "parallelism": 4},
+    }
+    DEFAULT_WORKERS: int = max(1, min(4, os.cpu_count() or 1))
+
+    cost: Dict[str, int] = dict(COST_PROFILES["default"])
+    workers: int = DEFAULT_WORKERS
+    pool: Optional[ProcessPoolExecutor] = None
+    poolLock = threading.Lock()
+
+    @staticmethod
+    def configure(profile: Optional[str] = None, workers: Optional[int] = None, **cost: int) -> None:
+        """
+        Sets the hashing cost and the size of the process pool.
+
+        :param profile: Name of a cost profile ("low", "default" or "high").
+        :param workers: Number of hashing processes.
+        :param cost: Individual overrides of timeCost, memoryCost (KiB) and parallelism.
+        """
+        if profile is not None:
+            if profile not in LoginHasher.COST_PROFILES:
+                raise ValueError(f"Unknown hashing cost '{profile}', expected one of: {', '.join(LoginHasher.COST_PROFILES)}")
+            LoginHasher.cost = dict(LoginHasher.COST_PROFILES[profile])
+
+        LoginHasher.cost.update(cost)
+
+        if workers is not None and workers != LoginHasher.workers:
+            LoginHasher.workers = workers
+            LoginHasher.shutdown()
+
+    @staticmethod
+    def getPool() -> ProcessPoolExecutor:
+        """
+        Returns the hashing process pool, starting it on first use.
+        Workers are spawned rather than forked, so they never inherit locks held by server threads.
+        """
+        with LoginHasher.poolLock:
+            if LoginHasher.pool is None:
+                LoginHasher.pool = ProcessPoolExecutor(max_workers=LoginHasher.workers, mp_context=multiprocessing.get_context("spawn"))
+            return LoginHasher.pool
+
+    @staticmethod
+    def run(task, *arguments):
+        """
+        Runs a hashing task in the process pool and waits for its result.
+        A pool whose worker died is replaced once before giving up.
+        """
+        try:
+            return LoginHasher.getPool().submit(task, *arguments).result()
+        except BrokenProcessPool:
+            LoginHasher.shutdown()
+            return LoginHasher.getPool().submit(task, *arguments).result()
+
+    @staticmethod
+    def hashPassword(password: str) -> str:
+        """
+        Hashes a password with the configured cost.
+
+        :param password: The plaintext password.
+        :return: The encoded argon2 hash.
+        """
+        return LoginHasher.run(hashPasswordTask, password, dict(LoginHasher.cost))
+
+    @staticmethod
+    def verifyPassword(storedHash: str, password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verifies a password against a stored hash.
+
+        :param storedHash: The encoded argon2 hash of the account.
+        :param password: The plaintext password to check.
+        :return: (whether the password matches, new hash if the stored one uses outdated parameters).
+        """
+        return LoginHasher.run(verifyPasswordTask, storedHash, password, dict(LoginHasher.cost))
+
+    @staticmethod
+    def shutdown() -> None:
+        """
+        Stops the hashing processes; a new pool is started on the next hash.
+        """
+        with LoginHasher.poolLock:
+            pool, LoginHasher.pool = LoginHasher.pool, None
+
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,327 @@
+import os
+import json
+import time
+import hashlib
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from cryptography.fernet import InvalidToken
+
+from cryptographing.crypting import Crypt
+from cryptographing.vaultCipher import VaultCipher
+from cryptographing.vaultKeyring import VaultKeyring
+from storage.vaultStorage import VaultStorage
+from utils.tokenBucket import TokenBucket
+
+def reencryptTokens(sourceKeys: List[bytes], targetKey: bytes, tokens: List[str]) -> List[Optional[str]]:
+    """
+    Re-encrypts password tokens under a target key. Runs inside a worker process.
+    A current-format token the target key already decrypts is kept as is, so running the job twice over a vault
+    is harmless; legacy Fernet tokens are always rewritten in the current format.
+
+    :param sourceKeys: The keys the tokens may be encrypted with.
+    :param targetKey: The key the tokens should be encrypted with.
+    :param tokens: The encrypted passwords.
+    :return: The re-encrypted tokens, None for a token no key can decrypt.
+    """
+    targetCipher = VaultCipher(targetKey)
+    ciphers: List[VaultCipher] = [targetCipher] + [VaultCipher(key) for key in sourceKeys]
+    results: List[Optional[str]] = []
+
+    for token in tokens:
+        result: Optional[str] = None
+        for cipher in ciphers:
+            try:
+                plaintext: bytes = cipher.decrypt(token.encode())
+            except InvalidToken:
+                continue
+
+            if cipher is targetCipher and not VaultCipher.isLegacy(token.encode()):
+                result = token
+            else:
+                result = targetCipher.encrypt(plaintext).decode()
+            break
+        results.append(result)
+
+    return results
+
+class ReencryptionCheckpoint:
+    """
+    Progress of the re-encryption of one user, stored in its own small JSON file so an interrupted
+    job can resume where it stopped. Files are replaced atomically after every vault.
+
+    Attributes:
+        path (str): Path of the checkpoint file.
+        user (str): The username the checkpoint belongs to.
+        completed (set): Categories whose vault is fully re-encrypted.
+        done (bool): Whether every vault of the user is re-encrypted.
+    """
+
+    def __init__(self, directory: str, user: str) -> None:
+        """
+        Loads the checkpoint of a user, or starts an empty one.
+
+        :param directory: Directory holding the checkpoint files.
+        :param user: The username of the vault owner.
+        """
+        self.path: str = os.path.join(directory, f"{hashlib.sha256(user.encode()).hexdigest()}.json")
+        self.user: str = user
+        self.completed: set = set()
+        self.done: bool = False
+
+        try:
+            with open(self.path, "r") as file:
+                data: dict = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        if data.get("user") == user:
+            self.completed = set(data.get("completed", []))
+            self.done = bool(data.get("done", False))
+
+    def save(self) -> None:
+        """
+        Writes the checkpoint through a temporary file and a rename.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporaryPath: str = self.path + ".tmp"
+        with open(temporaryPath, "w") as file:
+            json.dump({"user": self.user, "completed": sorted(self.completed), "done": self.done}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporaryPath, self.path)
+
+    def markVault(self, category: str) -> None:
+        """
+        Records that a vault is fully re-encrypted.
+        """
+        self.completed.add(category)
+        self.save()
+
+    def markDone(self) -> None:
+        """
+        Records that every vault of the user is re-encrypted.
+        """
+        self.done = True
+        self.save()
+
+class ReencryptionJob:
+    """
+    Moves every vault from each user's old key to a new one, e.g. after the key derivation changed.
+    A vault with a data key (see VaultKeyring) only has its header rewrapped with the new user key.
+    A vault written before envelope encryption gets a fresh data key: its passwords are re-encrypted under it,
+    fanned out over a process pool, and the vault is written together with its new header.
+    The job works on the store directly and must not run while a server uses it: the server's caches and keyring
+    would not see the new keys and its writes would race the job's. rotateKeys.py takes the StoreLock every
+    server shares exclusively, so it refuses to start while one is running.
+    A token bucket caps the entries processed per second, so the job leaves the machine enough CPU and disk.
+    A vault is always replaced as a whole: if any of its passwords cannot be decrypted it is left untouched,
+    so a vault never holds passwords under two different keys. Vaults written to by other threads of the
+    process while being re-encrypted are re-read and processed again.
+
+    Attributes:
+        oldKeyFor (Callable): Returns the current key of a user.
+        newKeyFor (Callable): Returns the new key of a user.
+        checkpointDir (str): Directory holding one checkpoint file per user.
+        stats (dict): Users, vaults and entries processed so far, and the vaults that failed.
+    """
+
+    DEFAULT_ENTRIES_PER_SECOND: float = 2000.0
+    DEFAULT_CHUNK_SIZE: int = 256
+    MAX_OPTIMISTIC_ATTEMPTS: int = 3
+
+    def __init__(self, oldKeyFor: Callable[[str], bytes], newKeyFor: Callable[[str], bytes], checkpointDir: str,
+                 workers: Optional[int] = None, entriesPerSecond: float = DEFAULT_ENTRIES_PER_SECOND,
+                 chunkSize: int = DEFAULT_CHUNK_SIZE, progress: Optional[Callable[[dict], None]] = None) -> None:
+        """
+        Configures a job; nothing is read before run is called.
+
+        :param oldKeyFor: Returns the key a user's passwords are currently encrypted with.
+        :param newKeyFor: Returns the key a user's passwords should be encrypted with.
+        :param checkpointDir: Directory holding one checkpoint file per user.
+        :param workers: Number of worker processes, defaults to the number of CPUs.
+        :param entriesPerSecond: Maximum number of entries re-encrypted per second.
+        :param chunkSize: Number of entries sent to a worker at once.
+        :param progress: Called with the current statistics after every vault.
+        """
+        self.oldKeyFor = oldKeyFor
+        self.newKeyFor = newKeyFor
+        self.checkpointDir = checkpointDir
+        self.workers: int = workers or os.cpu_count() or 1
+        self.chunkSize: int = chunkSize
+        self.bucket = TokenBucket(entriesPerSecond, max(entriesPerSecond, chunkSize))
+        self.progress = progress
+        self.startTime: float = 0.0
+        self.stats: dict = {"users": 0, "usersDone": 0, "usersSkipped": 0, "vaults": 0, "rewrappedVaults": 0, "entries": 0, "failedVaults": []}
+
+    def run(self) -> dict:
+        """
+        Re-encrypts the vaults of every user, skipping the users and vaults the checkpoints mark as done.
+
+        :return: The final statistics, see report.
+        """
+        users: List[str] = VaultStorage.listUsers()
+        self.stats["users"] = len(users)
+        self.startTime = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for user in users:
+                self.rotateUser(pool, user)
+
+        return self.report()
+
+    def rotateUser(self, pool: ProcessPoolExecutor, user: str) -> None:
+        """
+        Re-encrypts every vault of a user that is not checkpointed yet.
+
+        :param pool: The worker processes.
+        :param user: The username of the vault owner.
+        """
+        checkpoint = ReencryptionCheckpoint(self.checkpointDir, user)
+        if checkpoint.done:
+            self.stats["usersSkipped"] += 1
+            return
+
+        oldKey: bytes = self.oldKeyFor(user)
+        newKey: bytes = self.newKeyFor(user)
+        failed: bool = False
+
+        for category in VaultStorage.listCategories(user):
+            if category in checkpoint.completed:
+                continue
+
+            try:
+                self.stats["entries"] += self.rotateVault(pool, user, category, oldKey, newKey)
+            except (ValueError, FileNotFoundError) as e:
+                self.stats["failedVaults"].append({"user": user, "category": category, "error": str(e)})
+                failed = True
+                continue
+
+            checkpoint.markVault(category)
+            self.stats["vaults"] += 1
+            if self.progress is not None:
+                self.progress(self.report())
+
+        Crypt.dropCipher(user)
+        if not failed:
+            checkpoint.markDone()
+            self.stats["usersDone"] += 1
+
+    def rotateVault(self, pool: ProcessPoolExecutor, user: str, category: str, oldKey: bytes, newKey: bytes) -> int:
+        """
+        Moves one vault to the new user key: rewraps its data key, or gives a vault without one a data key.
+
+        :param pool: The worker processes.
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param oldKey: The user's current key.
+        :param newKey: The user's new key.
+        :return: Number of entries re-encrypted.
+        :raises ValueError: If the data key or a password of the vault cannot be decrypted with either key.
+        """
+        with VaultStorage.lockVault(user, category):
+            header: Optional[dict] = VaultStorage.getVaultHeader(user, category)
+            if header is not None:
+                VaultStorage.setVaultHeader(user, category, ReencryptionJob.rewrapHeader(header, oldKey, newKey))
+                self.stats["rewrappedVaults"] += 1
+                return 0
+
+        return self.migrateVault(pool, user, category, oldKey, newKey)
+
+    @staticmethod
+    def rewrapHeader(header: dict, oldKey: bytes, newKey: bytes) -> dict:
+        """
+        Wraps the data key of a vault header with the new user key; a header already wrapped with it is kept.
+
+        :raises ValueError: If neither key unwraps the header.
+        """
+        newCipher = VaultCipher(newKey)
+        try:
+            VaultKeyring.unwrapHeader(header, newCipher)
+            return header
+        except ValueError:
+            return VaultKeyring.rewrapHeader(header, VaultCipher(oldKey), newCipher)
+
+    def migrateVault(self, pool: ProcessPoolExecutor, user: str, category: str, oldKey: bytes, newKey: bytes) -> int:
+        """
+        Re-encrypts the passwords of a vault without data key under a fresh one, and replaces the vault and its
+        header as a whole. The vault is only locked while it is compared and written; if it changed while the
+        workers were busy the work is redone, the last time under the lock.
+
+        :param pool: The worker processes.
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param oldKey: The user's current key.
+        :param newKey: The user's new key.
+        :return: Number of entries re-encrypted.
+        :raises ValueError: If a password of the vault cannot be decrypted with either key.
+        """
+        dataKey: bytes = VaultCipher.generateKey()
+        header: dict = VaultKeyring.createHeader(dataKey, VaultCipher(newKey))
+        sourceKeys: List[bytes] = [oldKey, newKey]
+
+        for _ in range(ReencryptionJob.MAX_OPTIMISTIC_ATTEMPTS):
+            snapshot: dict = VaultStorage.loadVault(user, category)
+            rotated: dict = self.reencryptVault(pool, category, snapshot, sourceKeys, dataKey)
+
+            with VaultStorage.lockVault(user, category):
+                if VaultStorage.getVaultHeader(user, category) is None and VaultStorage.loadVault(user, category) == snapshot:
+                    VaultStorage.replaceVault(user, category, rotated, header)
+                    return len(rotated)
+
+        with VaultStorage.lockVault(user, category):
+            if VaultStorage.getVaultHeader(user, category) is not None:
+                return self.rotateVault(pool, user, category, oldKey, newKey)
+
+            snapshot = VaultStorage.loadVault(user, category)
+            rotated = self.reencryptVault(pool, category, snapshot, sourceKeys, dataKey)
+            VaultStorage.replaceVault(user, category, rotated, header)
+            return len(rotated)
+
+    def reencryptVault(self, pool: ProcessPoolExecutor, category: str, vaultData: dict, sourceKeys: List[bytes], targetKey: bytes) -> dict:
+        """
+        Re-encrypts the passwords of a decoded vault in chunks spread over the worker processes.
+
+        :param pool: The worker processes.
+        :param category: The vault category, used in error messages.
+        :param vaultData: Dictionary mapping URLs to their stored entries.
+        :param sourceKeys: The keys the passwords may be encrypted with.
+        :param targetKey: The key the passwords should be encrypted with.
+        :return: A new dictionary holding the re-encrypted entries.
+        :raises ValueError: If a password cannot be decrypted with any of the keys.
+        """
+        urls: List[str] = [url for url, entry in vaultData.items() if isinstance(entry, dict) and isinstance(entry.get("password"), str)]
+        futures: List[Future] = []
+
+        for start in range(0, len(urls), self.chunkSize):
+            chunk: List[str] = urls[start:start + self.chunkSize]
+            self.bucket.acquire(len(chunk))
+            futures.append(pool.submit(reencryptTokens, sourceKeys, targetKey, [vaultData[url]["password"] for url in chunk]))
+
+        rotated: dict = dict(vaultData)
+        unreadable: int = 0
+        for start, future in zip(range(0, len(urls), self.chunkSize), futures):
+            for url, token in zip(urls[start:start + self.chunkSize], future.result()):
+                if token is None:
+                    unreadable += 1
+                else:
+                    rotated[url] = {**vaultData[url], "password": token}
+
+        if unreadable:
+            raise ValueError(f"{unreadable} password(s) of vault '{category}' cannot be decrypted with any of the keys.")
+        return rotated
+
+    def report(self) -> dict:
+        """
+        Returns the progress of the job.
+
+        :return: The statistics, with the elapsed seconds and the entries re-encrypted per second.
+        """
+        elapsed: float = time.perf_counter() - self.startTime if self.startTime else 0.0
+        return {
+            **self.stats,
+            "failedVaults": list(self.stats["failedVaults"]),
+            "elapsed": elapsed,
+            "entriesPerSecond": self.stats["entries"] / elapsed if elapsed else 0.0,
+        }
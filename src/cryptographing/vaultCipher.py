@@ -0,0 +1,85 @@
+import os
+import base64
+import binascii
+
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+class VaultCipher:
+    """
+    Symmetric cipher for stored passwords with a versioned ciphertext format.
+    New tokens are "2." followed by unpadded url-safe base64 of nonce || AES-256-GCM ciphertext || tag: about half
+    the size of a Fernet token and cheaper to produce. Tokens without a version prefix are legacy Fernet tokens;
+    they stay readable and are replaced by the new format whenever the password is written again.
+    Keys keep the Fernet key format (32 url-safe base64 encoded bytes); the AES key is derived from them with HKDF,
+    so the two formats never use the same key material directly.
+    Nonces are random, which is safe for far more messages than a single vault data key ever encrypts.
+
+    Attributes:
+        fernet (Fernet): Cipher reading legacy tokens.
+        aead (AESGCM): Cipher reading and writing version 2 tokens.
+    """
+
+    AESGCM_PREFIX: bytes = b"2."
+    NONCE_SIZE: int = 12
+    HKDF_INFO: bytes = b"password-vault aes-256-gcm v2"
+
+    def __init__(self, key: bytes) -> None:
+        """
+        Initializes the cipher, deriving the AES key once.
+
+        :param key: A Fernet-format key, e.g. from Crypt.generateKey or VaultCipher.generateKey.
+        """
+        self.fernet = Fernet(key)
+        aesKey: bytes = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=VaultCipher.HKDF_INFO).derive(base64.urlsafe_b64decode(key))
+        self.aead = AESGCM(aesKey)
+
+    @staticmethod
+    def generateKey() -> bytes:
+        """
+        Generates a random key, e.g. a vault data key.
+
+        :return: A 32-byte url-safe base64 encoded key.
+        """
+        return Fernet.generate_key()
+
+    @staticmethod
+    def isLegacy(token: bytes) -> bool:
+        """
+        Checks whether a token uses the legacy Fernet format.
+
+        :param token: The encrypted data.
+        :return: True for a Fernet token.
+        """
+        return not token.startswith(VaultCipher.AESGCM_PREFIX)
+
+    def encrypt(self, data: bytes) -> bytes:
+        """
+        Encrypts data into a version 2 token.
+
+        :param data: The plaintext.
+        :return: The token.
+        """
+        nonce: bytes = os.urandom(VaultCipher.NONCE_SIZE)
+        return VaultCipher.AESGCM_PREFIX + base64.urlsafe_b64encode(nonce + self.aead.encrypt(nonce, data, None)).rstrip(b"=")
+
+    def decrypt(self, token: bytes) -> bytes:
+        """
+        Decrypts a token in either format.
+
+        :param token: The token.
+        :return: The plaintext.
+        :raises InvalidToken: If the token is malformed or was encrypted with another key.
+        """
+        if VaultCipher.isLegacy(token):
+            return self.fernet.decrypt(token)
+
+        encoded: bytes = token[len(VaultCipher.AESGCM_PREFIX):]
+        try:
+            payload: bytes = base64.urlsafe_b64decode(encoded + b"=" * (-len(encoded) % 4))
+            return self.aead.decrypt(payload[:VaultCipher.NONCE_SIZE], payload[VaultCipher.NONCE_SIZE:], None)
+        except (binascii.Error, InvalidTag, ValueError):
+            raise InvalidToken
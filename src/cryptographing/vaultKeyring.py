@@ -0,0 +1,123 @@
+from typing import Dict, Optional
+
+from cryptography.fernet import InvalidToken
+
+from cryptographing.crypting import Crypt
+from cryptographing.vaultCipher import VaultCipher
+from storage.vaultStorage import VaultStorage
+
+class VaultKeyring:
+    """
+    Envelope encryption of a user's vaults. Every vault gets its own random data key, which encrypts the
+    vault's passwords; the data key itself is stored in the vault header, wrapped (encrypted) by the user key.
+    Changing the user key therefore only rewraps one small key per vault instead of re-encrypting every entry.
+    A session keeps one keyring and unwraps a vault's data key on the first access to that vault.
+    Vaults written before envelope encryption have no header: their entries stay under the user key until
+    the re-encryption job gives them a data key, and new empty vaults get a data key on first use.
+
+    Attributes:
+        user (str): The username of the vault owner.
+        userCipher (VaultCipher): The cipher of the user key, wrapping the data keys.
+        ciphers (dict): Category -> cipher of the vault's unwrapped data key.
+    """
+
+    HEADER_VERSION: int = 1
+
+    def __init__(self, user: str, userCipher: VaultCipher) -> None:
+        """
+        Initializes a keyring with no vault unlocked yet.
+
+        :param user: The username of the vault owner.
+        :param userCipher: The cipher of the user key.
+        """
+        self.user = user
+        self.userCipher = userCipher
+        self.ciphers: Dict[str, VaultCipher] = {}
+
+    @staticmethod
+    def forUser(user: str) -> "VaultKeyring":
+        """
+        Returns a keyring built on the user's cached cipher, for callers running without a session.
+
+        :param user: The username of the vault owner.
+        :return: A new keyring.
+        """
+        return VaultKeyring(user, Crypt.getCipher(user))
+
+    @staticmethod
+    def createHeader(dataKey: bytes, userCipher: VaultCipher) -> dict:
+        """
+        Builds a vault header holding a data key wrapped by a user key.
+
+        :param dataKey: The vault's data key.
+        :param userCipher: The cipher of the user key.
+        :return: The header to store with the vault.
+        """
+        return {"version": VaultKeyring.HEADER_VERSION, "wrappedKey": userCipher.encrypt(dataKey).decode()}
+
+    @staticmethod
+    def unwrapHeader(header: dict, userCipher: VaultCipher) -> bytes:
+        """
+        Extracts the data key from a vault header.
+
+        :param header: The vault header.
+        :param userCipher: The cipher of the user key the data key was wrapped with.
+        :return: The vault's data key.
+        :raises ValueError: If the header is malformed or was wrapped with another key.
+        """
+        if header.get("version") != VaultKeyring.HEADER_VERSION or not isinstance(header.get("wrappedKey"), str):
+            raise ValueError(f"Unsupported vault header: {header}")
+
+        try:
+            return userCipher.decrypt(header["wrappedKey"].encode())
+        except InvalidToken:
+            raise ValueError("The vault key cannot be unwrapped with this user key.")
+
+    @staticmethod
+    def rewrapHeader(header: dict, oldCipher: VaultCipher, newCipher: VaultCipher) -> dict:
+        """
+        Wraps the data key of a vault header with a new user key.
+
+        :param header: The vault header.
+        :param oldCipher: The cipher of the user key the data key is wrapped with.
+        :param newCipher: The cipher of the new user key.
+        :return: The new header.
+        :raises ValueError: If the header cannot be unwrapped with the old key.
+        """
+        return VaultKeyring.createHeader(VaultKeyring.unwrapHeader(header, oldCipher), newCipher)
+
+    def cipherFor(self, category: str) -> VaultCipher:
+        """
+        Returns the cipher encrypting the passwords of a vault, unwrapping its data key on first use.
+        An empty vault without a header gets a fresh data key; a non-empty one is a vault written before
+        envelope encryption, whose passwords are still encrypted with the user key.
+
+        :param category: The vault category.
+        :return: The cipher of the vault.
+        :raises FileNotFoundError: If the vault does not exist.
+        :raises ValueError: If the vault header cannot be unwrapped with the user key.
+        """
+        cipher: Optional[VaultCipher] = self.ciphers.get(category)
+        if cipher is not None:
+            return cipher
+
+        header: Optional[dict] = VaultStorage.getVaultHeader(self.user, category)
+        if header is None:
+            with VaultStorage.lockVault(self.user, category):
+                header = VaultStorage.getVaultHeader(self.user, category)
+                if header is None:
+                    if VaultStorage.listUrls(self.user, category):
+                        return self.userCipher
+
+                    header = VaultKeyring.createHeader(VaultCipher.generateKey(), self.userCipher)
+                    VaultStorage.setVaultHeader(self.user, category, header)
+
+        cipher = VaultCipher(VaultKeyring.unwrapHeader(header, self.userCipher))
+        self.ciphers[category] = cipher
+        return cipher
+
+    def lock(self) -> None:
+        """
+        Forgets every unwrapped data key, e.g. when the user logs out.
+        """
+        self.ciphers.clear()
@@ -0,0 +1,21 @@
+import argparse
+
+from storage.breachCorpus import BreachCorpus, BreachCorpusImporter
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Imports SHA-256 breach hash dumps into a local breach corpus.")
+    parser.add_argument("dumps", nargs="+", help="Dump files with one '<sha256 hex>[:<count>]' per line.")
+    parser.add_argument("--corpus", required=True, help="Corpus directory; point BREACH_CORPUS_DIR at it to check passwords offline.")
+    parser.add_argument("--run-records", type=int, default=BreachCorpusImporter.DEFAULT_RUN_RECORDS,
+                        help="Records sorted in memory at once; lower it to use less memory.")
+    parser.add_argument("--false-positive-rate", type=float, default=BreachCorpusImporter.DEFAULT_FALSE_POSITIVE_RATE,
+                        help="False positive rate of the Bloom filter, 0 to build no filter. The filter is built on disk, "
+                             "about 1.8 bytes per distinct hash at 0.001.")
+    arguments = parser.parse_args()
+
+    importer = BreachCorpusImporter(arguments.corpus, arguments.run_records, arguments.false_positive_rate or None)
+    stats = importer.importFiles(arguments.dumps)
+
+    print(f"Read {stats['lines']} lines ({stats['skipped']} skipped) in {stats['runs']} sorted run(s), "
+          f"stored {stats['hashes']} distinct hashes in {arguments.corpus}.")
+    BreachCorpus(arguments.corpus).close()
@@ -0,0 +1,199 @@
+import socket
+import struct
+import asyncio
+from collections import deque
+from typing import Iterator, List, Optional
+
+class FramingError(Exception):
+    """
+    Raised when the peer sends data that does not follow the framing protocol.
+    """
+
+class MessageFraming:
+    """
+    Length-prefixed framing for the JSON messages exchanged between client and server.
+
+    Every message is sent as one or more frames. A frame starts with a 5-byte header
+    (1 byte of flags, 4 bytes big-endian payload length) followed by the payload.
+    Messages larger than MAX_CHUNK_SIZE are streamed as several chunk frames, the last
+    one carrying FLAG_FINAL, so neither side has to assume one recv() equals one message.
+    """
+
+    HEADER: struct.Struct = struct.Struct("!BI")
+    FLAG_FINAL: int = 0x01
+    MAX_CHUNK_SIZE: int = 16 * 1024
+    MAX_MESSAGE_SIZE: int = 16 * 1024 * 1024
+
+    @staticmethod
+    def encodeFrames(message: str) -> Iterator[bytes]:
+        """
+        Splits a message into frames ready to be written to the wire.
+
+        :param message: The message to send.
+        :return: Iterator over the encoded frames, in order.
+        """
+        payload: bytes = message.encode()
+        chunkSize: int = MessageFraming.MAX_CHUNK_SIZE
+
+        if not payload:
+            yield MessageFraming.HEADER.pack(MessageFraming.FLAG_FINAL, 0)
+            return
+
+        for offset in range(0, len(payload), chunkSize):
+            chunk: bytes = payload[offset:offset + chunkSize]
+            isLast: bool = offset + chunkSize >= len(payload)
+            yield MessageFraming.HEADER.pack(MessageFraming.FLAG_FINAL if isLast else 0, len(chunk)) + chunk
+
+    @staticmethod
+    async def readMessageAsync(reader: asyncio.StreamReader) -> Optional[str]:
+        """
+        Reads one complete message from an asyncio stream.
+
+        :param reader: The stream to read from.
+        :return: The decoded message, or None if the peer closed the connection between messages.
+        """
+        chunks: List[bytes] = []
+        received: int = 0
+
+        while True:
+            try:
+                header: bytes = await reader.readexactly(MessageFraming.HEADER.size)
+            except asyncio.IncompleteReadError as e:
+                if not e.partial and not chunks:
+                    return None
+                raise FramingError("Connection closed in the middle of a frame.")
+
+            flags, length = MessageFraming.HEADER.unpack(header)
+            received += length
+            if received > MessageFraming.MAX_MESSAGE_SIZE:
+                raise FramingError(f"Message exceeds the maximum size of {MessageFraming.MAX_MESSAGE_SIZE} bytes.")
+
+            try:
+                chunks.append(await reader.readexactly(length))
+            except asyncio.IncompleteReadError:
+                raise FramingError("Connection closed in the middle of a frame.")
+
+            if flags & MessageFraming.FLAG_FINAL:
+                return b"".join(chunks).decode()
+
+    @staticmethod
+    async def writeMessageAsync(writer: asyncio.StreamWriter, message: str) -> None:
+        """
+        Streams one message to an asyncio stream, draining after every chunk.
+
+        :param writer: The stream to write to.
+        :param message: The message to send.
+        """
+        for frame in MessageFraming.encodeFrames(message):
+            writer.write(frame)
+            await writer.drain()
+
+class FrameDecoder:
+    """
+    Incremental decoder turning an arbitrary sequence of received bytes into complete messages.
+    Handles frames split across reads as well as several pipelined messages arriving in one read.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty decoder.
+        """
+        self.buffer = bytearray()
+        self.pendingChunks: List[bytes] = []
+        self.pendingSize: int = 0
+
+    def feed(self, data: bytes) -> List[str]:
+        """
+        Adds received bytes to the decoder.
+
+        :param data: Bytes as returned by recv().
+        :return: The messages completed by this data, in the order they were sent.
+        """
+        self.buffer.extend(data)
+        messages: List[str] = []
+        headerSize: int = MessageFraming.HEADER.size
+
+        while len(self.buffer) >= headerSize:
+            flags, length = MessageFraming.HEADER.unpack_from(self.buffer)
+
+            if self.pendingSize + length > MessageFraming.MAX_MESSAGE_SIZE:
+                raise FramingError(f"Message exceeds the maximum size of {MessageFraming.MAX_MESSAGE_SIZE} bytes.")
+
+            if len(self.buffer) < headerSize + length:
+                break
+
+            self.pendingChunks.append(bytes(self.buffer[headerSize:headerSize + length]))
+            self.pendingSize += length
+            del self.buffer[:headerSize + length]
+
+            if flags & MessageFraming.FLAG_FINAL:
+                messages.append(b"".join(self.pendingChunks).decode())
+                self.pendingChunks = []
+                self.pendingSize = 0
+
+        return messages
+
+    def hasPartialMessage(self) -> bool:
+        """
+        Returns whether bytes of an unfinished message are still buffered.
+        """
+        return bool(self.buffer) or bool(self.pendingChunks)
+
+class FramedSocket:
+    """
+    Wraps a connected socket so that whole messages are sent and received instead of raw bytes.
+    Received messages are queued, which allows the peer to pipeline several messages at once.
+    """
+
+    RECV_SIZE: int = 64 * 1024
+
+    def __init__(self, sock: socket.socket) -> None:
+        """
+        Initializes the framed socket.
+
+        :param sock: A connected stream socket.
+        """
+        self.sock = sock
+        self.decoder = FrameDecoder()
+        self.received: deque[str] = deque()
+
+    def sendMessage(self, message: str) -> None:
+        """
+        Sends one message, streaming it as chunk frames when it is large.
+
+        :param message: The message to send.
+        """
+        for frame in MessageFraming.encodeFrames(message):
+            self.sock.sendall(frame)
+
+    def sendMessages(self, messages: List[str]) -> None:
+        """
+        Sends several messages back to back without waiting for any reply.
+        The call blocks until the peer has read enough of them. A caller that pipelines commands to a peer that
+        answers while it reads must therefore bound the messages it sends ahead of their replies.
+
+        :param messages: The messages to send, in order.
+        """
+        self.sock.sendall(b"".join(frame for message in messages for frame in MessageFraming.encodeFrames(message)))
+
+    def receiveMessage(self) -> Optional[str]:
+        """
+        Blocks until one complete message is available.
+
+        :return: The next message, or None if the peer closed the connection between messages.
+        """
+        while not self.received:
+            data: bytes = self.sock.recv(FramedSocket.RECV_SIZE)
+            if not data:
+                if self.decoder.hasPartialMessage():
+                    raise FramingError("Connection closed in the middle of a frame.")
+                return None
+            self.received.extend(self.decoder.feed(data))
+
+        return self.received.popleft()
+
+    def close(self) -> None:
+        """
+        Closes the underlying socket.
+        """
+        self.sock.close()
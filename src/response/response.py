@@ -1,4 +1,5 @@
 import json
+from typing import List, Optional
 
 class Response:
     """
@@ -7,17 +8,26 @@ class Response:
     Attributes:
         status (bool): Indicates if the response is successful (True) or failed (False).
         description (str): A message providing details about the response.
+        results (list[Response] | None): The responses of the sub-commands of a batch, in order.
+        nextCursor (str | None): Opaque cursor for fetching the next page of a paginated listing.
+        partial (bool): Marks a progress update streamed ahead of the final response of a long-running command.
     """
 
-    def __init__(self, status: bool, description: str) -> None:
+    def __init__(self, status: bool, description: str, results: Optional[List["Response"]] = None, nextCursor: Optional[str] = None, partial: bool = False) -> None:
         """
         Initializes a Response object.
         
         :param status: The status of the response (True for success, False for failure).
         :param description: A descriptive message for the response.
+        :param results: Optional list of per sub-command responses, used by batch commands.
+        :param nextCursor: Optional cursor of the next page, used by paginated listings.
+        :param partial: Whether this is a progress update that the final response of the same command follows.
         """
         self.status: bool = status
         self.description: str = description
+        self.results: Optional[List[Response]] = results
+        self.nextCursor: Optional[str] = nextCursor
+        self.partial: bool = partial
 
     def __str__(self) -> str:
         """
@@ -36,10 +46,24 @@ class Response:
         :return: A Response object with extracted values.
         """
         data = json.loads(json_string)
+        return Response.fromDict(data)
+
+    @staticmethod
+    def fromDict(data: dict) -> "Response":
+        """
+        Builds a Response object from an already decoded JSON object.
+
+        :param data: Dictionary with the response fields.
+        :return: A Response object with extracted values.
+        """
         status: bool = data.get("status", False)
         description: str = data.get("description", "No description provided.")
+        results: Optional[List[Response]] = None
+
+        if data.get("results") is not None:
+            results = [Response.fromDict(result) for result in data["results"]]
         
-        return Response(status, description)
+        return Response(status, description, results, data.get("nextCursor"), data.get("partial", False))
 
     def toJson(self) -> str:
         """
@@ -47,8 +71,26 @@ class Response:
 
         :return: A JSON string representing the response.
         """
+        return json.dumps(self.toDict())
+
+    def toDict(self) -> dict:
+        """
+        Converts the Response object into a JSON-serializable dictionary.
+
+        :return: Dictionary with the response fields.
+        """
         data = {
             "status": self.status,
             "description": self.description
         }
-        return json.dumps(data)
+
+        if self.results is not None:
+            data["results"] = [result.toDict() for result in self.results]
+
+        if self.nextCursor is not None:
+            data["nextCursor"] = self.nextCursor
+
+        if self.partial:
+            data["partial"] = True
+
+        return data
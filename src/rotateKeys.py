@@ -0,0 +1,56 @@
+import argparse
+import importlib
+from typing import Callable
+
+from storage.vaultStorage import VaultStorage
+from storage.storeLock import StoreLock
+from cryptographing.reencryptionJob import ReencryptionJob
+
+def loadKeyFunction(path: str) -> Callable[[str], bytes]:
+    """
+    Resolves a "module:attribute" path, e.g. "cryptographing.crypting:Crypt.generateKey", to a function
+    returning the key of a user.
+
+    :param path: The module and the dotted attribute path, separated by a colon.
+    :return: The key function.
+    """
+    moduleName, _, attributePath = path.partition(":")
+    if not attributePath:
+        raise ValueError(f"Expected 'module:function', got '{path}'.")
+
+    function = importlib.import_module(moduleName)
+    for attribute in attributePath.split("."):
+        function = getattr(function, attribute)
+    return function
+
+def printProgress(report: dict) -> None:
+    """
+    Prints a one-line progress report.
+    """
+    print(f"[{report['usersDone'] + report['usersSkipped']}/{report['users']} users] {report['vaults']} vault(s), "
+          f"{report['entries']} entries, {report['entriesPerSecond']:.0f} entries/s, {len(report['failedVaults'])} failed vault(s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-encrypts every stored password from the old key of its user to a new one.")
+    parser.add_argument("--new-key", required=True, help="module:function returning the new key of a user.")
+    parser.add_argument("--old-key", default="cryptographing.crypting:Crypt.generateKey",
+                        help="module:function returning the current key of a user.")
+    parser.add_argument("--checkpoints", required=True, help="Directory holding the per-user checkpoints, reuse it to resume.")
+    parser.add_argument("--storage", choices=VaultStorage.ENGINES, default="file")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes, defaults to the number of CPUs.")
+    parser.add_argument("--rate", type=float, default=ReencryptionJob.DEFAULT_ENTRIES_PER_SECOND,
+                        help="Maximum number of entries re-encrypted per second.")
+    arguments = parser.parse_args()
+
+    storeLock = StoreLock()
+    if not storeLock.acquire(exclusive=True):
+        raise SystemExit("A server is using the vault storage; stop it before rotating keys.")
+
+    VaultStorage.useEngine(VaultStorage.createEngine(arguments.storage))
+    job = ReencryptionJob(loadKeyFunction(arguments.old_key), loadKeyFunction(arguments.new_key), arguments.checkpoints,
+                          workers=arguments.workers, entriesPerSecond=arguments.rate, progress=printProgress)
+    report: dict = job.run()
+
+    printProgress(report)
+    for failure in report["failedVaults"]:
+        print(f"Vault '{failure['category']}' of user '{failure['user']}' was left unchanged: {failure['error']}")
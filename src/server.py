@@ -1,32 +1,67 @@
+import queue
 import socket
+import argparse
 import threading
 
-from commands.command import Command
+from clientSession import ClientSession
 from response.response import Response
+from protocol.framing import FramingError, FramedSocket
+from serverlog.connectionStats import ConnectionStats
+from storage.vaultStorage import VaultStorage
+from storage.storeLock import StoreLock
+from cryptographing.loginHasher import LoginHasher
 from serverlog.logger import Logger
-from commands.commandExecutor import CommandExecutor
+from serverlog.logWriter import LogWriter
+from asyncServer import AsyncServer
 
 class Server:
     """
-    A multi-threaded server that handles client connections and processes commands.
+    A multi-threaded server that serves clients from a fixed pool of worker threads.
+    Accepted connections wait in a bounded queue; once it is full new clients receive a "server busy" response.
 
     Attributes:
         server (socket.socket): The server socket.
-        connectionsCount (int): The number of active client connections.
+        connectionQueue (queue.Queue): Accepted connections waiting for a free worker.
+        stats (ConnectionStats): Active, queued and rejected connection counters.
     """
 
-    def __init__(self, host: str = "0.0.0.0", port: int = 5555) -> None:
+    DEFAULT_WORKERS: int = 16
+    DEFAULT_QUEUE_SIZE: int = 64
+    BUSY_MESSAGE: str = "Server is busy, please try again later."
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 5555, workers: int = DEFAULT_WORKERS, queueSize: int = DEFAULT_QUEUE_SIZE) -> None:
         """
         Initializes the server, binds it to the given host and port, and starts listening for connections.
 
         :param host: The IP address to bind the server to.
-        :param port: The port to listen on.
+        :param port: The port to listen on, 0 picks a free port.
+        :param workers: Number of worker threads serving clients concurrently.
+        :param queueSize: Number of accepted connections allowed to wait for a worker.
         """
         self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.server.bind((host, port))
-        self.server.listen(5)
-        self.connectionsCount = 0
-        print(f"Server listening on {host}:{port}...")
+        self.server.listen(queueSize)
+        self.port: int = self.server.getsockname()[1]
+        self.workersCount = workers
+        self.connectionQueue: queue.Queue = queue.Queue(maxsize=queueSize)
+        self.stats = ConnectionStats()
+        self.isRunning = False
+        print(f"Server listening on {host}:{self.port} with {workers} workers...")
+
+    @property
+    def connectionsCount(self) -> int:
+        """
+        Returns the number of connections currently being served.
+        """
+        return self.stats.active
+
+    def getStats(self) -> dict:
+        """
+        Returns the current connection counters.
+
+        :return: Dictionary with the active, queued, rejected and served counts.
+        """
+        return self.stats.snapshot()
 
     def handleClient(self, clientSocket: socket.socket, address: tuple[str, int]) -> None:
         """
@@ -35,48 +70,141 @@ class Server:
         :param clientSocket: The socket object for the connected client.
         :param address: The client's address (IP, port).
         """
-        executor = CommandExecutor("")
+        session = ClientSession(address)
+        connection = FramedSocket(clientSocket)
         
         try:
             while True:
-                message = clientSocket.recv(1024).decode()
-                if not message:
+                message = connection.receiveMessage()
+                if message is None:
                     break
 
-                command = Command.fromJson(message)
+                response = session.processMessage(message, lambda update: connection.sendMessage(update.toJson()))
+                connection.sendMessage(response.toJson())
+        except (ConnectionError, FramingError):
+            pass
+        finally:
+            session.close()
+            self.stats.connectionFinished()
+            print(f"Client {address} has just closed their connection, {self.stats}")
+            clientSocket.close()
+
+    def workerLoop(self) -> None:
+        """
+        Repeatedly takes the next queued connection and serves it until the server stops.
+        """
+        while True:
+            item = self.connectionQueue.get()
+            if item is None:
+                break
 
-                if command.commandType == "logout":
-                    Logger.log(executor.currentUser, "logout", Response(True, f"User {executor.currentUser} has logged out!"))
-                    executor = CommandExecutor("")
-                    continue
-                
-                response = executor.executeOperation(command)
+            client, address = item
+            self.stats.connectionStarted()
+            try:
+                self.handleClient(client, address)
+            except Exception as e:
+                print(f"Unexpected error while serving {address}: {str(e)}")
 
-                if response.status and command.commandType in ("login", "register"):
-                    executor = CommandExecutor(command.parameters[0])
+    def rejectClient(self, clientSocket: socket.socket, address: tuple[str, int]) -> None:
+        """
+        Tells a client that the server is at capacity and closes its connection.
 
-                if response.status or command.commandType != "register":
-                    Logger.log(executor.currentUser, command.commandType, response)
-                           
-                clientSocket.send(response.toJson().encode())
+        :param clientSocket: The socket object for the rejected client.
+        :param address: The client's address (IP, port).
+        """
+        try:
+            FramedSocket(clientSocket).sendMessage(Response(False, Server.BUSY_MESSAGE).toJson())
+        except OSError:
+            pass
         finally:
-            self.connectionsCount -= 1
-            print(f"Client {address} has just closed their connection, active connections: {self.connectionsCount}")
             clientSocket.close()
 
+        print(f"Rejected connection from {address}, {self.stats}")
+
     def start(self) -> None:
         """
-        Starts the server, accepting client connections and handling them in separate threads.
+        Starts the worker pool and accepts client connections until the server is stopped.
         """
-        while True:
-            client, address = self.server.accept()
-            
-            self.connectionsCount += 1
-            print(f"Accepted connection from {address}, active connections: {self.connectionsCount}")
+        self.isRunning = True
+
+        for index in range(self.workersCount):
+            threading.Thread(target=self.workerLoop, name=f"client-worker-{index}", daemon=True).start()
+
+        while self.isRunning:
+            try:
+                client, address = self.server.accept()
+            except OSError:
+                if not self.isRunning:
+                    break
+                raise
+
+            self.stats.connectionQueued()
+            try:
+                self.connectionQueue.put_nowait((client, address))
+            except queue.Full:
+                self.stats.connectionRejected(wasQueued=True)
+                self.rejectClient(client, address)
+                continue
 
-            clientHandler = threading.Thread(target=self.handleClient, args=(client, address))
-            clientHandler.start()
+            print(f"Accepted connection from {address}, {self.stats}")
+
+    def stop(self) -> None:
+        """
+        Stops accepting connections and lets idle workers exit.
+        """
+        self.isRunning = False
+        self.server.close()
+        LoginHasher.shutdown()
+        Logger.shutdown()
+
+        for _ in range(self.workersCount):
+            try:
+                self.connectionQueue.put_nowait(None)
+            except queue.Full:
+                break
 
 if __name__ == "__main__":
-    server = Server()
+    parser = argparse.ArgumentParser(description="Starts the PASSWORD-VAULT server.")
+    parser.add_argument("--mode", choices=["threaded", "async"], default="threaded",
+                        help="threaded: a pool of worker threads, async: a single event loop with a bounded executor.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5555)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker threads serving clients (threaded) or running vault and crypto work (async).")
+    parser.add_argument("--queue-size", type=int, default=Server.DEFAULT_QUEUE_SIZE,
+                        help="Accepted connections allowed to wait for a worker before clients get a busy response.")
+    parser.add_argument("--max-connections", type=int, default=AsyncServer.DEFAULT_MAX_CONNECTIONS,
+                        help="Concurrent clients served in async mode before clients get a busy response.")
+    parser.add_argument("--storage", choices=VaultStorage.ENGINES, default="file",
+                        help="file: log-structured vault files, sqlite: a single indexed SQLite database.")
+    parser.add_argument("--hash-cost", choices=list(LoginHasher.COST_PROFILES), default="default",
+                        help="Cost of the argon2 password hash checked at login.")
+    parser.add_argument("--hash-workers", type=int, default=LoginHasher.DEFAULT_WORKERS,
+                        help="Processes dedicated to password hashing.")
+    parser.add_argument("--log-queue-size", type=int, default=Logger.queueSize,
+                        help="Log records allowed to wait for the log writer before new ones are dropped.")
+    parser.add_argument("--log-flush-interval", type=float, default=Logger.flushInterval,
+                        help="Seconds between flushes of the buffered log file.")
+    parser.add_argument("--log-fsync", choices=LogWriter.FSYNC_POLICIES, default=Logger.fsyncPolicy,
+                        help="never: leave log data to the OS, interval: fsync on every flush, always: fsync every write.")
+    parser.add_argument("--log-rotate-bytes", type=int, default=Logger.rotateBytes,
+                        help="Size at which the active log segment is compressed into the archive.")
+    parser.add_argument("--log-rotate-seconds", type=float, default=Logger.rotateSeconds,
+                        help="Age at which the active log segment is compressed into the archive.")
+    arguments = parser.parse_args()
+
+    storeLock = StoreLock()
+    if not storeLock.acquire(exclusive=False):
+        raise SystemExit("The vault storage is locked by a key rotation; start the server once it has finished.")
+
+    VaultStorage.useEngine(VaultStorage.createEngine(arguments.storage))
+    LoginHasher.configure(arguments.hash_cost, workers=arguments.hash_workers)
+    Logger.configure(arguments.log_queue_size, arguments.log_flush_interval, arguments.log_fsync,
+                     arguments.log_rotate_bytes, arguments.log_rotate_seconds)
+
+    if arguments.mode == "async":
+        server = AsyncServer(arguments.host, arguments.port, arguments.workers or AsyncServer.DEFAULT_MAX_WORKERS, arguments.max_connections)
+    else:
+        server = Server(arguments.host, arguments.port, arguments.workers or Server.DEFAULT_WORKERS, arguments.queue_size)
+
     server.start()
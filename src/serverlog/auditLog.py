@@ -0,0 +1,245 @@
+import os
+import json
+import gzip
+import threading
+from typing import Dict, Iterator, List, Optional, TextIO
+
+class AuditLog:
+    """
+    The on-disk layout of the server's JSON-lines audit log, and queries over it.
+
+    Records are appended to an active segment. When the LogWriter rotates it, the segment is moved into the
+    archive directory under the next sequence number and compressed into a gzip file made of independent
+    members, one per block of about BLOCK_BYTES of records. Next to it a sidecar index records the time range
+    of every block and which users appear in it, so a query for one user in a time window decompresses only
+    the blocks that can hold matching records, one at a time, and never reads the whole history.
+
+    Layout:
+        audit.jsonl: the active segment, one JSON record per line.
+        archive/<seq>.jsonl: a rotated segment waiting to be compressed.
+        archive/<seq>.jsonl.gz: a compressed segment.
+        archive/<seq>.idx: its index: {"first", "last", "blocks": [[offset, length, first, last], ...],
+                           "users": {user: [block numbers]}}.
+
+    Attributes:
+        directory (str): The log directory.
+        lock (threading.Lock): Held while a segment is archived and while a query lists the segments,
+                               so a query never misses a segment that is being rotated.
+    """
+
+    ACTIVE_NAME: str = "audit.jsonl"
+    ARCHIVE_DIR: str = "archive"
+    PLAIN_SUFFIX: str = ".jsonl"
+    COMPRESSED_SUFFIX: str = ".jsonl.gz"
+    INDEX_SUFFIX: str = ".idx"
+    BLOCK_BYTES: int = 64 * 1024
+
+    def __init__(self, directory: str) -> None:
+        """
+        Initializes the log rooted at a directory.
+
+        :param directory: The log directory.
+        """
+        self.directory = directory
+        self.lock = threading.Lock()
+
+    @property
+    def activePath(self) -> str:
+        """
+        Returns the path of the active segment.
+        """
+        return os.path.join(self.directory, AuditLog.ACTIVE_NAME)
+
+    def archivePath(self, segmentId: int, suffix: str) -> str:
+        """
+        Returns the path of an archived segment file.
+
+        :param segmentId: Sequence number of the segment.
+        :param suffix: One of PLAIN_SUFFIX, COMPRESSED_SUFFIX and INDEX_SUFFIX.
+        :return: The path.
+        """
+        return os.path.join(self.directory, AuditLog.ARCHIVE_DIR, f"{segmentId:08d}{suffix}")
+
+    def listSegmentIds(self) -> List[int]:
+        """
+        Lists the sequence numbers of the archived segments, oldest first.
+        """
+        archive: str = os.path.join(self.directory, AuditLog.ARCHIVE_DIR)
+        if not os.path.isdir(archive):
+            return []
+        return sorted({int(file[:8]) for file in os.listdir(archive) if file[:8].isdigit() and not file.endswith(".tmp")})
+
+    @staticmethod
+    def encodeRecord(record: dict) -> str:
+        """
+        Serializes a record as one line.
+
+        :param record: The record, holding at least "ts" (seconds since the epoch) and "user".
+        :return: The JSON line, including its line ending.
+        """
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    def recover(self) -> None:
+        """
+        Archives an active segment left by a previous run and compresses every segment a crash left uncompressed.
+        Called before the writer opens the active segment.
+        """
+        if os.path.exists(self.activePath) and os.path.getsize(self.activePath) > 0:
+            self.archive(self.activePath)
+
+        for segmentId in self.listSegmentIds():
+            if os.path.exists(self.archivePath(segmentId, AuditLog.PLAIN_SUFFIX)):
+                self.compress(segmentId)
+
+    def archive(self, path: str) -> None:
+        """
+        Moves a closed active segment into the archive and compresses it. Called by the LogWriter on rotation.
+
+        :param path: The active segment.
+        """
+        with self.lock:
+            os.makedirs(os.path.join(self.directory, AuditLog.ARCHIVE_DIR), exist_ok=True)
+            segmentIds: List[int] = self.listSegmentIds()
+            segmentId: int = segmentIds[-1] + 1 if segmentIds else 1
+            os.replace(path, self.archivePath(segmentId, AuditLog.PLAIN_SUFFIX))
+
+        self.compress(segmentId)
+
+    def compress(self, segmentId: int) -> None:
+        """
+        Compresses an archived segment block by block and writes its index. The plain segment is only removed
+        once both files are complete, so a crash at any point leaves a readable segment behind.
+
+        :param segmentId: Sequence number of the segment.
+        """
+        plainPath: str = self.archivePath(segmentId, AuditLog.PLAIN_SUFFIX)
+        compressedPath: str = self.archivePath(segmentId, AuditLog.COMPRESSED_SUFFIX)
+        indexPath: str = self.archivePath(segmentId, AuditLog.INDEX_SUFFIX)
+        index: dict = {"first": None, "last": None, "blocks": [], "users": {}}
+
+        with open(plainPath, "rb") as source, open(compressedPath + ".tmp", "wb") as target:
+            lines: List[bytes] = []
+            users: set = set()
+            size: int = 0
+            first: Optional[float] = None
+            last: Optional[float] = None
+
+            def writeBlock() -> None:
+                if not lines:
+                    return
+                data: bytes = gzip.compress(b"".join(lines), mtime=0)
+                blockNumber: int = len(index["blocks"])
+                index["blocks"].append([target.tell(), len(data), first, last])
+                target.write(data)
+                for user in users:
+                    index["users"].setdefault(user, []).append(blockNumber)
+
+            for line in source:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record: dict = json.loads(line)
+                    timestamp: float = float(record["ts"])
+                    user: str = str(record["user"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+                lines.append(line)
+                users.add(user)
+                size += len(line)
+                first = timestamp if first is None else min(first, timestamp)
+                last = timestamp if last is None else max(last, timestamp)
+                index["first"] = timestamp if index["first"] is None else min(index["first"], timestamp)
+                index["last"] = timestamp if index["last"] is None else max(index["last"], timestamp)
+
+                if size >= AuditLog.BLOCK_BYTES:
+                    writeBlock()
+                    lines, users, size, first, last = [], set(), 0, None, None
+
+            writeBlock()
+            target.flush()
+            os.fsync(target.fileno())
+
+        with open(indexPath + ".tmp", "w", encoding="utf-8") as indexFile:
+            json.dump(index, indexFile, separators=(",", ":"))
+
+        os.replace(compressedPath + ".tmp", compressedPath)
+        os.replace(indexPath + ".tmp", indexPath)
+        os.remove(plainPath)
+
+    def query(self, user: str, start: float, end: float) -> Iterator[dict]:
+        """
+        Streams the records of a user logged in a time window, in the order they were written.
+
+        :param user: The user whose records are wanted.
+        :param start: Start of the window, in seconds since the epoch.
+        :param end: End of the window, in seconds since the epoch, inclusive.
+        :return: Iterator over the matching records.
+        """
+        with self.lock:
+            segmentIds: List[int] = self.listSegmentIds()
+            try:
+                activeFile: Optional[TextIO] = open(self.activePath, "r", encoding="utf-8")
+            except FileNotFoundError:
+                activeFile = None
+
+        try:
+            for segmentId in segmentIds:
+                yield from self.querySegment(segmentId, user, start, end)
+            if activeFile is not None:
+                yield from AuditLog.scanLines(activeFile, user, start, end)
+        finally:
+            if activeFile is not None:
+                activeFile.close()
+
+    def querySegment(self, segmentId: int, user: str, start: float, end: float) -> Iterator[dict]:
+        """
+        Streams the matching records of an archived segment, through its index once it is compressed.
+        """
+        index: Optional[dict] = self.readIndex(segmentId)
+        if index is None:
+            try:
+                with open(self.archivePath(segmentId, AuditLog.PLAIN_SUFFIX), "r", encoding="utf-8") as plainFile:
+                    yield from AuditLog.scanLines(plainFile, user, start, end)
+                return
+            except FileNotFoundError:
+                index = self.readIndex(segmentId)
+                if index is None:
+                    return
+
+        if index["first"] is None or index["last"] < start or index["first"] > end:
+            return
+
+        with open(self.archivePath(segmentId, AuditLog.COMPRESSED_SUFFIX), "rb") as compressedFile:
+            for blockNumber in index["users"].get(user, []):
+                offset, length, first, last = index["blocks"][blockNumber]
+                if last < start or first > end:
+                    continue
+                compressedFile.seek(offset)
+                block: str = gzip.decompress(compressedFile.read(length)).decode("utf-8")
+                yield from AuditLog.scanLines(block.splitlines(keepends=True), user, start, end)
+
+    def readIndex(self, segmentId: int) -> Optional[dict]:
+        """
+        Reads the index of an archived segment, or None while the segment is not compressed yet.
+        """
+        try:
+            with open(self.archivePath(segmentId, AuditLog.INDEX_SUFFIX), "r", encoding="utf-8") as indexFile:
+                return json.load(indexFile)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def scanLines(lines, user: str, start: float, end: float) -> Iterator[dict]:
+        """
+        Filters JSON lines on user and time window, stopping at a line the writer has not finished.
+        """
+        for line in lines:
+            if not line.endswith("\n"):
+                break
+            try:
+                record: dict = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("user") == user and start <= record.get("ts", -1) <= end:
+                yield record
@@ -0,0 +1,75 @@
+import threading
+
+class ConnectionStats:
+    """
+    Thread-safe counters describing the connections handled by a server.
+
+    Attributes:
+        active (int): Connections currently being served by a worker.
+        queued (int): Accepted connections waiting for a free worker.
+        rejected (int): Connections turned away because the server was full.
+        served (int): Connections that have been fully served and closed.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes all counters to zero.
+        """
+        self.lock = threading.Lock()
+        self.active: int = 0
+        self.queued: int = 0
+        self.rejected: int = 0
+        self.served: int = 0
+
+    def connectionQueued(self) -> None:
+        """
+        Records an accepted connection entering the waiting queue.
+        """
+        with self.lock:
+            self.queued += 1
+
+    def connectionRejected(self, wasQueued: bool = False) -> None:
+        """
+        Records a connection refused because the server is at capacity.
+
+        :param wasQueued: Whether the connection had already been counted as queued.
+        """
+        with self.lock:
+            if wasQueued:
+                self.queued -= 1
+            self.rejected += 1
+
+    def connectionStarted(self, wasQueued: bool = True) -> None:
+        """
+        Records a connection being picked up by a worker.
+
+        :param wasQueued: Whether the connection was waiting in the queue before.
+        """
+        with self.lock:
+            if wasQueued:
+                self.queued -= 1
+            self.active += 1
+
+    def connectionFinished(self) -> None:
+        """
+        Records a served connection being closed.
+        """
+        with self.lock:
+            self.active -= 1
+            self.served += 1
+
+    def snapshot(self) -> dict:
+        """
+        Returns a consistent copy of all counters.
+
+        :return: Dictionary with the active, queued, rejected and served counts.
+        """
+        with self.lock:
+            return {"active": self.active, "queued": self.queued, "rejected": self.rejected, "served": self.served}
+
+    def __str__(self) -> str:
+        """
+        Returns a short human-readable summary of the counters.
+        """
+        stats = self.snapshot()
+        return f"active: {stats['active']}, queued: {stats['queued']}, rejected: {stats['rejected']}"
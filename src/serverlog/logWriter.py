@@ -0,0 +1,218 @@
+import os
+import time
+import queue
+import threading
+from typing import BinaryIO, Callable, Optional
+
+class LogWriter:
+    """
+    Appends log records to a file from a single background thread.
+    Request threads only put a finished record on a bounded queue and never touch the file; when the queue is
+    full the record is dropped and counted rather than stalling the request. The writer takes every record
+    waiting in the queue at once and writes them with one buffered write, flushes the buffer to the OS every
+    flush interval and fsyncs it according to the fsync policy. Once the file reaches a size or an age limit it
+    is closed and handed to a rotation callback, which moves it away, and a new file is started.
+
+    Fsync policies:
+        never: leave the data to the OS after every flush.
+        interval: fsync after every periodic flush, bounding the loss on a machine crash to one interval.
+        always: flush and fsync after every batch written.
+
+    Attributes:
+        path (str): The log file.
+        records (queue.Queue): Records waiting to be written.
+        written (int): Records written to the file.
+        dropped (int): Records dropped because the queue was full or the file could not be written.
+    """
+
+    FSYNC_POLICIES: tuple = ("never", "interval", "always")
+    DEFAULT_QUEUE_SIZE: int = 10000
+    DEFAULT_FLUSH_INTERVAL: float = 1.0
+    BUFFER_SIZE: int = 64 * 1024
+    MAX_BATCH: int = 1000
+
+    def __init__(self, path: str, queueSize: int = DEFAULT_QUEUE_SIZE, flushInterval: float = DEFAULT_FLUSH_INTERVAL,
+                 fsyncPolicy: str = "never", rotateBytes: Optional[int] = None, rotateSeconds: Optional[float] = None,
+                 onRotate: Optional[Callable[[str], None]] = None) -> None:
+        """
+        Initializes a writer; its thread is started by start().
+
+        :param path: The log file, created with its directory when missing.
+        :param queueSize: Records allowed to wait for the writer before new ones are dropped.
+        :param flushInterval: Seconds between flushes of the write buffer.
+        :param fsyncPolicy: One of FSYNC_POLICIES.
+        :param rotateBytes: Size at which the file is rotated, None for no limit.
+        :param rotateSeconds: Age at which a non-empty file is rotated, None for no limit.
+        :param onRotate: Called with the path of the closed file; it must move the file away.
+        :raises ValueError: If the fsync policy is unknown.
+        """
+        if fsyncPolicy not in LogWriter.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsyncPolicy}', expected one of: {', '.join(LogWriter.FSYNC_POLICIES)}")
+
+        self.path = path
+        self.records: queue.Queue = queue.Queue(maxsize=queueSize)
+        self.flushInterval = flushInterval
+        self.fsyncPolicy = fsyncPolicy
+        self.rotateBytes = rotateBytes
+        self.rotateSeconds = rotateSeconds
+        self.onRotate = onRotate
+        self.openedAt: float = 0.0
+        self.size: int = 0
+        self.lock = threading.Lock()
+        self.written: int = 0
+        self.dropped: int = 0
+        self.thread: Optional[threading.Thread] = None
+        self.logFile: Optional[BinaryIO] = None
+
+    def start(self) -> None:
+        """
+        Opens the log file and starts the writer thread.
+        """
+        self.openLog()
+        self.thread = threading.Thread(target=self.run, name="log-writer", daemon=True)
+        self.thread.start()
+
+    def openLog(self) -> None:
+        """
+        Opens the log file for appending, creating it with its directory when missing. The file is binary, so the
+        size counted for rotation is in bytes however many UTF-8 bytes a character takes.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.logFile = open(self.path, "ab", buffering=LogWriter.BUFFER_SIZE)
+        self.openedAt = time.monotonic()
+        self.size = self.logFile.tell()
+
+    def shouldRotate(self) -> bool:
+        """
+        Checks whether the log file reached its size or age limit.
+        """
+        if self.onRotate is None or self.size == 0:
+            return False
+        return (self.rotateBytes is not None and self.size >= self.rotateBytes) or \
+               (self.rotateSeconds is not None and time.monotonic() - self.openedAt >= self.rotateSeconds)
+
+    def rotate(self) -> None:
+        """
+        Closes the log file, hands it to the rotation callback and starts a new one.
+        """
+        self.logFile.flush()
+        if self.fsyncPolicy != "never":
+            os.fsync(self.logFile.fileno())
+        self.logFile.close()
+        try:
+            self.onRotate(self.path)
+        finally:
+            self.openLog()
+
+    def submit(self, record: str) -> bool:
+        """
+        Queues a record without ever blocking.
+
+        :param record: The formatted record, including its line ending.
+        :return: False if the queue was full and the record was dropped.
+        """
+        try:
+            self.records.put_nowait(record)
+            return True
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every record queued before the call is written and flushed to the OS.
+
+        :param timeout: Seconds to wait at most, None to wait as long as it takes.
+        :return: False if the records were not flushed in time.
+        """
+        if self.thread is None or not self.thread.is_alive():
+            return False
+
+        done = threading.Event()
+        try:
+            self.records.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Writes every queued record, fsyncs the file unless the policy is "never", and stops the thread.
+
+        :param timeout: Seconds to wait for the queue to drain, None to wait as long as it takes.
+        """
+        if self.thread is not None and self.thread.is_alive():
+            try:
+                self.records.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self.thread.join(timeout)
+
+    def run(self) -> None:
+        """
+        The writer thread: batches queued records into buffered writes until close() is called.
+        """
+        nextFlush: float = time.monotonic() + self.flushInterval
+        running: bool = True
+
+        while running:
+            try:
+                item = self.records.get(timeout=max(0.0, nextFlush - time.monotonic()))
+            except queue.Empty:
+                item = ""
+
+            batch: list = []
+            waiting: list = []
+            while True:
+                if item is None:
+                    running = False
+                    break
+                if isinstance(item, threading.Event):
+                    waiting.append(item)
+                elif item:
+                    batch.append(item)
+                if len(batch) >= LogWriter.MAX_BATCH:
+                    break
+                try:
+                    item = self.records.get_nowait()
+                except queue.Empty:
+                    break
+
+            periodic: bool = time.monotonic() >= nextFlush
+            try:
+                if batch:
+                    self.size += self.logFile.write("".join(batch).encode("utf-8"))
+                if not running or waiting or periodic or self.fsyncPolicy == "always":
+                    self.logFile.flush()
+                    if self.fsyncPolicy == "always" or (self.fsyncPolicy == "interval" and (periodic or not running)):
+                        os.fsync(self.logFile.fileno())
+                with self.lock:
+                    self.written += len(batch)
+                batch = []
+                if self.shouldRotate():
+                    self.rotate()
+            except (OSError, ValueError):
+                with self.lock:
+                    self.dropped += len(batch)
+                if self.logFile.closed:
+                    try:
+                        self.openLog()
+                    except OSError:
+                        pass
+
+            if periodic:
+                nextFlush = time.monotonic() + self.flushInterval
+            for event in waiting:
+                event.set()
+
+        self.logFile.close()
+
+    def statistics(self) -> dict:
+        """
+        Returns the queue depth and the written and dropped record counters.
+
+        :return: Dictionary with the queued, written and dropped counts.
+        """
+        with self.lock:
+            return {"queued": self.records.qsize(), "written": self.written, "dropped": self.dropped}
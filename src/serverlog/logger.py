@@ -1,47 +1,138 @@
 import os
-import datetime
+import time
+import atexit
+import threading
+from typing import Iterator, Optional
 from response.response import Response  # Assuming Response is used for status & description
+from serverlog.auditLog import AuditLog
+from serverlog.logWriter import LogWriter
 
 class Logger:
     """
     A simple logging utility to record user actions, executed commands, and their responses.
-    
+    Records are JSON lines of an AuditLog, handed to a LogWriter, so the client-handling threads only format and
+    enqueue them while a single background thread writes, rotates and archives the log.
+
     Attributes:
         BASE_DIR (str): The base directory of the script.
-        LOG_FILE (str): The file path where logs are stored.
+        LOG_DIR (str): The directory where logs are stored.
     """
-    
+
     BASE_DIR: str = os.path.dirname(os.path.abspath(__file__))
-    LOG_FILE: str = os.path.join(BASE_DIR, "ApplicationLogs", "logger.txt")
+    LOG_DIR: str = os.path.join(BASE_DIR, "ApplicationLogs")
+
+    queueSize: int = LogWriter.DEFAULT_QUEUE_SIZE
+    flushInterval: float = LogWriter.DEFAULT_FLUSH_INTERVAL
+    fsyncPolicy: str = "never"
+    rotateBytes: int = 16 * 1024 * 1024
+    rotateSeconds: float = 24 * 60 * 60
+    writer: Optional[LogWriter] = None
+    auditLog: Optional[AuditLog] = None
+    writerLock = threading.Lock()
+
+    @staticmethod
+    def configure(queueSize: Optional[int] = None, flushInterval: Optional[float] = None, fsyncPolicy: Optional[str] = None,
+                  rotateBytes: Optional[int] = None, rotateSeconds: Optional[float] = None) -> None:
+        """
+        Sets how records are buffered, written and rotated; a running writer is drained and replaced.
+
+        :param queueSize: Records allowed to wait for the writer before new ones are dropped.
+        :param flushInterval: Seconds between flushes of the write buffer.
+        :param fsyncPolicy: One of LogWriter.FSYNC_POLICIES.
+        :param rotateBytes: Size at which the active log segment is archived.
+        :param rotateSeconds: Age at which the active log segment is archived.
+        """
+        if fsyncPolicy is not None and fsyncPolicy not in LogWriter.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsyncPolicy}', expected one of: {', '.join(LogWriter.FSYNC_POLICIES)}")
+
+        Logger.shutdown()
+        Logger.queueSize = queueSize if queueSize is not None else Logger.queueSize
+        Logger.flushInterval = flushInterval if flushInterval is not None else Logger.flushInterval
+        Logger.fsyncPolicy = fsyncPolicy if fsyncPolicy is not None else Logger.fsyncPolicy
+        Logger.rotateBytes = rotateBytes if rotateBytes is not None else Logger.rotateBytes
+        Logger.rotateSeconds = rotateSeconds if rotateSeconds is not None else Logger.rotateSeconds
+
+    @staticmethod
+    def getWriter() -> LogWriter:
+        """
+        Returns the log writer, starting its thread on first use after archiving what a previous run left behind.
+        """
+        with Logger.writerLock:
+            if Logger.writer is None:
+                if Logger.auditLog is None or Logger.auditLog.directory != Logger.LOG_DIR:
+                    Logger.auditLog = AuditLog(Logger.LOG_DIR)
+                Logger.auditLog.recover()
+                Logger.writer = LogWriter(Logger.auditLog.activePath, Logger.queueSize, Logger.flushInterval, Logger.fsyncPolicy,
+                                          Logger.rotateBytes, Logger.rotateSeconds, Logger.auditLog.archive)
+                Logger.writer.start()
+            return Logger.writer
 
     @staticmethod
     def log(user: str, commandType: str, response: Response) -> None:
         """
         Logs user activity, command type, and response status in the log file.
-        
+        Never blocks: the record is dropped and counted if the writer is too far behind.
+
         :param user: The username executing the command.
         :param commandType: The type of command executed.
         :param response: A Response object containing the status and description.
         """
-        timestamp: str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        logEntry: str = (
-            f"<LOG>\n   [{timestamp}] User: {user} | Command: {commandType} | "
-            f"Status: {'Success' if response.status else 'Failed'} | Message: {response.description}\n<\\LOG>\n"
-        )
+        Logger.getWriter().submit(AuditLog.encodeRecord({
+            "ts": round(time.time(), 3),
+            "user": user,
+            "command": commandType,
+            "status": response.status,
+            "message": response.description
+        }))
+
+    @staticmethod
+    def flush(timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every record logged so far is in the log file.
+
+        :param timeout: Seconds to wait at most, None to wait as long as it takes.
+        :return: False if the records were not written in time.
+        """
+        with Logger.writerLock:
+            writer = Logger.writer
+        return writer is None or writer.flush(timeout)
 
-        os.makedirs(os.path.dirname(Logger.LOG_FILE), exist_ok=True)  # Ensure log directory exists
-        with open(Logger.LOG_FILE, "a") as logFile:
-            logFile.write(logEntry)
+    @staticmethod
+    def statistics() -> dict:
+        """
+        Returns the queue depth and the written and dropped record counters of the running writer.
+
+        :return: Dictionary with the queued, written and dropped counts.
+        """
+        with Logger.writerLock:
+            writer = Logger.writer
+        return writer.statistics() if writer is not None else {"queued": 0, "written": 0, "dropped": 0}
 
     @staticmethod
-    def readLogs() -> str:
+    def shutdown(timeout: Optional[float] = None) -> None:
         """
-        Reads and returns the content of the log file.
+        Drains the queued records into the log file and stops the writer; a new one is started on the next record.
 
-        :return: The contents of the log file as a string, or a message if the log file does not exist.
+        :param timeout: Seconds to wait for the queue to drain, None to wait as long as it takes.
         """
-        if not os.path.exists(Logger.LOG_FILE):
-            return "Log file is empty."
-        
-        with open(Logger.LOG_FILE, "r") as logFile:
-            return logFile.read()
+        with Logger.writerLock:
+            writer, Logger.writer = Logger.writer, None
+
+        if writer is not None:
+            writer.close(timeout)
+
+    @staticmethod
+    def query(user: str, start: float, end: float) -> Iterator[dict]:
+        """
+        Streams the records of a user logged in a time window, including those still waiting in the queue.
+
+        :param user: The user whose records are wanted.
+        :param start: Start of the window, in seconds since the epoch.
+        :param end: End of the window, in seconds since the epoch, inclusive.
+        :return: Iterator over the matching records, in the order they were written.
+        """
+        writer = Logger.getWriter()
+        writer.flush()
+        return Logger.auditLog.query(user, start, end)
+
+atexit.register(Logger.shutdown)
@@ -0,0 +1,175 @@
+import os
+import json
+import hashlib
+import threading
+from typing import Optional
+
+from storage.storagePaths import StoragePaths
+
+class AccountStore:
+    """
+    Keyed store of user accounts, one small JSON file per account in a hash-sharded directory tree:
+    {ACCOUNTS_DIR}/shards/{first two hex digits}/{sha256 of the username}.json
+
+    Lookups and inserts touch a single file, so their cost does not grow with the number of users,
+    and two concurrent registrations can never overwrite each other.
+    The legacy accounts.json file is migrated into the store once, on first use.
+    """
+
+    ACCOUNTS_DIR: str = os.path.join(StoragePaths.APPLICATION_STORAGE_DIR, "accounts")
+    LEGACY_FILE_NAME: str = "accounts.json"
+    MIGRATED_SUFFIX: str = ".migrated"
+
+    migrationLock = threading.Lock()
+    migratedDirectories: set = set()
+
+    @staticmethod
+    def accountPath(username: str) -> str:
+        """
+        Returns the path of the file holding an account.
+
+        :param username: The account's username.
+        :return: Path of the account file.
+        """
+        digest: str = hashlib.sha256(username.encode()).hexdigest()
+        return os.path.join(AccountStore.ACCOUNTS_DIR, "shards", digest[:2], f"{digest}.json")
+
+    @staticmethod
+    def legacyFile() -> str:
+        """
+        Returns the path of the legacy accounts.json file.
+        """
+        return os.path.join(AccountStore.ACCOUNTS_DIR, AccountStore.LEGACY_FILE_NAME)
+
+    @staticmethod
+    def hasAccounts() -> bool:
+        """
+        Checks whether any account has ever been stored.
+        """
+        AccountStore.ensureMigrated()
+        return os.path.isdir(os.path.join(AccountStore.ACCOUNTS_DIR, "shards"))
+
+    @staticmethod
+    def accountExists(username: str) -> bool:
+        """
+        Checks whether a username is already registered.
+        """
+        AccountStore.ensureMigrated()
+        return os.path.exists(AccountStore.accountPath(username))
+
+    @staticmethod
+    def getAccount(username: str) -> Optional[dict]:
+        """
+        Returns the stored record of an account.
+
+        :param username: The account's username.
+        :return: The account record, or None if the user is not registered.
+        :raises json.JSONDecodeError: If the account file is corrupted.
+        """
+        AccountStore.ensureMigrated()
+
+        try:
+            with open(AccountStore.accountPath(username), "r") as file:
+                account: dict = json.load(file)
+        except FileNotFoundError:
+            return None
+
+        account.pop("username", None)
+        return account
+
+    @staticmethod
+    def addAccount(username: str, account: dict) -> bool:
+        """
+        Stores a new account, failing if the username is already taken.
+        The file is fully written under a temporary name and then hard-linked into place,
+        which either atomically creates it or fails because it already exists.
+
+        :param username: The account's username.
+        :param account: The account record, e.g. {"password": ...}.
+        :return: True if the account was created, False if the username already exists.
+        """
+        AccountStore.ensureMigrated()
+        return AccountStore.insertAccount(username, account)
+
+    @staticmethod
+    def updateAccount(username: str, account: dict) -> None:
+        """
+        Atomically replaces the record of an existing account.
+
+        :param username: The account's username.
+        :param account: The new account record.
+        """
+        path: str = AccountStore.accountPath(username)
+        temporaryPath: str = f"{path}.{threading.get_ident()}.tmp"
+
+        AccountStore.writeRecord(temporaryPath, username, account)
+        os.replace(temporaryPath, path)
+
+    @staticmethod
+    def insertAccount(username: str, account: dict) -> bool:
+        """
+        Creates an account file if it does not exist yet, without triggering a migration.
+        """
+        path: str = AccountStore.accountPath(username)
+        if os.path.exists(path):
+            return False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporaryPath: str = f"{path}.{threading.get_ident()}.tmp"
+
+        AccountStore.writeRecord(temporaryPath, username, account)
+        try:
+            os.link(temporaryPath, path)
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(temporaryPath)
+
+    @staticmethod
+    def writeRecord(path: str, username: str, account: dict) -> None:
+        """
+        Writes and flushes an account record to the given path.
+        """
+        with open(path, "w") as file:
+            json.dump({"username": username, **account}, file, separators=(",", ":"))
+            file.flush()
+            os.fsync(file.fileno())
+
+    @staticmethod
+    def ensureMigrated() -> None:
+        """
+        Migrates the legacy accounts.json file of the current accounts directory, once per process.
+        """
+        if AccountStore.ACCOUNTS_DIR in AccountStore.migratedDirectories:
+            return
+
+        with AccountStore.migrationLock:
+            if AccountStore.ACCOUNTS_DIR in AccountStore.migratedDirectories:
+                return
+            AccountStore.migrateLegacyAccounts()
+            AccountStore.migratedDirectories.add(AccountStore.ACCOUNTS_DIR)
+
+    @staticmethod
+    def migrateLegacyAccounts() -> int:
+        """
+        Moves every account of the legacy accounts.json file into the store and renames the old file,
+        so the migration runs exactly once. Accounts already present in the store are kept.
+
+        :return: Number of accounts migrated.
+        :raises json.JSONDecodeError: If the legacy file is corrupted; it is left in place and nothing is migrated.
+        """
+        legacyFile: str = AccountStore.legacyFile()
+        if not os.path.exists(legacyFile):
+            return 0
+
+        with open(legacyFile, "r") as file:
+            accounts: dict = json.load(file)
+
+        migrated: int = 0
+        for username, account in accounts.items():
+            if AccountStore.insertAccount(username, account):
+                migrated += 1
+
+        os.replace(legacyFile, legacyFile + AccountStore.MIGRATED_SUFFIX)
+        return migrated
@@ -0,0 +1,391 @@
+import os
+import sys
+import mmap
+import json
+import heapq
+import struct
+import hashlib
+import tempfile
+from array import array
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.bloomFilter import BloomFilter
+
+class BreachCorpus:
+    """
+    Read-only, memory-mapped corpus of breached password hashes, for checking passwords without any network.
+
+    Layout of the corpus directory (written by BreachCorpusImporter):
+        hashes.bin: sorted 36-byte records, SHA-256 digest followed by a big-endian uint32 exposure count.
+        prefix.idx: 65537 little-endian uint64 record numbers; bucket p spans records [idx[p], idx[p + 1])
+                    whose digests start with the two bytes p, so a lookup only binary-searches its own bucket.
+        bloom.bin:  optional Bloom filter answering most misses without touching hashes.bin.
+        meta.json:  record count and format version, written last.
+    Pages of hashes.bin are loaded by the OS on demand, so opening even a huge corpus is instant.
+
+    Attributes:
+        directory (str): The corpus directory.
+        count (int): Number of distinct hashes.
+        bloom (BloomFilter): The Bloom filter, or None.
+    """
+
+    FORMAT_VERSION: int = 1
+    RECORD = struct.Struct(">32sI")
+    DIGEST_SIZE: int = 32
+    PREFIX_BYTES: int = 2
+    BUCKETS: int = 1 << (8 * PREFIX_BYTES)
+    MAX_COUNT: int = 0xFFFFFFFF
+    INDEX_BYTE_ORDER: str = "little"
+
+    HASHES_FILE: str = "hashes.bin"
+    INDEX_FILE: str = "prefix.idx"
+    BLOOM_FILE: str = "bloom.bin"
+    META_FILE: str = "meta.json"
+
+    def __init__(self, directory: str) -> None:
+        """
+        Opens a corpus.
+
+        :param directory: The corpus directory.
+        :raises FileNotFoundError: If the directory holds no complete corpus.
+        :raises ValueError: If the corpus was written in another format.
+        """
+        self.directory = directory
+
+        with open(os.path.join(directory, BreachCorpus.META_FILE), "r") as file:
+            meta: dict = json.load(file)
+            self.metaStat: Tuple[int, int] = BreachCorpus.statKey(os.fstat(file.fileno()))
+        if meta.get("version") != BreachCorpus.FORMAT_VERSION:
+            raise ValueError(f"Unsupported breach corpus format: {meta.get('version')}")
+        self.count: int = meta["count"]
+
+        self.index = array("Q")
+        with open(os.path.join(directory, BreachCorpus.INDEX_FILE), "rb") as file:
+            self.index.frombytes(file.read())
+        if self.index.itemsize != 8 or len(self.index) != BreachCorpus.BUCKETS + 1:
+            raise ValueError("Corrupted breach corpus prefix index.")
+        if BreachCorpus.INDEX_BYTE_ORDER != sys.byteorder:
+            self.index.byteswap()
+
+        self.hashes: Optional[mmap.mmap] = BreachCorpus.mapFile(os.path.join(directory, BreachCorpus.HASHES_FILE))
+        bloomMap: Optional[mmap.mmap] = BreachCorpus.mapFile(os.path.join(directory, BreachCorpus.BLOOM_FILE))
+        self.bloomMap = bloomMap
+        self.bloom: Optional[BloomFilter] = BloomFilter.fromBuffer(bloomMap) if bloomMap is not None else None
+
+    @staticmethod
+    def mapFile(path: str) -> Optional[mmap.mmap]:
+        """
+        Maps a file read-only into memory.
+
+        :param path: The file path.
+        :return: The memory map, or None if the file is missing or empty.
+        """
+        try:
+            with open(path, "rb") as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    return None
+                return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def digestOf(password: str) -> bytes:
+        """
+        Returns the SHA-256 digest a password is stored under.
+        """
+        return hashlib.sha256(password.encode()).digest()
+
+    def bucketRange(self, digest: bytes) -> Tuple[int, int]:
+        """
+        Returns the record range of the bucket a digest falls into.
+        """
+        bucket: int = int.from_bytes(digest[:BreachCorpus.PREFIX_BYTES], "big")
+        return self.index[bucket], self.index[bucket + 1]
+
+    def lookup(self, digest: bytes) -> int:
+        """
+        Looks a SHA-256 digest up.
+
+        :param digest: The 32-byte digest.
+        :return: How often the hash was exposed, 0 if it is not in the corpus.
+        """
+        if self.hashes is None or (self.bloom is not None and digest not in self.bloom):
+            return 0
+
+        low, high = self.bucketRange(digest)
+        hashes: mmap.mmap = self.hashes
+        recordSize: int = BreachCorpus.RECORD.size
+
+        while low < high:
+            middle: int = (low + high) // 2
+            offset: int = middle * recordSize
+            stored: bytes = hashes[offset:offset + BreachCorpus.DIGEST_SIZE]
+            if stored < digest:
+                low = middle + 1
+            elif stored > digest:
+                high = middle
+            else:
+                return BreachCorpus.RECORD.unpack_from(hashes, offset)[1]
+        return 0
+
+    def lookupPassword(self, password: str) -> int:
+        """
+        Looks a password up.
+
+        :param password: The plaintext password.
+        :return: How often the password was exposed, 0 if it is not in the corpus.
+        """
+        return self.lookup(BreachCorpus.digestOf(password))
+
+    def candidates(self, prefix: bytes) -> Iterator[Tuple[bytes, int]]:
+        """
+        Yields every (digest, exposure count) whose digest starts with a prefix, like a k-anonymity range query.
+
+        :param prefix: At least PREFIX_BYTES leading bytes of a digest.
+        """
+        if self.hashes is None:
+            return
+
+        low, high = self.bucketRange(prefix)
+        for record in range(low, high):
+            digest, count = BreachCorpus.RECORD.unpack_from(self.hashes, record * BreachCorpus.RECORD.size)
+            if digest.startswith(prefix):
+                yield digest, count
+
+    @staticmethod
+    def statKey(stat: os.stat_result) -> Tuple[int, int]:
+        """
+        Identifies one version of meta.json: an import replaces the file, so its inode or mtime changes.
+        """
+        return stat.st_ino, stat.st_mtime_ns
+
+    def isCurrent(self) -> bool:
+        """
+        Tells whether the corpus is still the one published in its directory, i.e. no import replaced it since it
+        was opened. While an import is publishing its files, meta.json is missing and the open corpus stays current.
+        """
+        try:
+            return BreachCorpus.statKey(os.stat(os.path.join(self.directory, BreachCorpus.META_FILE))) == self.metaStat
+        except FileNotFoundError:
+            return True
+
+    def close(self) -> None:
+        """
+        Unmaps the corpus files.
+        """
+        if self.bloom is not None:
+            self.bloom.release()
+        for mapped in (self.hashes, self.bloomMap):
+            if mapped is not None:
+                mapped.close()
+        self.hashes = self.bloomMap = self.bloom = None
+
+class BreachCorpusImporter:
+    """
+    Builds a BreachCorpus from hash dumps of any size with a bounded amount of memory (external sort):
+    the dumps are cut into sorted runs of at most runRecords records written to temporary files, the runs
+    are merged into hashes.bin while the prefix index is counted, and the Bloom filter is filled from the
+    merged stream in a memory-mapped file, so its size (about 1.8 bytes per hash at a 0.001 false positive rate)
+    costs disk space rather than memory. Duplicate hashes are merged by adding their exposure counts.
+
+    Input lines are "<64 hex digits>" or "<64 hex digits>:<count>"; anything else is skipped.
+    """
+
+    DEFAULT_RUN_RECORDS: int = 1_000_000
+    DEFAULT_FALSE_POSITIVE_RATE: float = 0.001
+    READ_BUFFER_RECORDS: int = 4096
+
+    def __init__(self, directory: str, runRecords: int = DEFAULT_RUN_RECORDS, falsePositiveRate: Optional[float] = DEFAULT_FALSE_POSITIVE_RATE) -> None:
+        """
+        Configures an import.
+
+        :param directory: The corpus directory, created if needed; an existing corpus there is replaced.
+        :param runRecords: Records sorted in memory at once, about 36 bytes each plus Python overhead.
+        :param falsePositiveRate: False positive rate of the Bloom filter, None to build no filter.
+        """
+        self.directory = directory
+        self.runRecords = runRecords
+        self.falsePositiveRate = falsePositiveRate
+        self.stats: Dict[str, int] = {"lines": 0, "skipped": 0, "runs": 0, "hashes": 0}
+
+    @staticmethod
+    def parseLine(line: bytes) -> Optional[Tuple[bytes, int]]:
+        """
+        Parses one line of a hash dump.
+
+        :param line: The raw line.
+        :return: (digest, exposure count), or None if the line is not a SHA-256 hash.
+        """
+        hexDigest, _, count = line.strip().partition(b":")
+        if len(hexDigest) != 2 * BreachCorpus.DIGEST_SIZE:
+            return None
+        try:
+            return bytes.fromhex(hexDigest.decode("ascii")), min(int(count) if count else 1, BreachCorpus.MAX_COUNT)
+        except ValueError:
+            return None
+
+    def importFiles(self, paths: Iterable[str]) -> Dict[str, int]:
+        """
+        Imports hash dumps into the corpus directory.
+
+        :param paths: Paths of the dump files.
+        :return: Lines read, lines skipped, sorted runs written and distinct hashes stored.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        with tempfile.TemporaryDirectory(dir=self.directory, prefix="import-") as workDirectory:
+            runs: List[str] = self.writeRuns(paths, workDirectory)
+            self.mergeRuns(runs, workDirectory)
+
+        return dict(self.stats)
+
+    def writeRuns(self, paths: Iterable[str], workDirectory: str) -> List[str]:
+        """
+        Cuts the dumps into sorted run files.
+
+        :return: Paths of the run files.
+        """
+        runs: List[str] = []
+        pending: List[Tuple[bytes, int]] = []
+
+        for path in paths:
+            with open(path, "rb") as dump:
+                for line in dump:
+                    self.stats["lines"] += 1
+                    record: Optional[Tuple[bytes, int]] = BreachCorpusImporter.parseLine(line)
+                    if record is None:
+                        self.stats["skipped"] += 1
+                        continue
+
+                    pending.append(record)
+                    if len(pending) >= self.runRecords:
+                        runs.append(self.writeRun(pending, workDirectory, len(runs)))
+                        pending = []
+
+        if pending:
+            runs.append(self.writeRun(pending, workDirectory, len(runs)))
+
+        self.stats["runs"] = len(runs)
+        return runs
+
+    def writeRun(self, records: List[Tuple[bytes, int]], workDirectory: str, number: int) -> str:
+        """
+        Sorts records and writes them to a run file.
+
+        :return: Path of the run file.
+        """
+        records.sort()
+        path: str = os.path.join(workDirectory, f"run-{number:06d}.bin")
+        with open(path, "wb") as file:
+            file.write(b"".join(BreachCorpus.RECORD.pack(digest, count) for digest, count in records))
+        return path
+
+    @staticmethod
+    def readRun(file: BinaryIO) -> Iterator[Tuple[bytes, int]]:
+        """
+        Streams the records of a run file.
+        """
+        recordSize: int = BreachCorpus.RECORD.size
+        while True:
+            chunk: bytes = file.read(recordSize * BreachCorpusImporter.READ_BUFFER_RECORDS)
+            if not chunk:
+                return
+            yield from BreachCorpus.RECORD.iter_unpack(chunk)
+
+    def mergeRuns(self, runs: List[str], workDirectory: str) -> None:
+        """
+        Merges the sorted runs into the corpus files and publishes them, meta.json last.
+        """
+        bucketCounts = array("Q", bytes(8 * BreachCorpus.BUCKETS))
+        totalRecords: int = sum(os.path.getsize(run) // BreachCorpus.RECORD.size for run in runs)
+        bloomMap: Optional[mmap.mmap] = None
+        bloom: Optional[BloomFilter] = None
+        if self.falsePositiveRate:
+            bloomMap, bloom = BreachCorpusImporter.createBloomFile(os.path.join(workDirectory, BreachCorpus.BLOOM_FILE),
+                                                                   totalRecords, self.falsePositiveRate)
+
+        hashesPath: str = os.path.join(workDirectory, BreachCorpus.HASHES_FILE)
+        files: List[BinaryIO] = [open(run, "rb") for run in runs]
+        try:
+            with open(hashesPath, "wb") as output:
+                buffer: List[bytes] = []
+                lastDigest: Optional[bytes] = None
+                lastCount: int = 0
+
+                for digest, count in heapq.merge(*(BreachCorpusImporter.readRun(file) for file in files)):
+                    if digest == lastDigest:
+                        lastCount = min(lastCount + count, BreachCorpus.MAX_COUNT)
+                        continue
+
+                    if lastDigest is not None:
+                        buffer.append(BreachCorpus.RECORD.pack(lastDigest, lastCount))
+                        if len(buffer) >= BreachCorpusImporter.READ_BUFFER_RECORDS:
+                            output.write(b"".join(buffer))
+                            buffer = []
+
+                    lastDigest, lastCount = digest, count
+                    bucketCounts[int.from_bytes(digest[:BreachCorpus.PREFIX_BYTES], "big")] += 1
+                    if bloom is not None:
+                        bloom.add(digest)
+                    self.stats["hashes"] += 1
+
+                if lastDigest is not None:
+                    buffer.append(BreachCorpus.RECORD.pack(lastDigest, lastCount))
+                output.write(b"".join(buffer))
+                output.flush()
+                os.fsync(output.fileno())
+        finally:
+            for file in files:
+                file.close()
+            if bloomMap is not None:
+                bloom.release()
+                bloomMap.flush()
+                bloomMap.close()
+
+        index = array("Q", [0])
+        for bucketCount in bucketCounts:
+            index.append(index[-1] + bucketCount)
+        if BreachCorpus.INDEX_BYTE_ORDER != sys.byteorder:
+            index.byteswap()
+
+        BreachCorpusImporter.writeFile(os.path.join(workDirectory, BreachCorpus.INDEX_FILE), index.tobytes())
+        BreachCorpusImporter.writeFile(os.path.join(workDirectory, BreachCorpus.META_FILE),
+                                       json.dumps({"version": BreachCorpus.FORMAT_VERSION, "count": self.stats["hashes"]}).encode())
+
+        metaPath: str = os.path.join(self.directory, BreachCorpus.META_FILE)
+        if os.path.exists(metaPath):
+            os.remove(metaPath)
+        bloomPath: str = os.path.join(self.directory, BreachCorpus.BLOOM_FILE)
+        if bloom is None and os.path.exists(bloomPath):
+            os.remove(bloomPath)
+
+        for name in (BreachCorpus.HASHES_FILE, BreachCorpus.INDEX_FILE, BreachCorpus.BLOOM_FILE, BreachCorpus.META_FILE):
+            if os.path.exists(os.path.join(workDirectory, name)):
+                os.replace(os.path.join(workDirectory, name), os.path.join(self.directory, name))
+
+    @staticmethod
+    def createBloomFile(path: str, capacity: int, falsePositiveRate: float) -> Tuple[mmap.mmap, BloomFilter]:
+        """
+        Creates an empty Bloom filter in a memory-mapped file, so a filter of any size is built without holding
+        it in memory: the OS writes its pages back to disk as needed.
+
+        :param path: The filter file, sized for the filter.
+        :param capacity: Expected number of keys.
+        :param falsePositiveRate: False positive rate of the filter.
+        :return: (the writable memory map, the filter writing its bits there).
+        """
+        bitCount, hashCount = BloomFilter.dimensions(capacity, falsePositiveRate)
+        with open(path, "w+b") as file:
+            file.truncate(BloomFilter.serializedSize(bitCount))
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE)
+        return mapped, BloomFilter.writeHeader(mapped, bitCount, hashCount)
+
+    @staticmethod
+    def writeFile(path: str, content: bytes) -> None:
+        """
+        Writes a file and flushes it to disk.
+        """
+        with open(path, "wb") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
@@ -0,0 +1,589 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from storage.storageEngine import StorageEngine
+from storage.readWriteLock import ReadWriteLock
+
+class VaultLog:
+    """
+    A single category vault stored as append-only segment files inside its own directory.
+    Every mutation appends one small JSON record; an in-memory index maps each URL to the
+    location of its latest record, so reads never have to parse the whole vault.
+    A rewritten vault starts its new segment with a {"op": "reset"} record, so segments left over
+    by a crash before the old ones were deleted can never shadow the new content.
+
+    Attributes:
+        directory (str): Directory holding the vault's segment files.
+        index (dict): URL -> (segment id, offset, length) of its live record.
+        header (dict): The latest vault header written to the log, or None.
+        totalRecords (int): Records currently stored in the segments, live or dead.
+    """
+
+    SEGMENT_SUFFIX: str = ".log"
+    SEGMENT_MAX_BYTES: int = 4 * 1024 * 1024
+
+    def __init__(self, directory: str, legacyFile: Optional[str] = None) -> None:
+        """
+        Opens a vault, migrating a legacy JSON vault file on first open.
+
+        :param directory: Directory holding the vault's segment files.
+        :param legacyFile: Path of the legacy {category}.json file of this vault, if any.
+        """
+        self.directory = directory
+        self.lock = ReadWriteLock()
+        self.index: Dict[str, Tuple[int, int, int]] = {}
+        self.header: Optional[dict] = None
+        self.segments: List[int] = []
+        self.totalRecords: int = 0
+        self.activeSize: int = 0
+
+        if legacyFile is not None and os.path.exists(legacyFile) and not self.hasSegments():
+            self.migrateLegacyFile(legacyFile)
+
+        self.load()
+
+    def segmentPath(self, segmentId: int) -> str:
+        """
+        Returns the path of a segment file.
+
+        :param segmentId: Sequence number of the segment.
+        :return: Path of the segment file.
+        """
+        return os.path.join(self.directory, f"{segmentId:08d}{VaultLog.SEGMENT_SUFFIX}")
+
+    def hasSegments(self) -> bool:
+        """
+        Checks whether the vault directory already holds segment files.
+        """
+        return os.path.isdir(self.directory) and bool(VaultLog.listSegmentIds(self.directory))
+
+    @staticmethod
+    def listSegmentIds(directory: str) -> List[int]:
+        """
+        Lists the segment ids found in a vault directory, oldest first.
+
+        :param directory: Directory holding the vault's segment files.
+        :return: Sorted list of segment ids.
+        """
+        segmentIds: List[int] = []
+        for file in os.listdir(directory):
+            name, extension = os.path.splitext(file)
+            if extension == VaultLog.SEGMENT_SUFFIX and name.isdigit():
+                segmentIds.append(int(name))
+        return sorted(segmentIds)
+
+    @staticmethod
+    def encodeRecord(record: dict) -> bytes:
+        """
+        Serializes a record into a single compact JSON line.
+
+        :param record: The record to encode.
+        :return: The encoded line, including its trailing newline.
+        """
+        return (json.dumps(record, separators=(",", ":")) + "\n").encode()
+
+    def migrateLegacyFile(self, legacyFile: str) -> None:
+        """
+        Converts a legacy {category}.json vault into a first segment and removes the old file.
+
+        :param legacyFile: Path of the legacy vault file.
+        :raises json.JSONDecodeError: If the legacy file is corrupted.
+        """
+        with open(legacyFile, "r") as file:
+            vaultData: dict = json.load(file)
+
+        os.makedirs(self.directory, exist_ok=True)
+        records: bytes = b"".join(VaultLog.encodeRecord({"op": "put", "url": url, "entry": entry}) for url, entry in vaultData.items())
+        VaultLog.writeFileAtomically(self.segmentPath(1), records)
+        os.remove(legacyFile)
+
+    @staticmethod
+    def writeFileAtomically(path: str, content: bytes) -> None:
+        """
+        Writes a file through a temporary file and a rename, so readers never see a partial file.
+
+        :param path: Destination path.
+        :param content: Bytes to write.
+        """
+        temporaryPath: str = path + ".tmp"
+        with open(temporaryPath, "wb") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporaryPath, path)
+
+    def load(self) -> None:
+        """
+        Rebuilds the in-memory index by scanning every segment, oldest first.
+        A torn record at the end of the newest segment (e.g. after a crash) is cut off.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self.segments = VaultLog.listSegmentIds(self.directory)
+
+        if not self.segments:
+            open(self.segmentPath(1), "ab").close()
+            self.segments = [1]
+
+        for segmentId in self.segments:
+            with open(self.segmentPath(segmentId), "rb") as file:
+                content: bytes = file.read()
+
+            offset: int = 0
+            while offset < len(content):
+                end: int = content.find(b"\n", offset)
+                try:
+                    if end == -1:
+                        raise ValueError("Incomplete record.")
+                    record: dict = json.loads(content[offset:end])
+                except ValueError:
+                    if segmentId == self.segments[-1]:
+                        with open(self.segmentPath(segmentId), "r+b") as file:
+                            file.truncate(offset)
+                        content = content[:offset]
+                        break
+                    offset = end + 1 if end != -1 else len(content)
+                    continue
+
+                self.applyToIndex(record, segmentId, offset, end + 1 - offset)
+                offset = end + 1
+
+            self.activeSize = len(content)
+
+    def applyToIndex(self, record: dict, segmentId: int, offset: int, length: int) -> None:
+        """
+        Updates the index with a record that was written at the given location.
+
+        :param record: The decoded record.
+        :param segmentId: Segment the record lives in.
+        :param offset: Byte offset of the record in the segment.
+        :param length: Length of the record in bytes.
+        """
+        if record.get("op") == "reset":
+            self.index.clear()
+            self.header = None
+            self.totalRecords = 0
+            return
+
+        if record.get("op") == "header":
+            self.header = record["header"]
+            return
+
+        self.totalRecords += 1
+        if record.get("op") == "put":
+            self.index[record["url"]] = (segmentId, offset, length)
+        elif record.get("op") == "del":
+            self.index.pop(record["url"], None)
+
+    def readRecord(self, location: Tuple[int, int, int]) -> dict:
+        """
+        Reads a single record from disk.
+
+        :param location: (segment id, offset, length) of the record.
+        :return: The decoded record.
+        """
+        segmentId, offset, length = location
+        with open(self.segmentPath(segmentId), "rb") as file:
+            file.seek(offset)
+            return json.loads(file.read(length))
+
+    def get(self, url: str) -> Optional[dict]:
+        """
+        Returns the entry stored for a URL.
+
+        :param url: The URL to look up.
+        :return: The stored entry, or None if the URL is not in the vault.
+        """
+        with self.lock.reading():
+            location = self.index.get(url)
+            if location is None:
+                return None
+            return self.readRecord(location)["entry"]
+
+    def getHeader(self) -> Optional[dict]:
+        """
+        Returns the vault header, or None if the vault has none.
+        """
+        with self.lock.reading():
+            return self.header
+
+    def urls(self) -> List[str]:
+        """
+        Returns the URLs stored in the vault.
+        """
+        with self.lock.reading():
+            return list(self.index.keys())
+
+    def items(self) -> dict:
+        """
+        Materializes the whole vault.
+
+        :return: Dictionary mapping URLs to their stored entries.
+        """
+        with self.lock.reading():
+            return {url: self.readRecord(location)["entry"] for url, location in self.index.items()}
+
+    def append(self, records: List[dict]) -> None:
+        """
+        Appends mutation records with a single write to the active segment.
+
+        :param records: Records of the form {"op": "put", "url": ..., "entry": ...}, {"op": "del", "url": ...}
+                        or {"op": "header", "header": ...}.
+        """
+        if not records:
+            return
+
+        with self.lock.writing():
+            if self.activeSize >= VaultLog.SEGMENT_MAX_BYTES:
+                self.segments.append(self.segments[-1] + 1)
+                self.activeSize = 0
+
+            segmentId: int = self.segments[-1]
+            encoded: List[bytes] = [VaultLog.encodeRecord(record) for record in records]
+
+            with open(self.segmentPath(segmentId), "ab") as file:
+                file.write(b"".join(encoded))
+                file.flush()
+
+            offset: int = self.activeSize
+            for record, line in zip(records, encoded):
+                self.applyToIndex(record, segmentId, offset, len(line))
+                offset += len(line)
+            self.activeSize = offset
+
+    def deadRecords(self) -> int:
+        """
+        Returns the number of records that were overwritten or deleted.
+        """
+        return self.totalRecords - len(self.index)
+
+    def needsCompaction(self, minDeadRecords: int, deadRatio: float) -> bool:
+        """
+        Checks whether enough dead records piled up to make a rewrite worthwhile.
+
+        :param minDeadRecords: Minimum number of dead records.
+        :param deadRatio: Minimum share of dead records among all records.
+        :return: True if the vault should be compacted.
+        """
+        with self.lock.reading():
+            dead: int = self.deadRecords()
+            return dead >= minDeadRecords and dead >= deadRatio * self.totalRecords
+
+    def compact(self) -> None:
+        """
+        Rewrites the live records into a fresh segment and deletes the old segments.
+        """
+        with self.lock.writing():
+            self.rewrite({url: self.readRecord(location)["entry"] for url, location in self.index.items()}, self.header)
+
+    def replace(self, vaultData: dict, header: Optional[dict] = None) -> None:
+        """
+        Atomically replaces the whole content of the vault.
+
+        :param vaultData: Dictionary mapping URLs to the entries the vault holds from now on.
+        :param header: The new vault header, None keeps the current one.
+        """
+        with self.lock.writing():
+            self.rewrite(vaultData, header if header is not None else self.header)
+
+    def rewrite(self, vaultData: dict, header: Optional[dict]) -> None:
+        """
+        Writes the given header and entries into a fresh segment, then deletes the old segments.
+        The caller must hold the write lock.
+
+        :param vaultData: Dictionary mapping URLs to their entries.
+        :param header: The vault header, or None.
+        """
+        oldSegments: List[int] = list(self.segments)
+        newSegmentId: int = oldSegments[-1] + 1
+
+        newIndex: Dict[str, Tuple[int, int, int]] = {}
+        lines: List[bytes] = [VaultLog.encodeRecord({"op": "reset"})]
+        if header is not None:
+            lines.append(VaultLog.encodeRecord({"op": "header", "header": header}))
+        offset: int = sum(len(line) for line in lines)
+
+        for url, entry in vaultData.items():
+            line: bytes = VaultLog.encodeRecord({"op": "put", "url": url, "entry": entry})
+            newIndex[url] = (newSegmentId, offset, len(line))
+            lines.append(line)
+            offset += len(line)
+
+        VaultLog.writeFileAtomically(self.segmentPath(newSegmentId), b"".join(lines))
+
+        for segmentId in oldSegments:
+            os.remove(self.segmentPath(segmentId))
+
+        self.index = newIndex
+        self.header = header
+        self.segments = [newSegmentId]
+        self.totalRecords = len(newIndex)
+        self.activeSize = offset
+
+class LogStore(StorageEngine):
+    """
+    File storage engine: keeps the log-structured vaults of every user open and compacts them in the background.
+
+    Layout: {baseDir}/{user}/{category}/{segment}.log, legacy vaults live in {baseDir}/{user}/{category}.json
+    until they are migrated on first open.
+
+    At most MAX_OPEN_VAULTS vaults stay open. Every operation holds a reference to the vault it uses, and only
+    unreferenced vaults are closed, so there is never a second VaultLog over the segments of a vault in use.
+
+    Attributes:
+        baseDir (str): Directory holding one sub-directory per user.
+        compactions (int): Number of compactions performed.
+    """
+
+    MAX_OPEN_VAULTS: int = 1024
+    COMPACTION_INTERVAL: float = 30.0
+    COMPACTION_MIN_DEAD_RECORDS: int = 64
+    COMPACTION_DEAD_RATIO: float = 0.5
+
+    def __init__(self, baseDir: str) -> None:
+        """
+        Initializes the store; vaults are opened lazily.
+
+        :param baseDir: Directory holding one sub-directory per user.
+        """
+        self.baseDir = baseDir
+        self.lock = threading.Lock()
+        self.vaults: "OrderedDict[Tuple[str, str], VaultLog]" = OrderedDict()
+        self.references: Dict[Tuple[str, str], int] = {}
+        self.compactions: int = 0
+        self.compactionRequested = threading.Event()
+        self.compactor: Optional[threading.Thread] = None
+
+    def userDirectory(self, user: str) -> str:
+        """
+        Returns the directory holding the vaults of a user.
+        """
+        return os.path.join(self.baseDir, user)
+
+    def vaultDirectory(self, user: str, category: str) -> str:
+        """
+        Returns the directory holding the segments of a category vault.
+        """
+        return os.path.join(self.baseDir, user, category)
+
+    def legacyFile(self, user: str, category: str) -> str:
+        """
+        Returns the path of the legacy JSON file of a category vault.
+        """
+        return os.path.join(self.baseDir, user, f"{category}.json")
+
+    def listUsers(self) -> List[str]:
+        """
+        Lists the users that have a vault directory.
+        """
+        if not os.path.isdir(self.baseDir):
+            return []
+        return sorted(name for name in os.listdir(self.baseDir) if os.path.isdir(os.path.join(self.baseDir, name)))
+
+    def userExists(self, user: str) -> bool:
+        """
+        Checks whether the user has a vault directory.
+        """
+        return os.path.exists(self.userDirectory(user))
+
+    def vaultExists(self, user: str, category: str) -> bool:
+        """
+        Checks whether a category vault exists, in either format.
+        """
+        with self.lock:
+            if (user, category) in self.vaults:
+                return True
+
+        return os.path.exists(self.vaultDirectory(user, category)) or os.path.exists(self.legacyFile(user, category))
+
+    def createVault(self, user: str, category: str) -> bool:
+        """
+        Creates an empty category vault if it does not exist yet.
+
+        :return: True if the vault was created, False if it already existed.
+        """
+        if self.vaultExists(user, category):
+            return False
+
+        os.makedirs(self.vaultDirectory(user, category), exist_ok=True)
+        open(os.path.join(self.vaultDirectory(user, category), f"{1:08d}{VaultLog.SEGMENT_SUFFIX}"), "ab").close()
+        return True
+
+    def listCategories(self, user: str) -> List[str]:
+        """
+        Lists the categories the user has vaults for, in either format.
+        """
+        userDirectory: str = self.userDirectory(user)
+        categories: List[str] = []
+
+        for name in os.listdir(userDirectory):
+            if name.endswith(".json"):
+                category = name[:-len(".json")]
+            elif os.path.isdir(os.path.join(userDirectory, name)):
+                category = name
+            else:
+                continue
+
+            if category not in categories:
+                categories.append(category)
+
+        return categories
+
+    def openVault(self, user: str, category: str) -> VaultLog:
+        """
+        Returns the open vault, opening (and if needed migrating) it on first access.
+        The vault may be closed once no operation uses it; use useVault() to keep it open across several calls.
+
+        :raises FileNotFoundError: If the vault does not exist.
+        :raises json.JSONDecodeError: If a legacy vault file is corrupted.
+        """
+        with self.lock:
+            vault = self.openVaultLocked(user, category)
+            self.evictUnused()
+            return vault
+
+    def openVaultLocked(self, user: str, category: str) -> VaultLog:
+        """
+        Returns the open vault, opening it on first access. Called with the store lock held.
+        """
+        vault = self.vaults.get((user, category))
+        if vault is not None:
+            self.vaults.move_to_end((user, category))
+            return vault
+
+        if not os.path.exists(self.vaultDirectory(user, category)) and not os.path.exists(self.legacyFile(user, category)):
+            raise FileNotFoundError(f"Vault '{category}' does not exist for user '{user}'.")
+
+        vault = VaultLog(self.vaultDirectory(user, category), self.legacyFile(user, category))
+        self.vaults[(user, category)] = vault
+        return vault
+
+    def evictUnused(self) -> None:
+        """
+        Closes the least recently used vaults nobody holds a reference to, until at most MAX_OPEN_VAULTS are open.
+        Called with the store lock held.
+        """
+        excess: int = len(self.vaults) - LogStore.MAX_OPEN_VAULTS
+        if excess <= 0:
+            return
+
+        unused: List[Tuple[str, str]] = [key for key in self.vaults if not self.references.get(key)][:excess]
+        for key in unused:
+            del self.vaults[key]
+
+    @contextmanager
+    def useVault(self, user: str, category: str) -> Iterator[VaultLog]:
+        """
+        Opens a vault and keeps it open for the duration of the block.
+
+        :raises FileNotFoundError: If the vault does not exist.
+        :raises json.JSONDecodeError: If a legacy vault file is corrupted.
+        """
+        key: Tuple[str, str] = (user, category)
+        with self.lock:
+            vault = self.openVaultLocked(user, category)
+            self.references[key] = self.references.get(key, 0) + 1
+            self.evictUnused()
+
+        try:
+            yield vault
+        finally:
+            with self.lock:
+                self.references[key] -= 1
+                if not self.references[key]:
+                    del self.references[key]
+                self.evictUnused()
+
+    def loadVault(self, user: str, category: str) -> dict:
+        """
+        Returns every entry of a category vault.
+        """
+        with self.useVault(user, category) as vault:
+            return vault.items()
+
+    def getEntry(self, user: str, category: str, url: str) -> Optional[dict]:
+        """
+        Returns the entry stored for a URL, or None if the URL is not in the vault.
+        """
+        with self.useVault(user, category) as vault:
+            return vault.get(url)
+
+    def listUrls(self, user: str, category: str) -> List[str]:
+        """
+        Lists the URLs stored in a category vault.
+        """
+        with self.useVault(user, category) as vault:
+            return vault.urls()
+
+    def applyRecords(self, user: str, category: str, records: List[dict]) -> None:
+        """
+        Appends mutation records to a vault and wakes the compactor if the vault became worth compacting.
+        """
+        with self.useVault(user, category) as vault:
+            vault.append(records)
+            needsCompaction: bool = vault.needsCompaction(LogStore.COMPACTION_MIN_DEAD_RECORDS, LogStore.COMPACTION_DEAD_RATIO)
+
+        if needsCompaction:
+            self.startCompactor()
+            self.compactionRequested.set()
+
+    def getVaultHeader(self, user: str, category: str) -> Optional[dict]:
+        """
+        Returns the header of a category vault, or None if it has none.
+        """
+        with self.useVault(user, category) as vault:
+            return vault.getHeader()
+
+    def replaceVault(self, user: str, category: str, vaultData: dict, header: Optional[dict] = None) -> None:
+        """
+        Replaces the whole content of a vault by writing it into a fresh segment.
+        """
+        with self.useVault(user, category) as vault:
+            vault.replace(vaultData, header)
+
+    def compactAll(self) -> int:
+        """
+        Compacts every open vault whose dead records passed the threshold.
+
+        :return: Number of vaults compacted.
+        """
+        with self.lock:
+            keys: List[Tuple[str, str]] = list(self.vaults)
+
+        compacted: int = 0
+        for user, category in keys:
+            with self.lock:
+                if (user, category) not in self.vaults:
+                    continue
+            with self.useVault(user, category) as vault:
+                if vault.needsCompaction(LogStore.COMPACTION_MIN_DEAD_RECORDS, LogStore.COMPACTION_DEAD_RATIO):
+                    vault.compact()
+                    compacted += 1
+
+        self.compactions += compacted
+        return compacted
+
+    def startCompactor(self) -> None:
+        """
+        Starts the background compaction thread if it is not running yet.
+        """
+        with self.lock:
+            if self.compactor is not None:
+                return
+            self.compactor = threading.Thread(target=self.compactorLoop, name="vault-compactor", daemon=True)
+            self.compactor.start()
+
+    def compactorLoop(self) -> None:
+        """
+        Background loop compacting vaults when asked to, or periodically.
+        """
+        while True:
+            self.compactionRequested.wait(LogStore.COMPACTION_INTERVAL)
+            self.compactionRequested.clear()
+            try:
+                self.compactAll()
+            except OSError as e:
+                print(f"Vault compaction failed: {str(e)}")
@@ -0,0 +1,180 @@
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+class LockStats:
+    """
+    Thread-safe counters describing how long threads waited for vault locks.
+
+    Attributes:
+        readAcquisitions (int): Read locks granted.
+        writeAcquisitions (int): Write locks granted.
+        contended (int): Acquisitions that had to wait for another thread.
+        totalWait (float): Seconds spent waiting, summed over all acquisitions.
+        maxWait (float): Longest single wait in seconds.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes all counters to zero.
+        """
+        self.lock = threading.Lock()
+        self.readAcquisitions: int = 0
+        self.writeAcquisitions: int = 0
+        self.contended: int = 0
+        self.totalWait: float = 0.0
+        self.maxWait: float = 0.0
+
+    def recordAcquisition(self, isWrite: bool, waited: Optional[float]) -> None:
+        """
+        Records a granted lock.
+
+        :param isWrite: Whether a write lock was granted.
+        :param waited: Seconds the thread waited, or None if the lock was free.
+        """
+        with self.lock:
+            if isWrite:
+                self.writeAcquisitions += 1
+            else:
+                self.readAcquisitions += 1
+
+            if waited is not None:
+                self.contended += 1
+                self.totalWait += waited
+                self.maxWait = max(self.maxWait, waited)
+
+    def snapshot(self) -> dict:
+        """
+        Returns a consistent copy of the counters.
+
+        :return: Dictionary with the acquisition counts and wait times in milliseconds.
+        """
+        with self.lock:
+            acquisitions: int = self.readAcquisitions + self.writeAcquisitions
+            return {
+                "reads": self.readAcquisitions,
+                "writes": self.writeAcquisitions,
+                "contended": self.contended,
+                "totalWaitMs": self.totalWait * 1000,
+                "averageWaitMs": (self.totalWait * 1000 / acquisitions) if acquisitions else 0.0,
+                "maxWaitMs": self.maxWait * 1000,
+            }
+
+class ReadWriteLock:
+    """
+    Lock that lets many readers in at once while writers get exclusive access.
+    Waiting writers block new readers, so a steady stream of reads cannot starve a write.
+    The writing thread may take the lock again, for reading or writing, without deadlocking.
+    """
+
+    def __init__(self, stats: Optional[LockStats] = None) -> None:
+        """
+        Initializes an unlocked lock.
+
+        :param stats: Counters the lock reports its wait times to, if any.
+        """
+        self.condition = threading.Condition(threading.Lock())
+        self.readers: Dict[int, int] = {}
+        self.writer: Optional[int] = None
+        self.writerDepth: int = 0
+        self.waitingWriters: int = 0
+        self.stats = stats
+
+    def acquireRead(self) -> None:
+        """
+        Blocks until the lock can be shared with other readers.
+        """
+        thread: int = threading.get_ident()
+        waitStart: Optional[float] = None
+
+        with self.condition:
+            isOwnedByThread: bool = self.writer == thread or thread in self.readers
+            while not isOwnedByThread and (self.writer is not None or self.waitingWriters):
+                if waitStart is None:
+                    waitStart = time.perf_counter()
+                self.condition.wait()
+            self.readers[thread] = self.readers.get(thread, 0) + 1
+
+        self.recordAcquisition(False, waitStart)
+
+    def releaseRead(self) -> None:
+        """
+        Releases a read lock held by the calling thread.
+        """
+        thread: int = threading.get_ident()
+
+        with self.condition:
+            count: int = self.readers[thread] - 1
+            if count:
+                self.readers[thread] = count
+            else:
+                del self.readers[thread]
+                if not self.readers:
+                    self.condition.notify_all()
+
+    def acquireWrite(self) -> None:
+        """
+        Blocks until the calling thread holds the lock exclusively.
+        A thread holding only a read lock must not ask for the write lock.
+        """
+        thread: int = threading.get_ident()
+        waitStart: Optional[float] = None
+
+        with self.condition:
+            if self.writer == thread:
+                self.writerDepth += 1
+                return
+
+            self.waitingWriters += 1
+            try:
+                while self.writer is not None or self.readers:
+                    if waitStart is None:
+                        waitStart = time.perf_counter()
+                    self.condition.wait()
+            finally:
+                self.waitingWriters -= 1
+
+            self.writer = thread
+            self.writerDepth = 1
+
+        self.recordAcquisition(True, waitStart)
+
+    def releaseWrite(self) -> None:
+        """
+        Releases the write lock held by the calling thread.
+        """
+        with self.condition:
+            self.writerDepth -= 1
+            if self.writerDepth == 0:
+                self.writer = None
+                self.condition.notify_all()
+
+    def recordAcquisition(self, isWrite: bool, waitStart: Optional[float]) -> None:
+        """
+        Reports a granted lock to the stats, if the lock has any.
+        """
+        if self.stats is not None:
+            self.stats.recordAcquisition(isWrite, None if waitStart is None else time.perf_counter() - waitStart)
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        """
+        Holds a read lock for the duration of the block.
+        """
+        self.acquireRead()
+        try:
+            yield
+        finally:
+            self.releaseRead()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """
+        Holds the write lock for the duration of the block.
+        """
+        self.acquireWrite()
+        try:
+            yield
+        finally:
+            self.releaseWrite()
@@ -0,0 +1,264 @@
+import math
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from storage.urlIndex import UrlIndex
+
+class UserSearchTree:
+    """
+    Search structures of a single user: a trie over the normalized URLs for prefix lookups and
+    a trigram posting list for substring and typo-tolerant lookups.
+    Trie nodes are plain dictionaries keyed by character; the KEY_MARKER entry marks the end of a URL.
+
+    Attributes:
+        categories (dict): URL -> set of categories holding it.
+        keys (dict): Normalized URL -> set of stored URLs normalizing to it.
+        root (dict): Root node of the trie over the normalized URLs.
+        trigrams (dict): Trigram -> set of normalized URLs containing it.
+    """
+
+    KEY_MARKER: str = ""
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty tree.
+        """
+        self.categories: Dict[str, Set[str]] = {}
+        self.keys: Dict[str, Set[str]] = {}
+        self.root: dict = {}
+        self.trigrams: Dict[str, Set[str]] = {}
+
+    def add(self, url: str, category: str) -> None:
+        """
+        Records that a category holds a URL.
+        """
+        categories: Optional[Set[str]] = self.categories.get(url)
+        if categories is not None:
+            categories.add(category)
+            return
+
+        self.categories[url] = {category}
+        key: str = SearchIndex.normalize(url)
+        urls: Optional[Set[str]] = self.keys.get(key)
+        if urls is not None:
+            urls.add(url)
+            return
+
+        self.keys[key] = {url}
+        node: dict = self.root
+        for char in key:
+            child: Optional[dict] = node.get(char)
+            if child is None:
+                child = node[char] = {}
+            node = child
+        node[UserSearchTree.KEY_MARKER] = True
+
+        for trigram in SearchIndex.trigramsOf(key):
+            postings: Optional[Set[str]] = self.trigrams.get(trigram)
+            if postings is None:
+                self.trigrams[trigram] = {key}
+            else:
+                postings.add(key)
+
+    def remove(self, url: str, category: str) -> None:
+        """
+        Records that a category no longer holds a URL.
+        """
+        categories: Optional[Set[str]] = self.categories.get(url)
+        if categories is None:
+            return
+
+        categories.discard(category)
+        if categories:
+            return
+
+        del self.categories[url]
+        key: str = SearchIndex.normalize(url)
+        urls: Set[str] = self.keys[key]
+        urls.discard(url)
+        if urls:
+            return
+
+        del self.keys[key]
+        self.removeFromTrie(key)
+
+        for trigram in SearchIndex.trigramsOf(key):
+            postings: Set[str] = self.trigrams[trigram]
+            postings.discard(key)
+            if not postings:
+                del self.trigrams[trigram]
+
+    def removeFromTrie(self, key: str) -> None:
+        """
+        Unmarks a key in the trie and prunes the nodes no other key needs.
+        """
+        path: List[Tuple[dict, str]] = []
+        node: dict = self.root
+        for char in key:
+            path.append((node, char))
+            node = node[char]
+        del node[UserSearchTree.KEY_MARKER]
+
+        for parent, char in reversed(path):
+            if parent[char]:
+                break
+            del parent[char]
+
+    def keysWithPrefix(self, prefix: str) -> Iterator[str]:
+        """
+        Yields the normalized URLs starting with a prefix, in alphabetical order.
+        """
+        node: Optional[dict] = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return
+
+        stack: List[Tuple[str, dict]] = [(prefix, node)]
+        while stack:
+            key, node = stack.pop()
+            for char in sorted(node, reverse=True):
+                if char == UserSearchTree.KEY_MARKER:
+                    yield key
+                else:
+                    stack.append((key + char, node[char]))
+
+class SearchIndex(UrlIndex):
+    """
+    Per-user URL search index, kept current from the same mutation records as the URL index.
+    Matches are ranked: exact match, then prefix matches, then URLs containing the pattern,
+    then URLs sharing most of the pattern's trigrams (typo-tolerant matches).
+    At most MAX_CANDIDATES trigram candidates are ranked, so a search on a very common pattern stays fast.
+    """
+
+    MAX_CANDIDATES: int = 2000
+    MIN_TRIGRAM_SIMILARITY: float = 0.5
+
+    @staticmethod
+    def normalize(url: str) -> str:
+        """
+        Returns the searchable form of a URL: lower case, without scheme and "www." prefix.
+
+        :param url: The stored URL.
+        :return: The normalized URL.
+        """
+        key: str = url.lower()
+        schemeEnd: int = key.find("://")
+        if schemeEnd != -1:
+            key = key[schemeEnd + 3:]
+        if key.startswith("www."):
+            key = key[4:]
+        return key
+
+    @staticmethod
+    def trigramsOf(text: str) -> Set[str]:
+        """
+        Returns the set of three-character substrings of a text.
+        """
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def createUserIndex(self) -> UserSearchTree:
+        """
+        Creates the empty search tree of a user.
+        """
+        return UserSearchTree()
+
+    def addUrl(self, userIndex: UserSearchTree, url: str, category: str) -> None:
+        """
+        Records that a category holds a URL.
+        """
+        userIndex.add(url, category)
+
+    def removeUrl(self, userIndex: UserSearchTree, url: str, category: str) -> None:
+        """
+        Records that a category no longer holds a URL.
+        """
+        userIndex.remove(url, category)
+
+    def lookup(self, userIndex: UserSearchTree, url: str) -> Set[str]:
+        """
+        Returns the categories holding a URL.
+        """
+        return userIndex.categories.get(url, set())
+
+    def search(self, user: str, pattern: str, loadUser, offset: int = 0, limit: int = 20) -> Tuple[List[Tuple[str, List[str]]], bool]:
+        """
+        Searches the URLs of a user. Matches are produced lazily, so a page near the top of the
+        ranking costs about as much as the page itself.
+
+        :param user: The username of the vault owner.
+        :param pattern: The text to look for.
+        :param loadUser: Returns {category: [urls]} for a user, used to build a missing index.
+        :param offset: Number of ranked results to skip.
+        :param limit: Maximum number of results to return.
+        :return: ([(url, sorted categories)] for the requested page, whether more results follow).
+        """
+        tree: UserSearchTree = self.userIndex(user, loadUser)
+        query: str = SearchIndex.normalize(pattern.strip())
+        if not query:
+            return [], False
+
+        position: int = 0
+        page: List[Tuple[str, List[str]]] = []
+
+        with self.lock:
+            for key in SearchIndex.rankKeys(tree, query):
+                for url in sorted(tree.keys[key]):
+                    if position >= offset + limit:
+                        return page, True
+                    if position >= offset:
+                        page.append((url, sorted(tree.categories[url])))
+                    position += 1
+
+        return page, False
+
+    @staticmethod
+    def rankKeys(tree: UserSearchTree, query: str) -> Iterator[str]:
+        """
+        Yields the normalized URLs matching a query, best match first: the exact match, prefix matches
+        in alphabetical order, URLs containing the query (shortest first), then approximate matches
+        (most shared trigrams first). The trigram tiers are only computed once the prefix matches run out.
+
+        :param tree: The user's search tree.
+        :param query: The normalized query.
+        :return: Iterator over the ranked normalized URLs.
+        """
+        if query in tree.keys:
+            yield query
+
+        for key in tree.keysWithPrefix(query):
+            if key != query:
+                yield key
+
+        queryTrigrams: List[str] = sorted(SearchIndex.trigramsOf(query), key=lambda trigram: len(tree.trigrams.get(trigram, ())))
+        if not queryTrigrams:
+            return
+
+        required: int = max(1, math.ceil(len(queryTrigrams) * SearchIndex.MIN_TRIGRAM_SIMILARITY))
+        seen: Set[str] = set()
+        substringMatches: List[Tuple[int, str]] = []
+        fuzzyMatches: List[Tuple[float, int, str]] = []
+
+        # A key sharing `required` trigrams with the query must appear in one of its rarest
+        # len - required + 1 posting lists, so only those have to be scanned.
+        for trigram in queryTrigrams[:len(queryTrigrams) - required + 1]:
+            for key in tree.trigrams.get(trigram, ()):
+                if key in seen or key.startswith(query):
+                    continue
+                seen.add(key)
+
+                if query in key:
+                    substringMatches.append((len(key), key))
+                else:
+                    shared: int = sum(1 for other in queryTrigrams if key in tree.trigrams.get(other, ()))
+                    if shared >= required:
+                        fuzzyMatches.append((-shared / len(queryTrigrams), len(key), key))
+
+                if len(seen) >= SearchIndex.MAX_CANDIDATES:
+                    break
+            if len(seen) >= SearchIndex.MAX_CANDIDATES:
+                break
+
+        for _, key in sorted(substringMatches):
+            yield key
+        for *_, key in sorted(fuzzyMatches):
+            yield key
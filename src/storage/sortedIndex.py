@@ -0,0 +1,77 @@
+import bisect
+from typing import Dict, List, Optional, Tuple
+
+from storage.urlIndex import UrlIndex
+
+class SortedIndex(UrlIndex):
+    """
+    Per-user index keeping the URLs of every vault in a sorted list, so a page of URLs following
+    a given URL is found with a binary search and costs O(log n + page) instead of listing the vault.
+    Kept current from the same mutation records as the URL index.
+    """
+
+    def createUserIndex(self) -> Dict[str, List[str]]:
+        """
+        Creates the empty index of a user, category -> sorted URLs.
+        """
+        return {}
+
+    def loadUserIndex(self, userIndex: Dict[str, List[str]], vaultUrls: Dict[str, List[str]]) -> None:
+        """
+        Fills a freshly created user index, sorting each vault's URLs once.
+        """
+        for category, categoryUrls in vaultUrls.items():
+            userIndex[category] = sorted(set(categoryUrls))
+
+    def addUrl(self, userIndex: Dict[str, List[str]], url: str, category: str) -> None:
+        """
+        Inserts a URL into the sorted list of its vault.
+        """
+        urls: List[str] = userIndex.setdefault(category, [])
+        position: int = bisect.bisect_left(urls, url)
+        if position == len(urls) or urls[position] != url:
+            urls.insert(position, url)
+
+    def removeUrl(self, userIndex: Dict[str, List[str]], url: str, category: str) -> None:
+        """
+        Removes a URL from the sorted list of its vault.
+        """
+        urls: Optional[List[str]] = userIndex.get(category)
+        if urls is None:
+            return
+
+        position: int = bisect.bisect_left(urls, url)
+        if position < len(urls) and urls[position] == url:
+            del urls[position]
+
+    def lookup(self, userIndex: Dict[str, List[str]], url: str) -> set:
+        """
+        Returns the categories holding a URL.
+        """
+        return {category for category, urls in userIndex.items() if SortedIndex.containsUrl(urls, url)}
+
+    @staticmethod
+    def containsUrl(urls: List[str], url: str) -> bool:
+        """
+        Checks whether a sorted list holds a URL.
+        """
+        position: int = bisect.bisect_left(urls, url)
+        return position < len(urls) and urls[position] == url
+
+    def page(self, user: str, category: str, after: Optional[str], limit: int, loadUser) -> Tuple[List[str], bool]:
+        """
+        Returns the URLs of a vault that sort after a given URL.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param after: The last URL of the previous page, or None for the first page.
+        :param limit: Maximum number of URLs to return.
+        :param loadUser: Returns {category: [urls]} for a user, used to build a missing index.
+        :return: (URLs of the page in sorted order, whether more URLs follow).
+        """
+        userIndex: Dict[str, List[str]] = self.userIndex(user, loadUser)
+
+        with self.lock:
+            urls: List[str] = userIndex.get(category, [])
+            start: int = 0 if after is None else bisect.bisect_right(urls, after)
+            return urls[start:start + limit], start + limit < len(urls)
@@ -0,0 +1,186 @@
+import os
+import json
+import sqlite3
+import threading
+from typing import List, Optional
+
+from storage.storageEngine import StorageEngine
+
+class SqliteStore(StorageEngine):
+    """
+    Storage engine keeping every vault in a single SQLite database.
+    Entries are stored one row per URL under a (user, category, url) primary key, so lookups and
+    single-entry writes cost the same no matter how large the vault is.
+
+    Attributes:
+        databasePath (str): Path of the SQLite database file.
+    """
+
+    SCHEMA: str = """
+        CREATE TABLE IF NOT EXISTS vaults (
+            user TEXT NOT NULL,
+            category TEXT NOT NULL,
+            PRIMARY KEY (user, category)
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS entries (
+            user TEXT NOT NULL,
+            category TEXT NOT NULL,
+            url TEXT NOT NULL,
+            entry TEXT NOT NULL,
+            PRIMARY KEY (user, category, url)
+        ) WITHOUT ROWID;
+
+        CREATE INDEX IF NOT EXISTS entries_by_url ON entries (user, url);
+
+        CREATE TABLE IF NOT EXISTS vault_headers (
+            user TEXT NOT NULL,
+            category TEXT NOT NULL,
+            header TEXT NOT NULL,
+            PRIMARY KEY (user, category)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, databasePath: str) -> None:
+        """
+        Opens (and if needed creates) the database.
+
+        :param databasePath: Path of the SQLite database file.
+        """
+        self.databasePath = databasePath
+        self.local = threading.local()
+
+        directory: str = os.path.dirname(databasePath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self.connection() as connection:
+            connection.executescript(SqliteStore.SCHEMA)
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection of the calling thread, opening it on first use.
+        """
+        connection: Optional[sqlite3.Connection] = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.databasePath, timeout=30.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return connection
+
+    def requireVault(self, user: str, category: str) -> None:
+        """
+        Raises FileNotFoundError if the vault does not exist, mirroring the file engine.
+        """
+        if not self.vaultExists(user, category):
+            raise FileNotFoundError(f"Vault '{category}' does not exist for user '{user}'.")
+
+    def listUsers(self) -> List[str]:
+        """
+        Lists the users owning at least one vault.
+        """
+        rows = self.connection().execute("SELECT DISTINCT user FROM vaults ORDER BY user").fetchall()
+        return [row[0] for row in rows]
+
+    def userExists(self, user: str) -> bool:
+        """
+        Checks whether the user has at least one vault.
+        """
+        row = self.connection().execute("SELECT 1 FROM vaults WHERE user = ? LIMIT 1", (user,)).fetchone()
+        return row is not None
+
+    def vaultExists(self, user: str, category: str) -> bool:
+        """
+        Checks whether a category vault exists for the user.
+        """
+        row = self.connection().execute("SELECT 1 FROM vaults WHERE user = ? AND category = ?", (user, category)).fetchone()
+        return row is not None
+
+    def createVault(self, user: str, category: str) -> bool:
+        """
+        Creates an empty category vault if it does not exist yet.
+        """
+        with self.connection() as connection:
+            cursor = connection.execute("INSERT OR IGNORE INTO vaults (user, category) VALUES (?, ?)", (user, category))
+            return cursor.rowcount == 1
+
+    def listCategories(self, user: str) -> List[str]:
+        """
+        Lists the categories the user has vaults for.
+        """
+        rows = self.connection().execute("SELECT category FROM vaults WHERE user = ? ORDER BY category", (user,)).fetchall()
+        if not rows:
+            raise FileNotFoundError(f"No vaults found for user '{user}'.")
+        return [row[0] for row in rows]
+
+    def loadVault(self, user: str, category: str) -> dict:
+        """
+        Returns every entry of a category vault.
+        """
+        self.requireVault(user, category)
+        rows = self.connection().execute("SELECT url, entry FROM entries WHERE user = ? AND category = ?", (user, category))
+        return {url: json.loads(entry) for url, entry in rows}
+
+    def getEntry(self, user: str, category: str, url: str) -> Optional[dict]:
+        """
+        Returns the entry stored for a URL with a single primary key lookup.
+        """
+        row = self.connection().execute(
+            "SELECT entry FROM entries WHERE user = ? AND category = ? AND url = ?", (user, category, url)
+        ).fetchone()
+
+        if row is None:
+            self.requireVault(user, category)
+            return None
+
+        return json.loads(row[0])
+
+    def listUrls(self, user: str, category: str) -> List[str]:
+        """
+        Lists the URLs stored in a category vault.
+        """
+        self.requireVault(user, category)
+        rows = self.connection().execute("SELECT url FROM entries WHERE user = ? AND category = ?", (user, category))
+        return [row[0] for row in rows]
+
+    def getVaultHeader(self, user: str, category: str) -> Optional[dict]:
+        """
+        Returns the header of a category vault, or None if it has none.
+        """
+        self.requireVault(user, category)
+        row = self.connection().execute("SELECT header FROM vault_headers WHERE user = ? AND category = ?", (user, category)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def applyRecords(self, user: str, category: str, records: List[dict]) -> None:
+        """
+        Applies mutation records to a vault in a single transaction.
+        """
+        self.requireVault(user, category)
+
+        try:
+            with self.connection() as connection:
+                for record in records:
+                    if record["op"] == "put":
+                        connection.execute(
+                            "INSERT OR REPLACE INTO entries (user, category, url, entry) VALUES (?, ?, ?, ?)",
+                            (user, category, record["url"], json.dumps(record["entry"], separators=(",", ":")))
+                        )
+                    elif record["op"] == "del":
+                        connection.execute("DELETE FROM entries WHERE user = ? AND category = ? AND url = ?", (user, category, record["url"]))
+                    elif record["op"] == "header":
+                        connection.execute(
+                            "INSERT OR REPLACE INTO vault_headers (user, category, header) VALUES (?, ?, ?)",
+                            (user, category, json.dumps(record["header"], separators=(",", ":")))
+                        )
+        except sqlite3.Error as e:
+            raise OSError(f"Failed to write vault '{category}' of user '{user}': {str(e)}") from e
+
+    def close(self) -> None:
+        """
+        Closes the connection of the calling thread.
+        """
+        connection: Optional[sqlite3.Connection] = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
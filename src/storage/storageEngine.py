@@ -0,0 +1,130 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+class StorageEngine(ABC):
+    """
+    Interface every vault storage backend implements.
+    Vaults are identified by (user, category) and map URLs to entries such as {"username": ..., "password": ...}.
+    Mutations are expressed as records: {"op": "put", "url": ..., "entry": ...} or {"op": "del", "url": ...}.
+    A {"op": "header", "header": ...} record replaces the vault header, a small dictionary stored next to the entries
+    (e.g. the vault's wrapped data key).
+    """
+
+    @abstractmethod
+    def listUsers(self) -> List[str]:
+        """
+        Lists the users that have storage allocated.
+        """
+
+    @abstractmethod
+    def userExists(self, user: str) -> bool:
+        """
+        Checks whether the user has any storage allocated.
+        """
+
+    @abstractmethod
+    def vaultExists(self, user: str, category: str) -> bool:
+        """
+        Checks whether a category vault exists for the user.
+        """
+
+    @abstractmethod
+    def createVault(self, user: str, category: str) -> bool:
+        """
+        Creates an empty category vault if it does not exist yet.
+
+        :return: True if the vault was created, False if it already existed.
+        """
+
+    @abstractmethod
+    def listCategories(self, user: str) -> List[str]:
+        """
+        Lists the categories the user has vaults for.
+
+        :raises FileNotFoundError: If the user has no storage.
+        """
+
+    @abstractmethod
+    def loadVault(self, user: str, category: str) -> dict:
+        """
+        Returns every entry of a category vault.
+
+        :raises FileNotFoundError: If the vault does not exist.
+        """
+
+    @abstractmethod
+    def getEntry(self, user: str, category: str, url: str) -> Optional[dict]:
+        """
+        Returns the entry stored for a URL, or None if the URL is not in the vault.
+
+        :raises FileNotFoundError: If the vault does not exist.
+        """
+
+    @abstractmethod
+    def listUrls(self, user: str, category: str) -> List[str]:
+        """
+        Lists the URLs stored in a category vault.
+
+        :raises FileNotFoundError: If the vault does not exist.
+        """
+
+    @abstractmethod
+    def getVaultHeader(self, user: str, category: str) -> Optional[dict]:
+        """
+        Returns the header of a category vault, or None if it has none.
+
+        :raises FileNotFoundError: If the vault does not exist.
+        """
+
+    @abstractmethod
+    def applyRecords(self, user: str, category: str, records: List[dict]) -> None:
+        """
+        Applies mutation records to a vault as a single write.
+
+        :raises FileNotFoundError: If the vault does not exist.
+        """
+
+    def putEntry(self, user: str, category: str, url: str, entry: dict) -> None:
+        """
+        Stores or replaces the entry of a URL.
+        """
+        self.applyRecords(user, category, [{"op": "put", "url": url, "entry": entry}])
+
+    def deleteEntry(self, user: str, category: str, url: str) -> bool:
+        """
+        Removes the entry of a URL.
+
+        :return: True if an entry was removed.
+        """
+        if self.getEntry(user, category, url) is None:
+            return False
+
+        self.applyRecords(user, category, [{"op": "del", "url": url}])
+        return True
+
+    def setVaultHeader(self, user: str, category: str, header: dict) -> None:
+        """
+        Replaces the header of a category vault.
+
+        :raises FileNotFoundError: If the vault does not exist.
+        """
+        self.applyRecords(user, category, [{"op": "header", "header": header}])
+
+    def replaceVault(self, user: str, category: str, vaultData: dict, header: Optional[dict] = None) -> None:
+        """
+        Replaces the whole content of a vault as a single write, readers see either the old or the new content.
+
+        :param vaultData: Dictionary mapping URLs to the entries the vault holds from now on.
+        :param header: The new vault header, None keeps the current one.
+        :raises FileNotFoundError: If the vault does not exist.
+        """
+        records: List[dict] = [{"op": "del", "url": url} for url in self.listUrls(user, category) if url not in vaultData]
+        records.extend({"op": "put", "url": url, "entry": entry} for url, entry in vaultData.items())
+        if header is not None:
+            records.append({"op": "header", "header": header})
+        self.applyRecords(user, category, records)
+
+    def close(self) -> None:
+        """
+        Releases any resources held by the engine.
+        """
@@ -0,0 +1,9 @@
+import os
+
+class StoragePaths:
+    """
+    Locations of the application's persistent data, kept apart from the stores using them so a store can find
+    its directory without importing another store.
+    """
+
+    APPLICATION_STORAGE_DIR: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "commands", "vault", "ApplicationStorage")
@@ -0,0 +1,61 @@
+import os
+from typing import IO, Optional
+
+from storage.storagePaths import StoragePaths
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+class StoreLock:
+    """
+    Advisory lock on the application storage, shared by every server process and held exclusively by offline
+    maintenance such as key rotation, so the two never work on the same store at once.
+    The operating system releases the lock when its process exits, so a crash never leaves a stale lock behind.
+    Where only exclusive locks exist (Windows), a server holds the lock exclusively too.
+
+    Attributes:
+        path (str): The lock file.
+    """
+
+    LOCK_FILE: str = os.path.join(StoragePaths.APPLICATION_STORAGE_DIR, "store.lock")
+
+    def __init__(self, path: str = LOCK_FILE) -> None:
+        """
+        Initializes an unlocked lock.
+
+        :param path: The lock file, created when missing.
+        """
+        self.path = path
+        self.file: Optional[IO] = None
+
+    def acquire(self, exclusive: bool) -> bool:
+        """
+        Takes the lock without waiting.
+
+        :param exclusive: Whether no other process may hold the lock at all, rather than only no exclusive holder.
+        :return: True if the lock was taken, False if another process holds it in a conflicting mode.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lockFile = open(self.path, "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lockFile.fileno(), (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(lockFile.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lockFile.close()
+            return False
+
+        self.file = lockFile
+        return True
+
+    def release(self) -> None:
+        """
+        Releases the lock if it is held.
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,188 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+class UrlIndex:
+    """
+    Secondary index mapping, per user, every stored URL to the categories holding it.
+    A user's index is built from the vaults on first use and then kept current from the
+    mutation records VaultStorage reports, so looking a URL up never has to open a vault.
+    Only the most recently used users are kept in memory.
+    Subclasses can keep a richer structure per user by overriding createUserIndex, loadUserIndex, addUrl, removeUrl and lookup.
+
+    Attributes:
+        maxUsers (int): Maximum number of users whose index is kept in memory.
+        users (OrderedDict): user -> {url -> set of categories}, least recently used first.
+        building (dict): user -> one buffer per running build of that user's index, each collecting the
+                         mutations reported while that build reads the vaults.
+    """
+
+    MAX_USERS: int = 1024
+
+    def __init__(self, maxUsers: int = MAX_USERS) -> None:
+        """
+        Initializes an empty index.
+
+        :param maxUsers: Maximum number of users whose index is kept in memory.
+        """
+        self.lock = threading.Lock()
+        self.maxUsers = maxUsers
+        self.users: OrderedDict = OrderedDict()
+        self.building: Dict[str, List[List[Tuple[str, List[dict]]]]] = {}
+
+    def categoriesFor(self, user: str, url: str, loadUser: Callable[[str], Dict[str, List[str]]]) -> List[str]:
+        """
+        Returns the categories in which a URL is stored.
+
+        :param user: The username of the vault owner.
+        :param url: The URL to look up.
+        :param loadUser: Returns {category: [urls]} for a user, used to build a missing index.
+        :return: Sorted list of category names.
+        """
+        userIndex = self.userIndex(user, loadUser)
+        with self.lock:
+            return sorted(self.lookup(userIndex, url))
+
+    def userIndex(self, user: str, loadUser: Callable[[str], Dict[str, List[str]]]):
+        """
+        Returns the index of a user, building it if needed. It must only be read while holding the lock.
+
+        :param user: The username of the vault owner.
+        :param loadUser: Returns {category: [urls]} for a user.
+        :return: The user's index.
+        """
+        with self.lock:
+            userIndex = self.users.get(user)
+            if userIndex is not None:
+                self.users.move_to_end(user)
+                return userIndex
+
+        return self.build(user, loadUser)
+
+    def build(self, user: str, loadUser: Callable[[str], Dict[str, List[str]]]):
+        """
+        Builds the index of a user from its vaults. Mutations reported while the vaults are read
+        are replayed on top, so no write is missed. Every build has its own buffer, so concurrent builds of
+        the same user each replay all the mutations they may have missed.
+
+        :param user: The username of the vault owner.
+        :param loadUser: Returns {category: [urls]} for a user.
+        :return: The user's index.
+        """
+        missed: List[Tuple[str, List[dict]]] = []
+        with self.lock:
+            self.building.setdefault(user, []).append(missed)
+
+        userIndex = self.createUserIndex()
+        try:
+            self.loadUserIndex(userIndex, loadUser(user))
+        except Exception:
+            with self.lock:
+                self.stopBuilding(user, missed)
+            raise
+
+        with self.lock:
+            self.stopBuilding(user, missed)
+            for category, records in missed:
+                self.applyToUser(userIndex, category, records)
+
+            self.users[user] = userIndex
+            self.users.move_to_end(user)
+            while len(self.users) > self.maxUsers:
+                self.users.popitem(last=False)
+
+        return userIndex
+
+    def stopBuilding(self, user: str, missed: List[Tuple[str, List[dict]]]) -> None:
+        """
+        Unregisters the buffer of a finished build. Must be called while holding the lock.
+        """
+        buffers = self.building[user]
+        del buffers[next(i for i, buffer in enumerate(buffers) if buffer is missed)]
+        if not buffers:
+            del self.building[user]
+
+    def applyRecords(self, user: str, category: str, records: List[dict]) -> None:
+        """
+        Updates the index after mutation records were written to a vault.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param records: The mutation records that were written.
+        """
+        with self.lock:
+            for missed in self.building.get(user, []):
+                missed.append((category, records))
+
+            userIndex = self.users.get(user)
+            if userIndex is not None:
+                self.applyToUser(userIndex, category, records)
+
+    def applyToUser(self, userIndex, category: str, records: List[dict]) -> None:
+        """
+        Applies mutation records of one vault to a user's index.
+
+        :param userIndex: The user's index.
+        :param category: The vault category.
+        :param records: The mutation records.
+        """
+        for record in records:
+            if record["op"] == "put":
+                self.addUrl(userIndex, record["url"], category)
+            elif record["op"] == "del":
+                self.removeUrl(userIndex, record["url"], category)
+
+    def createUserIndex(self) -> Dict[str, Set[str]]:
+        """
+        Creates the empty index of a user, url -> set of categories.
+        """
+        return {}
+
+    def loadUserIndex(self, userIndex, vaultUrls: Dict[str, List[str]]) -> None:
+        """
+        Fills a freshly created user index with the URLs of every vault.
+
+        :param userIndex: The user's empty index.
+        :param vaultUrls: Dictionary mapping each category to its URLs.
+        """
+        for category, categoryUrls in vaultUrls.items():
+            for url in categoryUrls:
+                self.addUrl(userIndex, url, category)
+
+    def addUrl(self, userIndex: Dict[str, Set[str]], url: str, category: str) -> None:
+        """
+        Records that a category holds a URL.
+        """
+        userIndex.setdefault(url, set()).add(category)
+
+    def removeUrl(self, userIndex: Dict[str, Set[str]], url: str, category: str) -> None:
+        """
+        Records that a category no longer holds a URL.
+        """
+        categories: Optional[Set[str]] = userIndex.get(url)
+        if categories is not None:
+            categories.discard(category)
+            if not categories:
+                del userIndex[url]
+
+    def lookup(self, userIndex: Dict[str, Set[str]], url: str) -> Set[str]:
+        """
+        Returns the categories holding a URL.
+        """
+        return userIndex.get(url, set())
+
+    def invalidate(self, user: str) -> None:
+        """
+        Drops the index of a user, it is rebuilt on next use.
+
+        :param user: The username of the vault owner.
+        """
+        with self.lock:
+            self.users.pop(user, None)
+
+    def clear(self) -> None:
+        """
+        Drops the index of every user.
+        """
+        with self.lock:
+            self.users.clear()
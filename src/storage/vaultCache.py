@@ -0,0 +1,219 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+class VaultCache:
+    """
+    Process-wide, thread-safe LRU cache of decoded vault contents keyed by (user, category).
+    Entries are evicted least-recently-used first once their estimated size exceeds the memory budget.
+
+    Attributes:
+        maxBytes (int): Memory budget for the cached vaults.
+        currentBytes (int): Estimated memory used by the cached vaults.
+        hits (int): Lookups answered from memory.
+        misses (int): Lookups that had to go to disk.
+        evictions (int): Vaults dropped to stay within the budget.
+    """
+
+    DEFAULT_MAX_BYTES: int = 64 * 1024 * 1024
+    ENTRY_OVERHEAD: int = 256
+    VAULT_OVERHEAD: int = 512
+
+    def __init__(self, maxBytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Initializes an empty cache.
+
+        :param maxBytes: Memory budget for the cached vaults.
+        """
+        self.lock = threading.Lock()
+        self.vaults: "OrderedDict[Tuple[str, str], Tuple[dict, int]]" = OrderedDict()
+        self.maxBytes: int = maxBytes
+        self.currentBytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    @staticmethod
+    def estimateEntrySize(url: str, entry) -> int:
+        """
+        Estimates the memory held by a single decoded entry.
+
+        :param url: The URL of the entry.
+        :param entry: The stored entry.
+        :return: Approximate size in bytes.
+        """
+        size: int = len(url) + VaultCache.ENTRY_OVERHEAD
+        if isinstance(entry, dict):
+            size += sum(len(str(value)) for value in entry.values())
+        return size
+
+    @staticmethod
+    def estimateSize(vaultData: dict) -> int:
+        """
+        Estimates the memory held by a decoded vault.
+
+        :param vaultData: Dictionary mapping URLs to their stored entries.
+        :return: Approximate size in bytes.
+        """
+        return VaultCache.VAULT_OVERHEAD + sum(VaultCache.estimateEntrySize(url, entry) for url, entry in vaultData.items())
+
+    def get(self, user: str, category: str) -> Optional[dict]:
+        """
+        Returns a copy of a cached vault and marks it as recently used.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :return: Shallow copy of the vault contents, or None if the vault is not cached.
+        """
+        with self.lock:
+            cached = self.vaults.get((user, category))
+            if cached is None:
+                self.misses += 1
+                return None
+
+            self.vaults.move_to_end((user, category))
+            self.hits += 1
+            return dict(cached[0])
+
+    def lookup(self, user: str, category: str, url: str) -> Tuple[bool, Optional[dict]]:
+        """
+        Looks up a single entry without copying the vault.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param url: The URL of the entry.
+        :return: (whether the vault is cached, copy of the entry or None if the URL is not in the vault).
+        """
+        with self.lock:
+            cached = self.vaults.get((user, category))
+            if cached is None:
+                self.misses += 1
+                return False, None
+
+            self.vaults.move_to_end((user, category))
+            self.hits += 1
+            entry = cached[0].get(url)
+            return True, dict(entry) if entry is not None else None
+
+    def listUrls(self, user: str, category: str) -> Optional[list]:
+        """
+        Lists the URLs of a cached vault.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :return: List of URLs, or None if the vault is not cached.
+        """
+        with self.lock:
+            cached = self.vaults.get((user, category))
+            if cached is None:
+                self.misses += 1
+                return None
+
+            self.vaults.move_to_end((user, category))
+            self.hits += 1
+            return list(cached[0].keys())
+
+    def updateEntry(self, user: str, category: str, url: str, entry: Optional[dict]) -> None:
+        """
+        Applies a single written mutation to a cached vault, if it is cached.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param url: The URL of the entry.
+        :param entry: The new entry, or None if the entry was deleted.
+        """
+        with self.lock:
+            cached = self.vaults.get((user, category))
+            if cached is None:
+                return
+
+            vaultData, size = cached
+            previous = vaultData.pop(url, None)
+            if previous is not None:
+                size -= VaultCache.estimateEntrySize(url, previous)
+            if entry is not None:
+                vaultData[url] = dict(entry)
+                size += VaultCache.estimateEntrySize(url, entry)
+
+            self.currentBytes += size - cached[1]
+            self.vaults[(user, category)] = (vaultData, size)
+
+            while self.currentBytes > self.maxBytes and self.vaults:
+                _, (_, evictedSize) = self.vaults.popitem(last=False)
+                self.currentBytes -= evictedSize
+                self.evictions += 1
+
+    def contains(self, user: str, category: str) -> bool:
+        """
+        Checks whether a vault is cached, without counting a hit or miss.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :return: True if the vault is cached.
+        """
+        with self.lock:
+            return (user, category) in self.vaults
+
+    def put(self, user: str, category: str, vaultData: dict) -> None:
+        """
+        Stores the current contents of a vault, evicting the least recently used vaults if over budget.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param vaultData: Dictionary mapping URLs to their stored entries.
+        """
+        size: int = VaultCache.estimateSize(vaultData)
+
+        with self.lock:
+            previous = self.vaults.pop((user, category), None)
+            if previous is not None:
+                self.currentBytes -= previous[1]
+
+            if size > self.maxBytes:
+                return
+
+            self.vaults[(user, category)] = (dict(vaultData), size)
+            self.currentBytes += size
+
+            while self.currentBytes > self.maxBytes:
+                _, (_, evictedSize) = self.vaults.popitem(last=False)
+                self.currentBytes -= evictedSize
+                self.evictions += 1
+
+    def invalidate(self, user: str, category: Optional[str] = None) -> None:
+        """
+        Drops one vault, or every vault of a user, from the cache.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category, or None for all of the user's vaults.
+        """
+        with self.lock:
+            keys = [key for key in self.vaults if key[0] == user and (category is None or key[1] == category)]
+            for key in keys:
+                self.currentBytes -= self.vaults.pop(key)[1]
+
+    def clear(self) -> None:
+        """
+        Empties the cache and resets its counters.
+        """
+        with self.lock:
+            self.vaults.clear()
+            self.currentBytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters.
+
+        :return: Dictionary with hits, misses, evictions, cached vault count and estimated bytes.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "vaults": len(self.vaults),
+                "bytes": self.currentBytes
+            }
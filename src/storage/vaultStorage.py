@@ -0,0 +1,585 @@
+import os
+import bisect
+import weakref
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from storage.vaultCache import VaultCache
+from storage.storageEngine import StorageEngine
+from storage.logStore import LogStore
+from storage.sqliteStore import SqliteStore
+from storage.readWriteLock import LockStats, ReadWriteLock
+from storage.urlIndex import UrlIndex
+from storage.searchIndex import SearchIndex
+from storage.sortedIndex import SortedIndex
+from storage.storagePaths import StoragePaths
+
+class VaultBatch:
+    """
+    Unit of work used while a batch of commands is executed.
+    Every vault is loaded at most once and the mutations of each vault are appended with a single write when the batch ends.
+
+    Attributes:
+        vaults (dict): Loaded vault contents keyed by (user, category), including the batch's own changes.
+        pending (dict): Mutation records waiting to be written, keyed by (user, category).
+        loads (int): Number of vaults loaded.
+        writes (int): Number of vault writes performed.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty batch.
+        """
+        self.vaults: Dict[Tuple[str, str], dict] = {}
+        self.pending: Dict[Tuple[str, str], List[dict]] = {}
+        self.loads: int = 0
+        self.writes: int = 0
+
+    def flush(self) -> None:
+        """
+        Writes the pending mutations of every modified vault.
+        Only the mutation records are written, so changes other threads made since the vault was loaded are kept.
+        """
+        for user, category in sorted(self.pending):
+            VaultStorage.writeRecords(user, category, self.pending[(user, category)])
+            self.writes += 1
+        self.pending.clear()
+
+class VaultStorage:
+    """
+    Single access point for the category vaults of every user.
+    Commands read and write vault entries through this class, which forwards them to the configured
+    StorageEngine ("file": log-structured files, "sqlite": a single SQLite database).
+    Decoded vaults are kept in a process-wide LRU cache and every write goes to the engine first and then to the cache.
+    Every vault has a reader-writer lock: reads of the same vault run in parallel, writes are serialized,
+    and lockVault() lets a command hold the write lock across a whole read-modify-write cycle.
+    Secondary indexes (e.g. the URL -> categories index) are registered with registerIndex() and are
+    told about every mutation record once it has been written.
+    """
+
+    APPLICATION_STORAGE_DIR: str = StoragePaths.APPLICATION_STORAGE_DIR
+    VAULTS_DIR: str = os.path.join(APPLICATION_STORAGE_DIR, "account_vaults")
+    DATABASE_PATH: str = os.path.join(APPLICATION_STORAGE_DIR, "vaults.db")
+    ENGINES: tuple = ("file", "sqlite")
+
+    batchState = threading.local()
+    cache = VaultCache()
+    engine: Optional[StorageEngine] = None
+    engineLock = threading.Lock()
+
+    lockStats = LockStats()
+    vaultLocks: "weakref.WeakValueDictionary[Tuple[str, str], ReadWriteLock]" = weakref.WeakValueDictionary()
+    vaultLocksGuard = threading.Lock()
+
+    urlIndex = UrlIndex()
+    searchIndex = SearchIndex()
+    sortedIndex = SortedIndex()
+    indexes: list = [urlIndex, searchIndex, sortedIndex]
+
+    @staticmethod
+    def createEngine(name: str) -> StorageEngine:
+        """
+        Creates a storage engine by name.
+
+        :param name: "file" or "sqlite".
+        :return: The storage engine.
+        """
+        if name == "file":
+            return LogStore(VaultStorage.VAULTS_DIR)
+        if name == "sqlite":
+            return SqliteStore(VaultStorage.DATABASE_PATH)
+
+        raise ValueError(f"Unknown storage engine '{name}', expected one of: {', '.join(VaultStorage.ENGINES)}")
+
+    @staticmethod
+    def getEngine() -> StorageEngine:
+        """
+        Returns the storage engine, creating the default file engine on first use unless useEngine chose one,
+        so importing this module never touches the disk.
+
+        :return: The storage engine.
+        """
+        engine: Optional[StorageEngine] = VaultStorage.engine
+        if engine is not None:
+            return engine
+
+        with VaultStorage.engineLock:
+            if VaultStorage.engine is None:
+                VaultStorage.engine = VaultStorage.createEngine("file")
+            return VaultStorage.engine
+
+    @staticmethod
+    def useEngine(engine: StorageEngine) -> None:
+        """
+        Switches every vault operation to another storage engine.
+
+        :param engine: The engine to use from now on.
+        """
+        with VaultStorage.engineLock:
+            VaultStorage.engine = engine
+        VaultStorage.cache.clear()
+        for index in VaultStorage.indexes:
+            index.clear()
+
+    @staticmethod
+    def registerIndex(index) -> None:
+        """
+        Registers a secondary index to be kept current on every vault mutation.
+
+        :param index: Object with applyRecords(user, category, records), invalidate(user) and clear() methods.
+        """
+        VaultStorage.indexes.append(index)
+
+    @staticmethod
+    def vaultLock(user: str, category: str) -> ReadWriteLock:
+        """
+        Returns the reader-writer lock of a vault. Locks are created on demand and dropped once unused.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :return: The lock guarding the vault.
+        """
+        with VaultStorage.vaultLocksGuard:
+            lock: Optional[ReadWriteLock] = VaultStorage.vaultLocks.get((user, category))
+            if lock is None:
+                lock = ReadWriteLock(VaultStorage.lockStats)
+                VaultStorage.vaultLocks[(user, category)] = lock
+            return lock
+
+    @staticmethod
+    @contextmanager
+    def lockVault(user: str, category: str) -> Iterator[None]:
+        """
+        Holds the write lock of a vault for the duration of the block, so a read followed by a write
+        cannot interleave with another thread's update of the same vault.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        """
+        with VaultStorage.vaultLock(user, category).writing():
+            yield
+
+    @staticmethod
+    def lockStatistics() -> dict:
+        """
+        Returns how often and how long threads waited for vault locks.
+        """
+        return VaultStorage.lockStats.snapshot()
+
+    @staticmethod
+    def listUsers() -> List[str]:
+        """
+        Lists the users that have vault storage.
+
+        :return: List of usernames.
+        """
+        return VaultStorage.getEngine().listUsers()
+
+    @staticmethod
+    def userExists(user: str) -> bool:
+        """
+        Checks whether the user has any vault storage.
+
+        :param user: The username of the vault owner.
+        :return: True if the user has storage.
+        """
+        return VaultStorage.getEngine().userExists(user)
+
+    @staticmethod
+    def vaultExists(user: str, category: str) -> bool:
+        """
+        Checks whether a category vault exists for the user.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :return: True if the vault exists.
+        """
+        batch = VaultStorage.currentBatch()
+        if batch is not None and (user, category) in batch.vaults:
+            return True
+
+        if VaultStorage.cache.contains(user, category):
+            return True
+
+        return VaultStorage.getEngine().vaultExists(user, category)
+
+    @staticmethod
+    def createVault(user: str, category: str) -> bool:
+        """
+        Creates an empty category vault if it does not exist yet.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :return: True if the vault was created, False if it already existed.
+        """
+        if VaultStorage.vaultExists(user, category):
+            return False
+
+        created: bool = VaultStorage.getEngine().createVault(user, category)
+        if created:
+            VaultStorage.cache.put(user, category, {})
+        return created
+
+    @staticmethod
+    def listCategories(user: str) -> List[str]:
+        """
+        Lists the categories the user has vaults for.
+
+        :param user: The username of the vault owner.
+        :return: List of category names.
+        """
+        return VaultStorage.getEngine().listCategories(user)
+
+    @staticmethod
+    def loadVault(user: str, category: str) -> dict:
+        """
+        Loads all entries of a category vault, from the cache when possible.
+        Inside a batch the vault is only loaded once.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :return: Dictionary mapping URLs to their stored entries. Changing it does not change the vault.
+        :raises FileNotFoundError: If the vault does not exist.
+        :raises json.JSONDecodeError: If a legacy vault file is corrupted.
+        """
+        batch = VaultStorage.currentBatch()
+        if batch is not None and (user, category) in batch.vaults:
+            return dict(batch.vaults[(user, category)])
+
+        with VaultStorage.vaultLock(user, category).reading():
+            vaultData: Optional[dict] = VaultStorage.cache.get(user, category)
+
+            if vaultData is None:
+                vaultData = VaultStorage.getEngine().loadVault(user, category)
+                VaultStorage.cache.put(user, category, vaultData)
+
+        if batch is not None:
+            batch.vaults[(user, category)] = vaultData
+            batch.loads += 1
+            return dict(vaultData)
+
+        return vaultData
+
+    @staticmethod
+    def getEntry(user: str, category: str, url: str) -> Optional[dict]:
+        """
+        Returns the entry stored for a URL in a category vault.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param url: The URL of the entry.
+        :return: The stored entry, or None if the URL is not in the vault.
+        :raises FileNotFoundError: If the vault does not exist.
+        """
+        batch = VaultStorage.currentBatch()
+        if batch is not None and (user, category) in batch.vaults:
+            entry = batch.vaults[(user, category)].get(url)
+            return dict(entry) if entry is not None else None
+
+        with VaultStorage.vaultLock(user, category).reading():
+            isCached, entry = VaultStorage.cache.lookup(user, category, url)
+            if isCached:
+                return entry
+
+            return VaultStorage.getEngine().getEntry(user, category, url)
+
+    @staticmethod
+    def listUrls(user: str, category: str) -> List[str]:
+        """
+        Lists the URLs stored in a category vault.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :return: List of URLs.
+        :raises FileNotFoundError: If the vault does not exist.
+        """
+        batch = VaultStorage.currentBatch()
+        if batch is not None and (user, category) in batch.vaults:
+            return list(batch.vaults[(user, category)].keys())
+
+        with VaultStorage.vaultLock(user, category).reading():
+            urls: Optional[list] = VaultStorage.cache.listUrls(user, category)
+            if urls is not None:
+                return urls
+
+            return VaultStorage.getEngine().listUrls(user, category)
+
+    @staticmethod
+    def pageUrls(user: str, category: str, after: Optional[str], limit: int) -> Tuple[List[str], bool]:
+        """
+        Returns one page of the URLs of a category vault in sorted order, from the sorted index.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param after: The last URL of the previous page, or None for the first page.
+        :param limit: Maximum number of URLs to return.
+        :return: (URLs of the page, whether more URLs follow).
+        :raises FileNotFoundError: If the vault does not exist.
+        """
+        if not VaultStorage.vaultExists(user, category):
+            raise FileNotFoundError(f"Vault '{category}' does not exist for user '{user}'.")
+
+        batch = VaultStorage.currentBatch()
+        if batch is not None and (user, category) in batch.vaults:
+            urls: List[str] = sorted(batch.vaults[(user, category)])
+            start: int = 0 if after is None else bisect.bisect_right(urls, after)
+            return urls[start:start + limit], start + limit < len(urls)
+
+        return VaultStorage.sortedIndex.page(user, category, after, limit, VaultStorage.listUserUrls)
+
+    @staticmethod
+    def putEntry(user: str, category: str, url: str, entry: dict) -> None:
+        """
+        Stores or replaces the entry of a URL. Inside a batch the write is deferred until the batch ends.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param url: The URL of the entry.
+        :param entry: The entry to store, e.g. {"username": ..., "password": ...}.
+        """
+        VaultStorage.applyRecords(user, category, [{"op": "put", "url": url, "entry": dict(entry)}])
+
+    @staticmethod
+    def deleteEntry(user: str, category: str, url: str) -> bool:
+        """
+        Removes the entry of a URL. Inside a batch the write is deferred until the batch ends.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param url: The URL of the entry.
+        :return: True if an entry was removed.
+        """
+        with VaultStorage.lockVault(user, category):
+            if VaultStorage.getEntry(user, category, url) is None:
+                return False
+
+            VaultStorage.applyRecords(user, category, [{"op": "del", "url": url}])
+            return True
+
+    @staticmethod
+    def applyRecords(user: str, category: str, records: List[dict]) -> None:
+        """
+        Applies mutation records to a vault, or queues them when a batch is active.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param records: The mutation records to apply.
+        """
+        batch = VaultStorage.currentBatch()
+        if batch is None:
+            VaultStorage.writeRecords(user, category, records)
+            return
+
+        VaultStorage.loadVault(user, category)
+        vaultData: dict = batch.vaults[(user, category)]
+        for record in records:
+            VaultStorage.applyRecord(vaultData, record)
+        batch.pending.setdefault((user, category), []).extend(records)
+
+    @staticmethod
+    def applyRecord(vaultData: dict, record: dict) -> None:
+        """
+        Applies a single mutation record to a decoded vault.
+
+        :param vaultData: Dictionary mapping URLs to their stored entries.
+        :param record: The mutation record.
+        """
+        if record["op"] == "put":
+            vaultData[record["url"]] = record["entry"]
+        elif record["op"] == "del":
+            vaultData.pop(record["url"], None)
+
+    @staticmethod
+    def writeRecords(user: str, category: str, records: List[dict]) -> None:
+        """
+        Appends mutation records to the vault on disk and then refreshes the cached copy, under the vault's write lock.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param records: The mutation records to append.
+        """
+        with VaultStorage.lockVault(user, category):
+            try:
+                VaultStorage.getEngine().applyRecords(user, category, records)
+            except OSError:
+                VaultStorage.discardCached(user, category)
+                raise
+
+            for record in records:
+                if record["op"] in ("put", "del"):
+                    VaultStorage.cache.updateEntry(user, category, record["url"], record.get("entry") if record["op"] == "put" else None)
+
+            for index in VaultStorage.indexes:
+                index.applyRecords(user, category, records)
+
+    @staticmethod
+    def getVaultHeader(user: str, category: str) -> Optional[dict]:
+        """
+        Returns the header of a category vault, e.g. its wrapped data key.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :return: The header, or None if the vault has none.
+        :raises FileNotFoundError: If the vault does not exist.
+        """
+        with VaultStorage.vaultLock(user, category).reading():
+            return VaultStorage.getEngine().getVaultHeader(user, category)
+
+    @staticmethod
+    def setVaultHeader(user: str, category: str, header: dict) -> None:
+        """
+        Replaces the header of a category vault. The header is written right away, even inside a batch,
+        so it always reaches the disk before entries depending on it. Headers are neither cached nor indexed.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param header: The new header.
+        :raises FileNotFoundError: If the vault does not exist.
+        """
+        with VaultStorage.lockVault(user, category):
+            VaultStorage.getEngine().setVaultHeader(user, category, header)
+
+    @staticmethod
+    def replaceVault(user: str, category: str, vaultData: dict, header: Optional[dict] = None) -> None:
+        """
+        Atomically replaces the whole content of a vault under the vault's write lock, then refreshes the cache and the indexes.
+        Must not be called inside a batch.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        :param vaultData: Dictionary mapping URLs to the entries the vault holds from now on.
+        :param header: The new vault header, written together with the entries; None keeps the current one.
+        :raises FileNotFoundError: If the vault does not exist.
+        """
+        with VaultStorage.lockVault(user, category):
+            removedUrls: List[str] = [url for url in VaultStorage.listUrls(user, category) if url not in vaultData]
+
+            try:
+                VaultStorage.getEngine().replaceVault(user, category, vaultData, header)
+            except OSError:
+                VaultStorage.discardCached(user, category)
+                raise
+
+            VaultStorage.cache.put(user, category, dict(vaultData))
+
+            records: List[dict] = [{"op": "del", "url": url} for url in removedUrls]
+            records.extend({"op": "put", "url": url, "entry": entry} for url, entry in vaultData.items())
+            for index in VaultStorage.indexes:
+                index.applyRecords(user, category, records)
+
+    @staticmethod
+    def discardCached(user: str, category: str) -> None:
+        """
+        Drops the cached copy of a vault and the indexes of its owner after a failed write.
+
+        :param user: The username of the vault owner.
+        :param category: The vault category.
+        """
+        VaultStorage.cache.invalidate(user, category)
+        for index in VaultStorage.indexes:
+            index.invalidate(user)
+
+    @staticmethod
+    def findCategories(user: str, url: str) -> List[str]:
+        """
+        Returns the categories holding an entry for a URL, using the URL index instead of opening every vault.
+        Inside a batch the batch's own pending changes are taken into account.
+
+        :param user: The username of the vault owner.
+        :param url: The URL of the entry.
+        :return: Sorted list of category names.
+        """
+        categories: set = set(VaultStorage.urlIndex.categoriesFor(user, url, VaultStorage.listUserUrls))
+
+        batch = VaultStorage.currentBatch()
+        if batch is not None:
+            for (vaultUser, category), vaultData in batch.vaults.items():
+                if vaultUser != user:
+                    continue
+                if url in vaultData:
+                    categories.add(category)
+                else:
+                    categories.discard(category)
+
+        return sorted(categories)
+
+    @staticmethod
+    def searchUrls(user: str, pattern: str, offset: int = 0, limit: int = 20) -> Tuple[List[Tuple[str, List[str]]], bool]:
+        """
+        Searches the URLs of every vault of a user by prefix, substring and approximate match.
+
+        :param user: The username of the vault owner.
+        :param pattern: The text to look for.
+        :param offset: Number of ranked results to skip.
+        :param limit: Maximum number of results to return.
+        :return: ([(url, categories holding it)] for the requested page, whether more results follow).
+        """
+        return VaultStorage.searchIndex.search(user, pattern, VaultStorage.listUserUrls, offset, limit)
+
+    @staticmethod
+    def listUserUrls(user: str) -> Dict[str, List[str]]:
+        """
+        Lists the URLs of every vault of a user, skipping vaults that cannot be read.
+
+        :param user: The username of the vault owner.
+        :return: Dictionary mapping each category to its URLs.
+        """
+        if not VaultStorage.userExists(user):
+            return {}
+
+        urls: Dict[str, List[str]] = {}
+        for category in VaultStorage.listCategories(user):
+            try:
+                urls[category] = VaultStorage.listUrls(user, category)
+            except (ValueError, FileNotFoundError):
+                continue
+        return urls
+
+    @staticmethod
+    def warmCache(user: str) -> None:
+        """
+        Loads every vault of a user into the cache, so their reads are served from memory.
+
+        :param user: The username of the vault owner.
+        """
+        if not VaultStorage.userExists(user):
+            return
+
+        for category in VaultStorage.listCategories(user):
+            if VaultStorage.cache.contains(user, category):
+                continue
+            try:
+                VaultStorage.loadVault(user, category)
+            except (ValueError, FileNotFoundError):
+                continue
+
+    @staticmethod
+    def currentBatch() -> Optional[VaultBatch]:
+        """
+        Returns the batch active on the calling thread, if any.
+        """
+        return getattr(VaultStorage.batchState, "batch", None)
+
+    @staticmethod
+    @contextmanager
+    def batch() -> Iterator[VaultBatch]:
+        """
+        Groups vault access on the calling thread: each vault is loaded once and written once on exit.
+        Nested calls join the outer batch.
+
+        :return: The active VaultBatch.
+        """
+        outerBatch = VaultStorage.currentBatch()
+        if outerBatch is not None:
+            yield outerBatch
+            return
+
+        batch = VaultBatch()
+        VaultStorage.batchState.batch = batch
+        try:
+            yield batch
+        finally:
+            VaultStorage.batchState.batch = None
+
+        batch.flush()
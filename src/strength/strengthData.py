@@ -0,0 +1,198 @@
+import os
+import sys
+import json
+import struct
+import bisect
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+class StrengthData:
+    """
+    Dictionaries and keyboard adjacency graphs of the strength estimator, in a precompiled form that loads
+    with a single read and a split.
+
+    Every dictionary word is lowercased and merged into one sorted word array, with parallel arrays holding the
+    word's frequency rank (1 = most common) and the dictionary it comes from; a word found in several dictionaries
+    keeps its best rank. Looking a word up, or testing whether any word starts with a prefix, is a binary search.
+
+    Compiled layout, little-endian:
+        header: magic, version, dictionary count, word count, word blob size, graph blob size
+        dictionary names: one length-prefixed UTF-8 string each, in id order
+        words: the sorted words joined by newlines
+        ranks: one uint32 per word
+        dictionary ids: one byte per word
+        graphs: JSON object, graph name -> key -> neighbours in direction order (null where there is no key)
+
+    Attributes:
+        dictionaryNames (list): Dictionary name by id.
+        words (list): The sorted words.
+        ranks (array): Rank of each word.
+        dictionaryIds (bytes): Dictionary id of each word.
+        graphs (dict): Graph name -> adjacency of every key.
+    """
+
+    MAGIC: bytes = b"PVSD"
+    VERSION: int = 1
+    HEADER = struct.Struct("<4sHHIII")
+    SOURCE_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+    COMPILED_PATH: str = os.path.join(SOURCE_DIR, "strength.bin")
+    DICTIONARIES: Tuple[str, ...] = ("passwords", "english", "names")
+
+    QWERTY: str = """
+`~ 1! 2@ 3# 4$ 5% 6^ 7& 8* 9( 0) -_ =+
+    qQ wW eE rR tT yY uU iI oO pP [{ ]} \\|
+     aA sS dD fF gG hH jJ kK lL ;: '"
+      zZ xX cC vV bB nN mM ,< .> /?
+"""
+
+    KEYPAD: str = """
+  / * -
+7 8 9 +
+4 5 6
+1 2 3
+  0 .
+"""
+
+    def __init__(self, dictionaryNames: List[str], words: List[str], ranks: array, dictionaryIds: bytes, graphs: Dict[str, dict]) -> None:
+        """
+        Initializes the data from its decoded parts.
+        """
+        self.dictionaryNames = dictionaryNames
+        self.words = words
+        self.ranks = ranks
+        self.dictionaryIds = dictionaryIds
+        self.graphs = graphs
+
+    @staticmethod
+    def buildGraph(layout: str, slanted: bool) -> dict:
+        """
+        Builds the adjacency graph of a keyboard layout, zxcvbn style: every key maps to its neighbours in a fixed
+        direction order, so a pattern's change of direction can be counted as a turn.
+
+        :param layout: Rows of space separated key tokens, each token holding the unshifted and shifted character.
+        :param slanted: True for a staggered keyboard (6 neighbours), False for an aligned keypad (8 neighbours).
+        :return: Character -> list of neighbour tokens, None where a direction has no key.
+        """
+        positions: Dict[Tuple[int, int], str] = {}
+        for y, row in enumerate(line for line in layout.split("\n") if line.strip()):
+            if slanted:
+                for x, token in enumerate(row.split()):
+                    positions[(x + (1 if y > 0 else 0), y)] = token
+            else:
+                for column in range(0, len(row), 2):
+                    token = row[column:column + 1].strip()
+                    if token:
+                        positions[(column // 2, y)] = token
+
+        if slanted:
+            directions = [(-1, 0), (0, -1), (1, -1), (1, 0), (0, 1), (-1, 1)]
+        else:
+            directions = [(-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1)]
+
+        graph: dict = {}
+        for (x, y), token in positions.items():
+            neighbours = [positions.get((x + dx, y + dy)) for dx, dy in directions]
+            for character in token:
+                graph[character] = neighbours
+        return graph
+
+    @staticmethod
+    def compile(sourceDirectory: str = SOURCE_DIR) -> bytes:
+        """
+        Compiles the rank-ordered word lists (<name>.txt, most common first) and the keyboard layouts.
+
+        :param sourceDirectory: Directory holding the word lists.
+        :return: The compiled data.
+        """
+        best: Dict[str, Tuple[int, int]] = {}
+        for dictionaryId, name in enumerate(StrengthData.DICTIONARIES):
+            with open(os.path.join(sourceDirectory, f"{name}.txt"), encoding="utf-8") as source:
+                rank: int = 0
+                for line in source:
+                    word: str = line.strip().lower()
+                    if not word:
+                        continue
+                    rank += 1
+                    if word not in best or rank < best[word][0]:
+                        best[word] = (rank, dictionaryId)
+
+        words: List[str] = sorted(best)
+        ranks = array("I", (best[word][0] for word in words))
+        if sys.byteorder == "big":
+            ranks.byteswap()
+        wordBlob: bytes = "\n".join(words).encode("utf-8")
+        graphBlob: bytes = json.dumps({
+            "qwerty": StrengthData.buildGraph(StrengthData.QWERTY, slanted=True),
+            "keypad": StrengthData.buildGraph(StrengthData.KEYPAD, slanted=False),
+        }, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+        names: bytes = b"".join(bytes([len(name)]) + name.encode("utf-8") for name in StrengthData.DICTIONARIES)
+        header: bytes = StrengthData.HEADER.pack(StrengthData.MAGIC, StrengthData.VERSION, len(StrengthData.DICTIONARIES),
+                                                 len(words), len(wordBlob), len(graphBlob))
+        return header + names + wordBlob + ranks.tobytes() + bytes(best[word][1] for word in words) + graphBlob
+
+    @staticmethod
+    def parse(buffer: bytes) -> "StrengthData":
+        """
+        Decodes compiled data.
+
+        :param buffer: Output of compile.
+        :return: The data.
+        :raises ValueError: If the buffer is not compiled strength data of this version.
+        """
+        try:
+            magic, version, dictionaryCount, wordCount, wordBlobSize, graphBlobSize = StrengthData.HEADER.unpack_from(buffer, 0)
+        except struct.error:
+            raise ValueError("Truncated strength data.")
+        if magic != StrengthData.MAGIC or version != StrengthData.VERSION:
+            raise ValueError("Unsupported strength data.")
+
+        offset: int = StrengthData.HEADER.size
+        dictionaryNames: List[str] = []
+        for _ in range(dictionaryCount):
+            length: int = buffer[offset]
+            dictionaryNames.append(buffer[offset + 1:offset + 1 + length].decode("utf-8"))
+            offset += 1 + length
+
+        words: List[str] = buffer[offset:offset + wordBlobSize].decode("utf-8").split("\n") if wordCount else []
+        offset += wordBlobSize
+        ranks = array("I")
+        ranks.frombytes(buffer[offset:offset + 4 * wordCount])
+        if sys.byteorder == "big":
+            ranks.byteswap()
+        offset += 4 * wordCount
+        dictionaryIds: bytes = bytes(buffer[offset:offset + wordCount])
+        offset += wordCount
+        graphs: dict = json.loads(buffer[offset:offset + graphBlobSize].decode("utf-8"))
+
+        if len(words) != wordCount or len(ranks) != wordCount or len(dictionaryIds) != wordCount:
+            raise ValueError("Truncated strength data.")
+        return StrengthData(dictionaryNames, words, ranks, dictionaryIds, graphs)
+
+    @staticmethod
+    def load(path: str = COMPILED_PATH) -> "StrengthData":
+        """
+        Loads compiled data, compiling the word lists in memory when no compiled file exists.
+
+        :param path: The compiled file.
+        :return: The data.
+        """
+        try:
+            with open(path, "rb") as compiled:
+                return StrengthData.parse(compiled.read())
+        except FileNotFoundError:
+            return StrengthData.parse(StrengthData.compile(os.path.dirname(path)))
+
+    def lookup(self, word: str) -> Tuple[int, Optional[str]]:
+        """
+        Finds a lowercase word, and tells whether longer words start with it.
+
+        :param word: The lowercase word.
+        :return: Its rank (0 if it is no dictionary word, -1 if no word even starts with it) and dictionary name.
+        """
+        index: int = bisect.bisect_left(self.words, word)
+        if index == len(self.words) or not self.words[index].startswith(word):
+            return -1, None
+        if self.words[index] != word:
+            return 0, None
+        return self.ranks[index], self.dictionaryNames[self.dictionaryIds[index]]
@@ -0,0 +1,409 @@
+import re
+import math
+import datetime
+import threading
+from typing import Dict, List, Optional
+
+from strength.strengthData import StrengthData
+
+class PatternMatch:
+    """
+    A guessable pattern found in a password.
+
+    Attributes:
+        pattern (str): "dictionary", "spatial", "repeat", "sequence", "date" or "bruteforce".
+        i (int): Index of the first character of the match.
+        j (int): Index of the last character of the match.
+        token (str): The matched part of the password.
+        guesses (float): Guesses an attacker needs for this part.
+        detail (str): The dictionary, keyboard or sequence name, empty where it does not apply.
+    """
+
+    def __init__(self, pattern: str, i: int, j: int, token: str, guesses: float, detail: str = "") -> None:
+        """
+        Initializes a match.
+        """
+        self.pattern = pattern
+        self.i = i
+        self.j = j
+        self.token = token
+        self.guesses = guesses
+        self.detail = detail
+
+class StrengthEstimate:
+    """
+    The estimated strength of a password.
+
+    Attributes:
+        guesses (float): Estimated number of guesses needed to find the password.
+        score (int): 0 (too guessable) to 4 (very unguessable).
+        sequence (list): The matches making up the cheapest way to guess the password.
+        warning (str): Why the password is weak, empty for strong ones.
+    """
+
+    def __init__(self, guesses: float, score: int, sequence: List[PatternMatch], warning: str) -> None:
+        """
+        Initializes an estimate.
+        """
+        self.guesses = guesses
+        self.score = score
+        self.sequence = sequence
+        self.warning = warning
+
+class StrengthEstimator:
+    """
+    Local, zxcvbn-style password strength estimator.
+    The password is scanned for dictionary words (also in l33t speak), keyboard patterns, repeats, sequences
+    and dates; every match gets the number of guesses an attacker trying that kind of pattern needs, and the
+    estimate is the cheapest way of covering the whole password with matches and brute-forced characters.
+    The dictionaries and keyboard graphs are loaded from their precompiled file on the first estimate.
+    """
+
+    BRUTEFORCE_CARDINALITY: int = 10
+    MIN_SUBMATCH_GUESSES_SINGLE_CHAR: int = 10
+    MIN_SUBMATCH_GUESSES_MULTI_CHAR: int = 50
+    MIN_YEAR_SPACE: int = 20
+    REFERENCE_YEAR: int = datetime.date.today().year
+    SCORE_GUESSES: tuple = (1e3, 1e6, 1e8, 1e10)
+    WEAK_SCORE: int = 3
+    MAX_LENGTH: int = 100
+
+    L33T_TABLE: Dict[str, str] = {"4": "a", "@": "a", "8": "b", "(": "c", "3": "e", "6": "g", "1": "i", "!": "i",
+                                  "|": "l", "0": "o", "$": "s", "5": "s", "7": "t", "+": "t", "2": "z"}
+    REPEAT_GREEDY = re.compile(r"(.+)\1+")
+    REPEAT_LAZY = re.compile(r"(.+?)\1+")
+    REPEAT_LAZY_ANCHORED = re.compile(r"^(.+?)\1+$")
+    DATE_WITH_SEPARATOR = re.compile(r"^(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})$")
+    DIGITS = re.compile(r"\d{4,}")
+    YEAR = re.compile(r"19\d\d|20\d\d")
+    DATE_SPLITS: Dict[int, list] = {4: [(1, 2), (2, 3)], 5: [(1, 3), (2, 3)], 6: [(1, 2), (2, 4), (4, 5)],
+                                    7: [(1, 3), (2, 3), (4, 5), (4, 6)], 8: [(2, 4), (4, 6)]}
+
+    WARNINGS: Dict[str, str] = {
+        "passwords": "This is a very common password.",
+        "english": "A word by itself is easy to guess.",
+        "names": "Names and surnames by themselves are easy to guess.",
+        "spatial": "Keyboard patterns are easy to guess.",
+        "repeat": "Repeated characters or words are easy to guess.",
+        "sequence": "Sequences like abc or 6543 are easy to guess.",
+        "date": "Dates and years are easy to guess.",
+        "bruteforce": "Use a longer password with fewer predictable parts."
+    }
+
+    data: Optional[StrengthData] = None
+    dataLock = threading.Lock()
+    graphStats: Dict[str, tuple] = {}
+
+    @staticmethod
+    def getData() -> StrengthData:
+        """
+        Returns the dictionaries and keyboard graphs, loading them on first use.
+        """
+        if StrengthEstimator.data is None:
+            with StrengthEstimator.dataLock:
+                if StrengthEstimator.data is None:
+                    data = StrengthData.load()
+                    StrengthEstimator.graphStats = {
+                        name: (len(graph), sum(sum(1 for n in neighbours if n) for neighbours in graph.values()) / len(graph))
+                        for name, graph in data.graphs.items()
+                    }
+                    StrengthEstimator.data = data
+        return StrengthEstimator.data
+
+    @staticmethod
+    def estimate(password: str) -> StrengthEstimate:
+        """
+        Estimates how hard a password is to guess.
+
+        :param password: The password; only its first MAX_LENGTH characters are analysed.
+        :return: The estimate.
+        """
+        password = password[:StrengthEstimator.MAX_LENGTH]
+        data: StrengthData = StrengthEstimator.getData()
+        matches: List[PatternMatch] = StrengthEstimator.omnimatch(password, data)
+        guesses, sequence = StrengthEstimator.cheapestSequence(password, matches)
+
+        score: int = sum(1 for threshold in StrengthEstimator.SCORE_GUESSES if guesses >= threshold + 5)
+        warning: str = ""
+        if score < StrengthEstimator.WEAK_SCORE:
+            longest: PatternMatch = max(sequence, key=lambda match: len(match.token)) if sequence else None
+            if longest is not None:
+                warning = StrengthEstimator.WARNINGS.get(longest.detail if longest.pattern == "dictionary" else longest.pattern, "")
+            else:
+                warning = StrengthEstimator.WARNINGS["bruteforce"]
+
+        return StrengthEstimate(guesses, score, sequence, warning)
+
+    @staticmethod
+    def omnimatch(password: str, data: StrengthData) -> List[PatternMatch]:
+        """
+        Finds every pattern in a password.
+        """
+        matches: List[PatternMatch] = StrengthEstimator.dictionaryMatches(password, data)
+        matches += StrengthEstimator.spatialMatches(password, data)
+        matches += StrengthEstimator.repeatMatches(password)
+        matches += StrengthEstimator.sequenceMatches(password)
+        if any(c.isdigit() for c in password):
+            matches += StrengthEstimator.dateMatches(password)
+        return matches
+
+    @staticmethod
+    def dictionaryMatches(password: str, data: StrengthData) -> List[PatternMatch]:
+        """
+        Finds the dictionary words in a password, directly and after undoing l33t substitutions. From every start
+        position the candidate grows one character at a time until no dictionary word starts with it.
+        """
+        matches: List[PatternMatch] = []
+        lowered: str = password.lower()
+        variants: List[str] = [lowered]
+        if any(c in StrengthEstimator.L33T_TABLE for c in lowered):
+            unl33ted: str = "".join(StrengthEstimator.L33T_TABLE.get(c, c) for c in lowered)
+            variants.append(unl33ted)
+            if "1" in lowered:
+                variants.append("".join("l" if c == "1" else StrengthEstimator.L33T_TABLE.get(c, c) for c in lowered))
+
+        length: int = len(password)
+        for variantIndex, variant in enumerate(variants):
+            for i in range(length):
+                for j in range(i + 1, length + 1):
+                    rank, dictionary = data.lookup(variant[i:j])
+                    if rank < 0:
+                        break
+                    if rank == 0:
+                        continue
+
+                    token: str = password[i:j]
+                    substitutions: int = sum(1 for a, b in zip(token.lower(), variant[i:j]) if a != b)
+                    if variantIndex > 0 and substitutions == 0:
+                        continue
+                    guesses: float = rank * StrengthEstimator.uppercaseVariations(token) * (2 ** substitutions if substitutions else 1)
+                    matches.append(PatternMatch("dictionary", i, j - 1, token, guesses, dictionary))
+        return matches
+
+    @staticmethod
+    def uppercaseVariations(token: str) -> float:
+        """
+        Returns how many capitalizations of a word an attacker tries before this one.
+        """
+        upper: int = sum(1 for c in token if c.isupper())
+        if upper == 0 or token.lower() == token:
+            return 1
+        lower: int = sum(1 for c in token if c.islower())
+        if lower == 0 or (upper == 1 and (token[0].isupper() or token[-1].isupper())):
+            return 2
+        return sum(math.comb(upper + lower, k) for k in range(1, min(upper, lower) + 1))
+
+    @staticmethod
+    def spatialMatches(password: str, data: StrengthData) -> List[PatternMatch]:
+        """
+        Finds runs of at least three adjacent keys on each keyboard graph.
+        """
+        matches: List[PatternMatch] = []
+        for name, graph in data.graphs.items():
+            startingPositions, averageDegree = StrengthEstimator.graphStats[name]
+            i: int = 0
+            while i < len(password) - 2:
+                j: int = i + 1
+                turns: int = 0
+                lastDirection: int = -1
+                shifted: int = 1 if name == "qwerty" and password[i] in "~!@#$%^&*()_+QWERTYUIOP{}|ASDFGHJKL:\"ZXCVBNM<>?" else 0
+                while j < len(password):
+                    neighbours = graph.get(password[j - 1])
+                    direction: int = -1
+                    if neighbours is not None:
+                        for index, neighbour in enumerate(neighbours):
+                            if neighbour is not None and password[j] in neighbour:
+                                direction = index
+                                if neighbour.index(password[j]) == 1:
+                                    shifted += 1
+                                break
+                    if direction < 0:
+                        break
+                    if direction != lastDirection:
+                        turns += 1
+                        lastDirection = direction
+                    j += 1
+
+                if j - i > 2:
+                    token: str = password[i:j]
+                    guesses: float = StrengthEstimator.spatialGuesses(len(token), turns, shifted, startingPositions, averageDegree)
+                    matches.append(PatternMatch("spatial", i, j - 1, token, guesses, name))
+                i = j
+        return matches
+
+    @staticmethod
+    def spatialGuesses(length: int, turns: int, shifted: int, startingPositions: int, averageDegree: float) -> float:
+        """
+        Returns the guesses for a keyboard pattern of a given length, number of turns and shifted keys.
+        """
+        guesses: float = 0
+        for i in range(2, length + 1):
+            for j in range(1, min(turns, i - 1) + 1):
+                guesses += math.comb(i - 1, j - 1) * startingPositions * averageDegree ** j
+        if shifted:
+            unshifted: int = length - shifted
+            guesses *= 2 if unshifted == 0 else sum(math.comb(shifted + unshifted, k) for k in range(1, min(shifted, unshifted) + 1))
+        return guesses
+
+    @staticmethod
+    def repeatMatches(password: str) -> List[PatternMatch]:
+        """
+        Finds repeated characters or blocks, e.g. "aaaa" or "abcabcabc".
+        """
+        matches: List[PatternMatch] = []
+        position: int = 0
+        while position < len(password):
+            greedy = StrengthEstimator.REPEAT_GREEDY.search(password, position)
+            if greedy is None:
+                break
+            lazy = StrengthEstimator.REPEAT_LAZY.search(password, position)
+
+            if len(greedy.group(0)) > len(lazy.group(0)):
+                match = greedy
+                base: str = StrengthEstimator.REPEAT_LAZY_ANCHORED.match(greedy.group(0)).group(1)
+            else:
+                match = lazy
+                base = lazy.group(1)
+
+            repeatCount: int = len(match.group(0)) // len(base)
+            baseGuesses: float = StrengthEstimator.estimate(base).guesses if len(base) > 1 else StrengthEstimator.BRUTEFORCE_CARDINALITY
+            matches.append(PatternMatch("repeat", match.start(), match.end() - 1, match.group(0), baseGuesses * repeatCount))
+            position = match.end()
+        return matches
+
+    @staticmethod
+    def sequenceMatches(password: str) -> List[PatternMatch]:
+        """
+        Finds runs of at least three characters with a constant step, e.g. "abcd", "97531" or "zyx".
+        """
+        matches: List[PatternMatch] = []
+        i: int = 0
+        while i < len(password) - 2:
+            delta: int = ord(password[i + 1]) - ord(password[i])
+            j: int = i + 1
+            while j < len(password) and ord(password[j]) - ord(password[j - 1]) == delta:
+                j += 1
+
+            if j - i > 2 and delta != 0 and abs(delta) <= 5:
+                token: str = password[i:j]
+                first: str = token[0]
+                if first in "aAzZ019":
+                    baseGuesses: float = 4
+                elif first.isdigit():
+                    baseGuesses = 10
+                else:
+                    baseGuesses = 26
+                matches.append(PatternMatch("sequence", i, j - 1, token, baseGuesses * len(token) * (1 if delta > 0 else 2)))
+                i = j - 1
+            else:
+                i += 1
+        return matches
+
+    @staticmethod
+    def dateMatches(password: str) -> List[PatternMatch]:
+        """
+        Finds dates (with or without separators) and recent-looking years.
+        """
+        matches: List[PatternMatch] = []
+
+        for run in StrengthEstimator.DIGITS.finditer(password):
+            digits: str = run.group(0)
+            for i in range(len(digits)):
+                for j in range(i + 4, min(i + 8, len(digits)) + 1):
+                    token: str = digits[i:j]
+                    for k, l in StrengthEstimator.DATE_SPLITS[len(token)]:
+                        year = StrengthEstimator.toYear([int(token[:k]), int(token[k:l]), int(token[l:])])
+                        if year is not None:
+                            matches.append(PatternMatch("date", run.start() + i, run.start() + j - 1, token, StrengthEstimator.dateGuesses(year, False)))
+                            break
+
+        for i in range(len(password) - 5):
+            for j in range(i + 6, min(i + 10, len(password)) + 1):
+                separated = StrengthEstimator.DATE_WITH_SEPARATOR.match(password, i, j)
+                if separated is not None:
+                    year = StrengthEstimator.toYear([int(separated.group(1)), int(separated.group(3)), int(separated.group(4))])
+                    if year is not None:
+                        matches.append(PatternMatch("date", i, j - 1, password[i:j], StrengthEstimator.dateGuesses(year, True)))
+
+        for year in StrengthEstimator.YEAR.finditer(password):
+            matches.append(PatternMatch("date", year.start(), year.end() - 1, year.group(0), max(abs(int(year.group(0)) - StrengthEstimator.REFERENCE_YEAR), StrengthEstimator.MIN_YEAR_SPACE)))
+        return matches
+
+    @staticmethod
+    def toYear(numbers: List[int]) -> Optional[int]:
+        """
+        Interprets three numbers as a day, month and year in any common order.
+
+        :return: The year, or None if the numbers form no valid date.
+        """
+        if numbers[1] > 31 or numbers[1] <= 0:
+            return None
+        if sum(1 for n in numbers if 99 < n < 1000 or n > 2050) > 0 or sum(1 for n in numbers if n > 31) >= 2 or sum(1 for n in numbers if n <= 0) >= 2:
+            return None
+
+        for year, rest in ((numbers[2], numbers[:2]), (numbers[0], numbers[1:])):
+            if 1000 <= year <= 2050 and StrengthEstimator.isDayMonth(rest):
+                return year
+        for year, rest in ((numbers[2], numbers[:2]), (numbers[0], numbers[1:])):
+            if year <= 99 and StrengthEstimator.isDayMonth(rest):
+                return year + (1900 if year > 50 else 2000)
+        return None
+
+    @staticmethod
+    def isDayMonth(numbers: List[int]) -> bool:
+        """
+        Checks whether two numbers are a day and a month, in either order.
+        """
+        for day, month in (numbers, numbers[::-1]):
+            if 1 <= day <= 31 and 1 <= month <= 12:
+                return True
+        return False
+
+    @staticmethod
+    def dateGuesses(year: int, separated: bool) -> float:
+        """
+        Returns the guesses for a full date in a given year.
+        """
+        guesses: float = max(abs(year - StrengthEstimator.REFERENCE_YEAR), StrengthEstimator.MIN_YEAR_SPACE) * 365
+        return guesses * 4 if separated else guesses
+
+    @staticmethod
+    def cheapestSequence(password: str, matches: List[PatternMatch]):
+        """
+        Finds the cheapest cover of the password by matches and brute-forced runs, by dynamic programming over
+        its prefixes: the guesses of a cover are the product of the guesses of its parts.
+
+        :return: The guesses of the cheapest cover and its matches, in order.
+        """
+        length: int = len(password)
+        best: List[float] = [1.0] + [math.inf] * length
+        previous: List[Optional[PatternMatch]] = [None] * (length + 1)
+        endingAt: Dict[int, List[PatternMatch]] = {}
+        for match in matches:
+            endingAt.setdefault(match.j + 1, []).append(match)
+
+        for k in range(1, length + 1):
+            best[k] = best[k - 1] * StrengthEstimator.BRUTEFORCE_CARDINALITY
+            previous[k] = None
+            for match in endingAt.get(k, ()):
+                minimum: int = StrengthEstimator.MIN_SUBMATCH_GUESSES_SINGLE_CHAR if match.i == match.j else StrengthEstimator.MIN_SUBMATCH_GUESSES_MULTI_CHAR
+                guesses: float = best[match.i] * max(match.guesses, minimum)
+                if guesses < best[k]:
+                    best[k] = guesses
+                    previous[k] = match
+
+        sequence: List[PatternMatch] = []
+        k = length
+        while k > 0:
+            match = previous[k]
+            if match is None:
+                start: int = k - 1
+                while start > 0 and previous[start] is None:
+                    start -= 1
+                sequence.append(PatternMatch("bruteforce", start, k - 1, password[start:k], StrengthEstimator.BRUTEFORCE_CARDINALITY ** (k - start)))
+                k = start
+            else:
+                sequence.append(match)
+                k = match.i
+        sequence.reverse()
+        return best[length], sequence
@@ -0,0 +1,126 @@
+import math
+import struct
+from typing import Tuple, Union
+
+class BloomFilter:
+    """
+    Bloom filter over keys that are already uniformly distributed, such as SHA-256 digests.
+    The k bit positions of a key are derived from its first 16 bytes by double hashing, so adding and testing
+    a key costs no extra hashing. A negative answer is always right; a positive one is wrong with about
+    the false positive rate the filter was sized for.
+
+    Serialized form: a 16-byte header (bit count, hash count) followed by the bit array.
+
+    Attributes:
+        bitCount (int): Number of bits in the filter.
+        hashCount (int): Number of bits set per key.
+        bits: The bit array, a bytearray or a read-only buffer such as a memory map.
+    """
+
+    HEADER = struct.Struct(">QQ")
+
+    def __init__(self, bitCount: int, hashCount: int, bits: Union[bytearray, memoryview, None] = None) -> None:
+        """
+        Initializes a filter, empty unless a bit array is given.
+
+        :param bitCount: Number of bits in the filter.
+        :param hashCount: Number of bits set per key.
+        :param bits: Existing bit array of at least bitCount bits.
+        """
+        self.bitCount = bitCount
+        self.hashCount = hashCount
+        self.bits = bits if bits is not None else bytearray((bitCount + 7) // 8)
+
+    @staticmethod
+    def dimensions(capacity: int, falsePositiveRate: float) -> Tuple[int, int]:
+        """
+        Sizes a filter for a number of keys and a false positive rate, about 1.8 bytes per key at 0.001.
+
+        :param capacity: Expected number of keys.
+        :param falsePositiveRate: Accepted share of false positives, e.g. 0.001.
+        :return: (bit count, hash count).
+        """
+        capacity = max(1, capacity)
+        bitCount: int = max(8, math.ceil(-capacity * math.log(falsePositiveRate) / math.log(2) ** 2))
+        hashCount: int = max(1, round(bitCount / capacity * math.log(2)))
+        return bitCount, hashCount
+
+    @staticmethod
+    def forCapacity(capacity: int, falsePositiveRate: float) -> "BloomFilter":
+        """
+        Creates an empty in-memory filter sized for a number of keys and a false positive rate.
+
+        :param capacity: Expected number of keys.
+        :param falsePositiveRate: Accepted share of false positives, e.g. 0.001.
+        :return: The empty filter.
+        """
+        return BloomFilter(*BloomFilter.dimensions(capacity, falsePositiveRate))
+
+    @staticmethod
+    def serializedSize(bitCount: int) -> int:
+        """
+        Returns the size of a serialized filter of bitCount bits.
+        """
+        return BloomFilter.HEADER.size + (bitCount + 7) // 8
+
+    @staticmethod
+    def writeHeader(buffer: Union[bytearray, memoryview], bitCount: int, hashCount: int) -> "BloomFilter":
+        """
+        Lays out an empty filter in a zeroed writable buffer of serializedSize(bitCount) bytes, such as a
+        memory-mapped file, so a filter larger than the available memory can be built in place.
+
+        :param buffer: The buffer.
+        :param bitCount: Number of bits in the filter.
+        :param hashCount: Number of bits set per key.
+        :return: The filter, reading and writing its bits in the buffer.
+        """
+        BloomFilter.HEADER.pack_into(buffer, 0, bitCount, hashCount)
+        return BloomFilter.fromBuffer(buffer)
+
+    @staticmethod
+    def fromBuffer(buffer: Union[bytes, memoryview]) -> "BloomFilter":
+        """
+        Opens a serialized filter without copying its bit array.
+
+        :param buffer: The serialized filter, e.g. a memory-mapped file.
+        :return: The filter.
+        """
+        bitCount, hashCount = BloomFilter.HEADER.unpack_from(buffer, 0)
+        return BloomFilter(bitCount, hashCount, memoryview(buffer)[BloomFilter.HEADER.size:])
+
+    def release(self) -> None:
+        """
+        Releases the buffer a filter opened with fromBuffer reads from, so it can be closed.
+        """
+        if isinstance(self.bits, memoryview):
+            self.bits.release()
+
+    def toBytes(self) -> bytes:
+        """
+        Serializes the filter.
+        """
+        return BloomFilter.HEADER.pack(self.bitCount, self.hashCount) + bytes(self.bits)
+
+    def positions(self, key: bytes):
+        """
+        Yields the bit positions of a key.
+
+        :param key: A uniformly distributed key of at least 16 bytes.
+        """
+        first: int = int.from_bytes(key[:8], "big")
+        step: int = int.from_bytes(key[8:16], "big") | 1
+        for i in range(self.hashCount):
+            yield (first + i * step) % self.bitCount
+
+    def add(self, key: bytes) -> None:
+        """
+        Adds a key to the filter.
+        """
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: bytes) -> bool:
+        """
+        Checks whether a key may have been added.
+        """
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(key))
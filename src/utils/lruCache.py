@@ -0,0 +1,157 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+class LruCache:
+    """
+    Bounded, thread-safe mapping that evicts the least recently used item once it is full.
+    With a time to live, items also expire that many seconds after they were cached.
+
+    Attributes:
+        maxSize (int): Maximum number of cached items.
+        ttl (float): Seconds an item stays valid, or None if items never expire.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that found nothing.
+        evictions (int): Items dropped to stay within maxSize.
+    """
+
+    def __init__(self, maxSize: int, ttl: Optional[float] = None) -> None:
+        """
+        Initializes an empty cache.
+
+        :param maxSize: Maximum number of cached items.
+        :param ttl: Seconds an item stays valid, None to keep items until they are evicted.
+        """
+        self.lock = threading.Lock()
+        self.items: OrderedDict = OrderedDict()
+        self.expiries: dict = {}
+        self.maxSize: int = maxSize
+        self.ttl: Optional[float] = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: Hashable):
+        """
+        Returns a cached item and marks it as recently used.
+
+        :param key: The key of the item.
+        :return: The item, or None if it is not cached.
+        """
+        with self.lock:
+            value = self.items.get(key)
+            if value is not None and self.isExpired(key):
+                self.removeItem(key)
+                value = None
+
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value) -> None:
+        """
+        Caches an item, evicting the least recently used ones if the cache is full.
+
+        :param key: The key of the item.
+        :param value: The item to cache.
+        """
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            self.setExpiry(key)
+            self.evictOverflow()
+
+    def getOrCreate(self, key: Hashable, create: Callable[[], object]):
+        """
+        Returns a cached item, creating and caching it first if needed.
+        The item is created outside the lock, so two threads may both create it; the first one cached wins.
+
+        :param key: The key of the item.
+        :param create: Builds the item when it is not cached.
+        :return: The cached item.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        value = create()
+        with self.lock:
+            existing = self.items.get(key)
+            if existing is not None and not self.isExpired(key):
+                self.items.move_to_end(key)
+                return existing
+
+            self.items[key] = value
+            self.items.move_to_end(key)
+            self.setExpiry(key)
+            self.evictOverflow()
+            return value
+
+    def evictOverflow(self) -> None:
+        """
+        Drops least recently used items until the cache fits maxSize. Must be called while holding the lock.
+        """
+        while len(self.items) > self.maxSize:
+            key, _ = self.items.popitem(last=False)
+            self.expiries.pop(key, None)
+            self.evictions += 1
+
+    def setExpiry(self, key: Hashable) -> None:
+        """
+        Starts the time to live of a freshly cached item. Must be called while holding the lock.
+        """
+        if self.ttl is not None:
+            self.expiries[key] = time.monotonic() + self.ttl
+
+    def isExpired(self, key: Hashable) -> bool:
+        """
+        Checks whether a cached item outlived the time to live. Must be called while holding the lock.
+        """
+        expiry: Optional[float] = self.expiries.get(key)
+        return expiry is not None and expiry <= time.monotonic()
+
+    def removeItem(self, key: Hashable) -> Optional[object]:
+        """
+        Removes an item and its expiry. Must be called while holding the lock.
+        """
+        self.expiries.pop(key, None)
+        return self.items.pop(key, None)
+
+    def pop(self, key: Hashable) -> Optional[object]:
+        """
+        Removes an item from the cache.
+
+        :param key: The key of the item.
+        :return: The removed item, or None if it was not cached.
+        """
+        with self.lock:
+            return self.removeItem(key)
+
+    def clear(self) -> None:
+        """
+        Removes every item.
+        """
+        with self.lock:
+            self.items.clear()
+            self.expiries.clear()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of cached items.
+        """
+        with self.lock:
+            return len(self.items)
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        :return: Dictionary with the hit, miss and eviction counts and the number of cached items.
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "items": len(self.items)}
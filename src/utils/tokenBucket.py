@@ -0,0 +1,89 @@
+import time
+import threading
+from typing import Optional
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    Tokens refill continuously at `rate` per second up to `capacity`; taking more tokens than are
+    available blocks until enough have refilled, so bursts are allowed but the long-run rate is capped.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum number of stored tokens, i.e. the largest burst.
+        tokens (float): Tokens currently available.
+        waited (float): Seconds callers spent blocked, summed over all calls.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """
+        Initializes a full bucket.
+
+        :param rate: Tokens added per second, must be positive.
+        :param capacity: Maximum number of stored tokens, defaults to one second worth of tokens.
+        """
+        if rate <= 0:
+            raise ValueError("The rate of a token bucket must be positive.")
+
+        self.lock = threading.Lock()
+        self.rate: float = float(rate)
+        self.capacity: float = float(capacity if capacity is not None else rate)
+        self.tokens: float = self.capacity
+        self.updated: float = time.monotonic()
+        self.waited: float = 0.0
+
+    def refill(self) -> None:
+        """
+        Adds the tokens accumulated since the last refill. The caller must hold the lock.
+        """
+        now: float = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def tryAcquire(self, amount: float = 1) -> bool:
+        """
+        Takes tokens if they are available right now.
+
+        :param amount: Number of tokens to take.
+        :return: True if the tokens were taken.
+        """
+        with self.lock:
+            self.refill()
+            if self.tokens < amount:
+                return False
+            self.tokens -= amount
+            return True
+
+    def acquire(self, amount: float = 1) -> float:
+        """
+        Takes tokens, blocking until they are available.
+        A request larger than the capacity is granted once the bucket is full and leaves it in debt,
+        so later callers wait for the excess.
+
+        :param amount: Number of tokens to take.
+        :return: Seconds spent waiting.
+        """
+        waited: float = 0.0
+        while True:
+            with self.lock:
+                self.refill()
+                needed: float = min(amount, self.capacity)
+                if self.tokens >= needed:
+                    self.tokens -= amount
+                    self.waited += waited
+                    return waited
+                delay: float = (needed - self.tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def penalize(self, seconds: float) -> None:
+        """
+        Empties the bucket and puts it in debt so that no tokens are available for the given time,
+        e.g. when the rate limited service asks callers to back off.
+
+        :param seconds: How long every caller has to wait.
+        """
+        with self.lock:
+            self.refill()
+            self.tokens = min(self.tokens, -seconds * self.rate)
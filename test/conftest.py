@@ -1,4 +1,43 @@
 import sys
 import os
+import pytest
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from storage.vaultStorage import VaultStorage
+from storage.logStore import LogStore
+from storage.accountStore import AccountStore
+from cryptographing.loginHasher import LoginHasher
+
+@pytest.fixture(autouse=True)
+def clear_vault_cache():
+    """Makes sure no test sees vaults or indexes cached by a previous one."""
+    VaultStorage.cache.clear()
+    for index in VaultStorage.indexes:
+        index.clear()
+    yield
+    VaultStorage.cache.clear()
+    for index in VaultStorage.indexes:
+        index.clear()
+
+@pytest.fixture
+def vault_storage(tmp_path):
+    """Points the vault storage at a temporary directory for the duration of a test."""
+    with patch.object(VaultStorage, "engine", LogStore(str(tmp_path))):
+        yield tmp_path
+
+@pytest.fixture
+def account_store(tmp_path):
+    """Points the account store at a temporary directory for the duration of a test."""
+    accountsDir = str(tmp_path / "accounts")
+    with patch.object(AccountStore, "ACCOUNTS_DIR", accountsDir):
+        yield accountsDir
+    AccountStore.migratedDirectories.discard(accountsDir)
+
+@pytest.fixture(scope="session")
+def login_hasher():
+    """Uses the cheapest hashing cost and stops the hashing processes after the test session."""
+    LoginHasher.configure("low", workers=2)
+    yield LoginHasher
+    LoginHasher.shutdown()
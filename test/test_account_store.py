@@ -0,0 +1,68 @@
+import os
+import json
+import sys
+import threading
+import subprocess
+from storage.accountStore import AccountStore
+from commands.authentication.login import Login
+from commands.command import Command
+
+def testAccountsAreShardedByHash(account_store):
+    assert AccountStore.addAccount("alice", {"password": "p1"}) is True
+
+    path = AccountStore.accountPath("alice")
+    assert os.path.exists(path)
+    assert os.path.basename(os.path.dirname(path)) == os.path.basename(path)[:2]
+    assert AccountStore.getAccount("alice") == {"password": "p1"}
+    assert AccountStore.getAccount("bob") is None
+
+def testConcurrentRegistrationsOfTheSameUserCreateOneAccount(account_store):
+    results = []
+
+    def register(index):
+        results.append(AccountStore.addAccount("alice", {"password": f"p{index}"}))
+
+    threads = [threading.Thread(target=register, args=(index,)) for index in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 1
+    assert AccountStore.getAccount("alice") is not None
+    assert not [name for name in os.listdir(os.path.dirname(AccountStore.accountPath("alice"))) if name.endswith(".tmp")]
+
+def testUpdateAccountReplacesRecord(account_store):
+    AccountStore.addAccount("alice", {"password": "p1"})
+    AccountStore.updateAccount("alice", {"password": "p2"})
+
+    assert AccountStore.getAccount("alice") == {"password": "p2"}
+
+def testLegacyAccountsFileIsMigratedOnce(account_store):
+    os.makedirs(account_store)
+    with open(os.path.join(account_store, "accounts.json"), "w") as file:
+        json.dump({"alice": {"password": "p1"}, "bob": {"password": "p2"}}, file)
+
+    assert AccountStore.getAccount("bob") == {"password": "p2"}
+    assert AccountStore.accountExists("alice")
+    assert not os.path.exists(os.path.join(account_store, "accounts.json"))
+    assert os.path.exists(os.path.join(account_store, "accounts.json.migrated"))
+
+def testCorruptedLegacyFileIsReportedAndKept(account_store):
+    os.makedirs(account_store)
+    with open(os.path.join(account_store, "accounts.json"), "w") as file:
+        file.write('{"alice": {"password": ')
+
+    response = Login.loginUser(Command("login", ["alice", "secret"]))
+
+    assert response.status is False
+    assert "corrupted" in response.description
+    assert os.path.exists(os.path.join(account_store, "accounts.json"))
+    assert not os.path.exists(os.path.join(account_store, "accounts.json.migrated"))
+
+def testImportingTheStoreDoesNotStartTheVaultStorage():
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    probe = "import sys, storage.accountStore; print('storage.vaultStorage' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=src, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "False"
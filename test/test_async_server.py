@@ -0,0 +1,69 @@
+import asyncio
+import threading
+from unittest.mock import patch
+from src.asyncServer import AsyncServer
+from src.protocol.framing import MessageFraming
+from src.commands.command import Command
+from src.response.response import Response
+
+@patch("serverlog.logger.Logger.log")
+def testAsyncServerRoundTrip(mock_log):
+    """
+    Test that the asyncio server answers a command with the usual JSON response.
+    """
+    async def scenario():
+        server = AsyncServer("127.0.0.1", 0, maxWorkers=2)
+        await server.startServing()
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        await MessageFraming.writeMessageAsync(writer, Command("login", ["lonelyUser"]).toJson())
+        answer = await MessageFraming.readMessageAsync(reader)
+
+        writer.close()
+        await writer.wait_closed()
+        await server.stop()
+        return Response.fromJson(answer)
+
+    response = asyncio.run(scenario())
+
+    assert response.status is False
+    assert "Wrong parameters used with login command" in response.description
+    mock_log.assert_called_once()
+
+@patch("serverlog.logger.Logger.log")
+def testSlowLoginsDoNotHoldTheVaultWorkers(mock_log):
+    """
+    Test that a vault command is answered while every login thread waits for a password hash.
+    """
+    hashing = threading.Event()
+    release = threading.Event()
+
+    def slowLogin(command):
+        hashing.set()
+        release.wait(5)
+        return Response(False, "Wrong password, please try again!")
+
+    async def scenario():
+        server = AsyncServer("127.0.0.1", 0, maxWorkers=1, loginWorkers=1)
+        await server.startServing()
+
+        loginReader, loginWriter = await asyncio.open_connection("127.0.0.1", server.port)
+        await MessageFraming.writeMessageAsync(loginWriter, Command("login", ["alice", "secret"]).toJson())
+        await asyncio.get_running_loop().run_in_executor(None, hashing.wait, 5)
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        await MessageFraming.writeMessageAsync(writer, Command("list-vaults").toJson())
+        answer = await asyncio.wait_for(MessageFraming.readMessageAsync(reader), 2)
+
+        release.set()
+        await MessageFraming.readMessageAsync(loginReader)
+        for stream in (writer, loginWriter):
+            stream.close()
+            await stream.wait_closed()
+        await server.stop()
+        return Response.fromJson(answer)
+
+    with patch("commands.authentication.login.Login.loginUser", side_effect=slowLogin):
+        response = asyncio.run(scenario())
+
+    assert response.status is False
@@ -0,0 +1,87 @@
+import os
+import gzip
+import json
+from unittest.mock import patch
+from src.commands.commandExecutor import CommandExecutor
+from src.commands.command import Command
+from commands.admin.logViewer import LogViewer
+from serverlog.auditLog import AuditLog
+from serverlog.logger import Logger
+from response.response import Response
+
+def writeSegment(auditLog, records):
+    os.makedirs(auditLog.directory, exist_ok=True)
+    with open(auditLog.activePath, "w") as segment:
+        segment.writelines(AuditLog.encodeRecord(record) for record in records)
+    auditLog.archive(auditLog.activePath)
+
+def testArchivedSegmentsAreCompressedAndIndexed(tmp_path):
+    auditLog = AuditLog(str(tmp_path))
+    writeSegment(auditLog, [{"ts": 100 + i, "user": "alice" if i % 2 else "bob", "command": "get"} for i in range(10)])
+
+    assert not os.path.exists(auditLog.archivePath(1, AuditLog.PLAIN_SUFFIX))
+    with gzip.open(auditLog.archivePath(1, AuditLog.COMPRESSED_SUFFIX), "rt") as archived:
+        assert len(archived.read().splitlines()) == 10
+
+    index = auditLog.readIndex(1)
+    assert (index["first"], index["last"]) == (100, 109)
+    assert set(index["users"]) == {"alice", "bob"}
+
+def testQueryOnlyDecompressesTheBlocksOfTheUserInTheWindow(tmp_path):
+    auditLog = AuditLog(str(tmp_path))
+    with patch.object(AuditLog, "BLOCK_BYTES", 200):
+        writeSegment(auditLog, [{"ts": 100 + i, "user": "bob", "command": "get"} for i in range(50)] +
+                               [{"ts": 200 + i, "user": "alice", "command": "find"} for i in range(50)])
+    writeSegment(auditLog, [{"ts": 300 + i, "user": "alice", "command": "search"} for i in range(5)])
+    with open(auditLog.activePath, "w") as active:
+        active.write(AuditLog.encodeRecord({"ts": 400, "user": "alice", "command": "audit"}))
+        active.write('{"ts": 401, "user": "alice", "comm')
+
+    with patch("serverlog.auditLog.gzip.decompress", wraps=gzip.decompress) as mock_decompress:
+        records = list(auditLog.query("alice", 240, 1000))
+
+    assert [record["ts"] for record in records] == list(range(240, 250)) + list(range(300, 305)) + [400]
+    assert mock_decompress.call_count < len(auditLog.readIndex(1)["blocks"])
+
+def testRecoverCompressesWhatAPreviousRunLeftBehind(tmp_path):
+    auditLog = AuditLog(str(tmp_path))
+    with open(auditLog.activePath, "w") as active:
+        active.write(AuditLog.encodeRecord({"ts": 5, "user": "alice"}))
+
+    auditLog.recover()
+
+    assert not os.path.exists(auditLog.activePath)
+    assert list(auditLog.query("alice", 0, 10)) == [{"ts": 5, "user": "alice"}]
+
+def testAdminStreamsTheLogsOfAUser(tmp_path, monkeypatch):
+    monkeypatch.setenv(LogViewer.ADMINS_ENV, "root, admin")
+    updates = []
+
+    with patch.object(Logger, "LOG_DIR", str(tmp_path)), patch.object(LogViewer, "CHUNK_SIZE", 2):
+        Logger.shutdown()
+        for i in range(3):
+            Logger.log("alice", "get", Response(True, f"entry {i}"))
+        Logger.log("bob", "get", Response(True, "other user"))
+        response = CommandExecutor("admin").executeOperation(Command("logs", ["alice", "2000-01-01"]), updates.append)
+        Logger.shutdown()
+
+    assert response.status is True
+    assert response.description == "Found 3 log record(s) of 'alice'."
+    assert [len(update.description.split("\n")) for update in updates] == [2, 1]
+    assert all(update.partial and "User: alice | Command: get" in update.description for update in updates)
+
+def testOnlyAdminsCanReadTheLogs(monkeypatch):
+    monkeypatch.setenv(LogViewer.ADMINS_ENV, "admin")
+
+    response = CommandExecutor("alice").executeOperation(Command("logs", ["alice"]))
+
+    assert response.status is False
+    assert response.description == "Only administrators can read the logs."
+
+def testInvalidTimeWindowIsRejected(monkeypatch):
+    monkeypatch.setenv(LogViewer.ADMINS_ENV, "admin")
+
+    response = CommandExecutor("admin").executeOperation(Command("logs", ["alice", "2026-10-18", "2026-10-01"]))
+
+    assert response.status is False
+    assert response.description.startswith("Invalid time window")
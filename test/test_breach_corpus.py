@@ -0,0 +1,106 @@
+import hashlib
+import pytest
+from unittest.mock import patch
+from src.commands.password.passwordSafetyChecker import SafetyChecker
+from storage.breachCorpus import BreachCorpus, BreachCorpusImporter
+from utils.bloomFilter import BloomFilter
+
+def sha256(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+@pytest.fixture
+def dumps(tmp_path):
+    first = tmp_path / "first.txt"
+    first.write_text("\n".join([f"{sha256('password')}:10", sha256("123456"), "not a hash", f"{sha256('letmein')}:3"]) + "\n")
+    second = tmp_path / "second.txt"
+    second.write_text("\n".join([f"{sha256('password').upper()}:5"] + [f"{sha256(f'filler{i}')}:1" for i in range(50)]) + "\n")
+    return [str(first), str(second)]
+
+@pytest.mark.parametrize("falsePositiveRate", [0.01, None])
+def testImportedCorpusAnswersLookups(tmp_path, dumps, falsePositiveRate):
+    """
+    Test that an import spread over several sorted runs merges duplicates and finds every hash.
+    """
+    directory = str(tmp_path / "corpus")
+    stats = BreachCorpusImporter(directory, runRecords=8, falsePositiveRate=falsePositiveRate).importFiles(dumps)
+
+    assert stats == {"lines": 55, "skipped": 1, "runs": 7, "hashes": 53}
+
+    corpus = BreachCorpus(directory)
+    assert corpus.count == 53
+    assert (corpus.bloom is not None) == (falsePositiveRate is not None)
+    assert corpus.lookupPassword("password") == 15
+    assert corpus.lookupPassword("123456") == 1
+    assert corpus.lookupPassword("filler49") == 1
+    assert corpus.lookupPassword("correct horse battery staple") == 0
+
+    digest = bytes.fromhex(sha256("letmein"))
+    assert (digest, 3) in list(corpus.candidates(digest[:3]))
+    corpus.close()
+
+def testBloomFilterHasNoFalseNegatives():
+    """
+    Test that every added key is found and that most absent keys are rejected.
+    """
+    bloom = BloomFilter.forCapacity(1000, 0.01)
+    keys = [hashlib.sha256(str(i).encode()).digest() for i in range(2000)]
+    for key in keys[:1000]:
+        bloom.add(key)
+
+    restored = BloomFilter.fromBuffer(bloom.toBytes())
+    assert all(key in restored for key in keys[:1000])
+    assert sum(key in restored for key in keys[1000:]) < 50
+
+def testSafetyCheckerUsesLocalCorpus(tmp_path, dumps):
+    """
+    Test that a configured corpus answers the safety check without any network call.
+    """
+    directory = str(tmp_path / "corpus")
+    BreachCorpusImporter(directory).importFiles(dumps)
+
+    with patch.dict("os.environ", {SafetyChecker.CORPUS_ENV: directory}), \
+         patch.object(SafetyChecker, "corpus", None), \
+         patch("src.commands.password.passwordSafetyChecker.requests.post") as mock_post:
+        exposed = SafetyChecker.checkPasswordSecurity("password")
+        safe = SafetyChecker.checkPasswordSecurity("a much better passphrase")
+        SafetyChecker.corpus.close()
+
+    mock_post.assert_not_called()
+    assert exposed.status is False and "15 times" in exposed.description
+    assert safe.status is True
+
+def testBloomFilterIsBuiltOnDiskWithTheSameBits(tmp_path, dumps):
+    """
+    Test that the import fills the Bloom filter in its memory-mapped file rather than in memory.
+    """
+    directory = tmp_path / "corpus"
+    with patch.object(BloomFilter, "forCapacity", side_effect=AssertionError("filter allocated in memory")):
+        BreachCorpusImporter(str(directory), runRecords=8, falsePositiveRate=0.01).importFiles(dumps)
+
+    expected = BloomFilter.forCapacity(54, 0.01)
+    corpus = BreachCorpus(str(directory))
+    for record in range(corpus.count):
+        expected.add(BreachCorpus.RECORD.unpack_from(corpus.hashes, record * BreachCorpus.RECORD.size)[0])
+    corpus.close()
+
+    assert (directory / BreachCorpus.BLOOM_FILE).read_bytes() == expected.toBytes()
+
+def testSafetyCheckerReopensAReimportedCorpus(tmp_path, dumps):
+    """
+    Test that a corpus imported again into the configured directory replaces the one already open.
+    """
+    directory = str(tmp_path / "corpus")
+    BreachCorpusImporter(directory).importFiles(dumps[:1])
+
+    with patch.dict("os.environ", {SafetyChecker.CORPUS_ENV: directory}), patch.object(SafetyChecker, "corpus", None):
+        before = SafetyChecker.getCorpus()
+        assert SafetyChecker.getCorpus() is before
+        assert before.lookupPassword("filler1") == 0
+
+        BreachCorpusImporter(directory).importFiles(dumps)
+        after = SafetyChecker.getCorpus()
+
+        assert after is not before
+        assert after.lookupPassword("filler1") == 1
+        after.close()
+    before.close()
@@ -0,0 +1,61 @@
+import pytest
+from unittest.mock import patch
+from src.commands.commandExecutor import CommandExecutor
+from src.commands.command import Command
+from storage.vaultStorage import VaultStorage
+
+def testBatchLoadsAndWritesEachVaultOnce(vault_storage):
+    """
+    Test that a batch touching one vault many times reads and writes it only once.
+    """
+    commands = [Command("save-password", [f"site{i}.com", "user", f"password{i}", "work"]) for i in range(20)]
+    commands.append(Command("get", ["password", "site7.com", "work"]))
+    commands.append(Command("update-entry", ["site3.com", "user", "changed", "work"]))
+
+    with patch.object(VaultStorage, "writeRecords", wraps=VaultStorage.writeRecords) as mock_write:
+        response = CommandExecutor("batchUser").executeOperation(Command.createBatch(commands))
+
+    assert response.status is True
+    assert len(response.results) == len(commands)
+    assert all(result.status for result in response.results)
+    assert "password7" in response.results[20].description
+    assert "1 vault(s) written" in response.description
+    mock_write.assert_called_once()
+
+    VaultStorage.cache.clear()
+    assert len(VaultStorage.listUrls("batchUser", "work")) == 20
+
+def testBatchRejectsAuthenticationCommands(vault_storage):
+    """
+    Test that commands which change the session cannot be smuggled into a batch.
+    """
+    batch = Command.createBatch([Command("login", ["someone", "secret"]), Command("list-vaults")])
+    response = CommandExecutor("batchUser").executeOperation(batch)
+
+    assert response.status is True
+    assert response.results[0].status is False
+    assert "cannot be used inside a batch" in response.results[0].description
+
+def testBatchRequiresLogin():
+    """
+    Test that a batch is refused when no user is logged in.
+    """
+    response = CommandExecutor("").executeOperation(Command.createBatch([Command("list-vaults")]))
+
+    assert response.status is False
+
+@pytest.mark.parametrize("command", [
+    Command("save-password", ["a.com", "me", "pw", "Work"]),
+    Command("generate-password", ["a.com", "me", "Work"]),
+])
+def testCapitalizedCategoryIsSavedInTheLowercaseVault(vault_storage, command):
+    """
+    Test that a category typed with capitals writes to the vault VaultCreator created for it.
+    """
+    executor = CommandExecutor("bob")
+
+    response = executor.executeOperation(command)
+
+    assert response.status is True
+    assert VaultStorage.listUrls("bob", "work") == ["a.com"]
+    assert executor.executeOperation(Command("get", ["password", "a.com", "work"])).status is True
@@ -1,8 +1,14 @@
 import pytest
 import base64
 import hashlib
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
+from unittest.mock import patch
 from src.cryptographing.crypting import Crypt
+from src.cryptographing.vaultCipher import VaultCipher
+from cryptographing import crypting
+from clientSession import ClientSession
+from commands.commandExecutor import CommandExecutor
+from commands.command import Command
 
 @pytest.fixture
 def mock_username():
@@ -44,3 +50,78 @@ def testDecryptWithWrongKey(mock_password, encryption_key):
 
     with pytest.raises(Exception):
         Crypt.decryptPassword(encrypted_password.decode(), wrong_key)
+
+def testLegacyFernetTokensStayReadable(mock_password, encryption_key):
+    """
+    Test that passwords encrypted before the versioned format are still decrypted, and new ones use it.
+    """
+    legacy_token = Fernet(encryption_key).encrypt(mock_password.encode())
+    assert Crypt.decryptPassword(legacy_token.decode(), encryption_key) == mock_password
+
+    token = Crypt.encryptPassword(mock_password, encryption_key)
+    assert token.startswith(VaultCipher.AESGCM_PREFIX)
+    assert len(token) < len(legacy_token)
+
+def testTamperedTokenIsRejected(mock_password, encryption_key):
+    """
+    Test that a modified version 2 token fails authentication.
+    """
+    token = bytearray(Crypt.encryptPassword(mock_password, encryption_key))
+    token[10] = ord("A") if token[10] != ord("A") else ord("B")
+
+    with pytest.raises(InvalidToken):
+        VaultCipher(encryption_key).decrypt(bytes(token))
+
+def testCipherIsDerivedOncePerUser(mock_username, mock_password, encryption_key):
+    """
+    Test that cached ciphers are reused and interoperate with key-based encryption.
+    """
+    Crypt.dropCipher(mock_username)
+
+    with patch.object(Crypt, "generateKey", wraps=Crypt.generateKey) as mock_key:
+        cipher = Crypt.getCipher(mock_username)
+        assert Crypt.getCipher(mock_username) is cipher
+    mock_key.assert_called_once_with(mock_username)
+
+    encrypted_password = Crypt.encryptWithCipher(mock_password, cipher)
+    assert Crypt.decryptPassword(encrypted_password.decode(), encryption_key) == mock_password
+
+def testLogoutDropsTheSessionCipher(mock_username):
+    """
+    Test that a session's cipher is dropped from the cache when the user logs out.
+    """
+    session = ClientSession(("127.0.0.1", 0))
+    session.executor = CommandExecutor(mock_username)
+    assert crypting.Crypt.cipherCache.get(mock_username) is not None
+
+    with patch("clientSession.Logger.log"):
+        session.processMessage(Command("logout").toJson())
+
+    assert crypting.Crypt.cipherCache.get(mock_username) is None
+    assert session.currentUser == ""
+
+def testBatchEncryptDecryptKeepsOrder(encryption_key):
+    """
+    Test that the batch API returns results in input order, both inline and fanned out over threads.
+    """
+    cipher = VaultCipher(encryption_key)
+    passwords = [f"password{i}" for i in range(Crypt.BATCH_THRESHOLD * 2 + 7)]
+
+    with patch.object(Crypt, "batchWorkers", 3), patch.object(Crypt, "batchPool", None):
+        tokens = [token.decode() for token in Crypt.encryptMany(passwords, cipher)]
+        assert Crypt.decryptMany(tokens, cipher) == passwords
+        Crypt.batchPool.shutdown()
+
+    assert Crypt.decryptMany(tokens[:3], cipher) == passwords[:3]
+
+def testBatchDecryptReportsInvalidTokens(encryption_key):
+    """
+    Test that a bad token raises in strict mode and yields None otherwise.
+    """
+    cipher = VaultCipher(encryption_key)
+    tokens = [Crypt.encryptWithCipher("a", cipher).decode(), "not-a-token"]
+
+    with pytest.raises(InvalidToken):
+        Crypt.decryptMany(tokens, cipher)
+
+    assert Crypt.decryptMany(tokens, cipher, strict=False) == ["a", None]
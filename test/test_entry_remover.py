@@ -3,18 +3,18 @@ import json
 import os
 from src.commands.entry.entryRemover import EntryRemover
 from src.response.response import Response
-from unittest.mock import patch, mock_open
+from storage.vaultStorage import VaultStorage
+
+def testRemoveAll(vault_storage):
+    VaultStorage.createVault("testuser", "default")
+    VaultStorage.putEntry("testuser", "default", "example.com", {"username": "user1", "password": "encrypted"})
 
-@patch("os.path.exists", return_value=True)
-@patch("os.listdir", return_value=["default.json"])
-@patch("builtins.open", new_callable=mock_open, read_data='{"example.com": {"username": "user1", "password": "encrypted"}}')
-def testRemoveAll(mock_open_file, mock_listdir, mock_exists):
     command = type("Command", (object,), {"parameters": ["example.com"]})
     response = EntryRemover.removeAll("testuser", command)
 
     assert response.status is True
     assert "Successfully removed all entries for 'example.com'" in response.description
-    mock_open_file.assert_called()
+    assert VaultStorage.getEntry("testuser", "default", "example.com") is None
 
 @pytest.fixture
 def mock_vault_data():
@@ -23,4 +23,17 @@ def mock_vault_data():
         "another.com": {"username": "otheruser", "password": "encryptedpass2"}
     }
 
+def testRemoveAllMigratesLegacyVault(vault_storage, mock_vault_data):
+    """
+    Test that a legacy {category}.json vault is migrated on first access and keeps its other entries.
+    """
+    os.makedirs(vault_storage / "testuser")
+    with open(vault_storage / "testuser" / "work.json", "w") as file:
+        json.dump(mock_vault_data, file)
 
+    command = type("Command", (object,), {"parameters": ["example.com"]})
+    response = EntryRemover.removeAll("testuser", command)
+
+    assert response.status is True
+    assert not os.path.exists(vault_storage / "testuser" / "work.json")
+    assert VaultStorage.listUrls("testuser", "work") == ["another.com"]
@@ -1,9 +1,10 @@
 import pytest
 import json
 import os
-from unittest.mock import mock_open, patch
+from unittest.mock import patch
 from src.commands.entry.entryExractor import Extractor
 from src.response.response import Response
+from storage.vaultStorage import VaultStorage
 
 @pytest.fixture
 def mock_vault_data():
@@ -14,6 +15,14 @@ def mock_vault_data():
         }
     }
 
+@pytest.fixture
+def stored_vault(vault_storage, mock_vault_data):
+    VaultStorage.createVault("testUser", "default")
+    for url, entry in mock_vault_data.items():
+        VaultStorage.putEntry("testUser", "default", url, entry)
+    VaultStorage.cache.clear()
+    return vault_storage
+
 @pytest.fixture
 def mock_command_extract():
     return type("Command", (), {"parameters": ["both", "example.com", "default"]})()
@@ -22,30 +31,21 @@ def mock_command_extract():
 def mock_command_list():
     return type("Command", (), {"parameters": ["default"]})()
 
-@patch("builtins.open", new_callable=mock_open)
-@patch("os.path.exists", return_value=True)
-@patch("cryptographing.crypting.Crypt.generateKey", return_value=b"mock_key")
-@patch("cryptographing.crypting.Crypt.decryptPassword", return_value="decryptedPassword123")
-def testExtractCredentials(mock_decrypt, mock_key, mock_exists, mock_file, mock_vault_data, mock_command_extract):
+@patch("cryptographing.crypting.Crypt.decryptWithCipher", return_value="decryptedPassword123")
+def testExtractCredentials(mock_decrypt, stored_vault, mock_command_extract):
     """
     Test extracting credentials from a vault.
     """
-    mock_file.return_value.read.return_value = json.dumps(mock_vault_data)
-    
     user = "testUser"
     response = Extractor.extractCredentials(user, mock_command_extract)
 
     assert response.status is True
     assert "Extracted credentials for example.com" in response.description
 
-@patch("builtins.open", new_callable=mock_open)
-@patch("os.path.exists", return_value=True)
-def testListUrlsInCategory(mock_exists, mock_file, mock_vault_data, mock_command_list):
+def testListUrlsInCategory(stored_vault, mock_command_list):
     """
     Test listing all stored URLs in a given vault category.
     """
-    mock_file.return_value.read.return_value = json.dumps(mock_vault_data)
-
     user = "testUser"
     response = Extractor.listUrlsInCategory(user, mock_command_list)
 
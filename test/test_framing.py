@@ -0,0 +1,85 @@
+import socket
+import pytest
+import threading
+from src.protocol.framing import MessageFraming, FrameDecoder, FramedSocket, FramingError
+from src.client import EchoClient
+from src.commands.command import Command
+from src.response.response import Response
+
+def testDecoderSplitsPipelinedMessages():
+    """
+    Test that several messages arriving in one read are decoded separately.
+    """
+    data = b"".join(frame for message in ("first", "second", "") for frame in MessageFraming.encodeFrames(message))
+
+    assert FrameDecoder().feed(data) == ["first", "second", ""]
+
+def testDecoderReassemblesPartialReads():
+    """
+    Test that a message delivered one byte at a time is only returned once complete.
+    """
+    decoder = FrameDecoder()
+    data = b"".join(MessageFraming.encodeFrames("hello"))
+
+    messages = []
+    for i in range(len(data)):
+        messages.extend(decoder.feed(data[i:i + 1]))
+
+    assert messages == ["hello"]
+    assert not decoder.hasPartialMessage()
+
+def testLargeMessageIsStreamedInChunks():
+    """
+    Test that a message larger than a chunk is split into several frames and reassembled.
+    """
+    message = ", ".join(f"site{i}.example.com" for i in range(5000))
+    frames = list(MessageFraming.encodeFrames(message))
+
+    assert len(frames) > 1
+    assert FrameDecoder().feed(b"".join(frames)) == [message]
+
+def testDecoderRejectsOversizedMessage():
+    """
+    Test that a frame announcing more than the maximum message size is refused.
+    """
+    header = MessageFraming.HEADER.pack(MessageFraming.FLAG_FINAL, MessageFraming.MAX_MESSAGE_SIZE + 1)
+
+    with pytest.raises(FramingError):
+        FrameDecoder().feed(header)
+
+def testFramedSocketPipelining():
+    """
+    Test that pipelined messages sent over a socket come out whole and in order.
+    """
+    left, right = socket.socketpair()
+    sender, receiver = FramedSocket(left), FramedSocket(right)
+
+    sender.sendMessages(["one", "two" * 10000, "three"])
+    sender.close()
+
+    assert [receiver.receiveMessage() for _ in range(3)] == ["one", "two" * 10000, "three"]
+    assert receiver.receiveMessage() is None
+    receiver.close()
+
+def testLargePipelineDoesNotDeadlock():
+    """
+    Test that a pipeline larger than both socket buffers completes against a peer that answers as it reads.
+    """
+    left, right = socket.socketpair()
+    left.settimeout(10)
+    client = EchoClient.__new__(EchoClient)
+    client.connection = FramedSocket(left)
+    server = FramedSocket(right)
+
+    def answerEach():
+        while (message := server.receiveMessage()) is not None:
+            server.sendMessage(Response(True, Command.fromJson(message).parameters[0] * 50000).toJson())
+
+    thread = threading.Thread(target=answerEach, daemon=True)
+    thread.start()
+
+    responses = client.pipeline([Command("get", [str(i % 10)] + ["padding" * 1000]) for i in range(200)])
+
+    assert [response.description[0] for response in responses] == [str(i % 10) for i in range(200)]
+    client.connection.close()
+    thread.join(5)
@@ -0,0 +1,113 @@
+import os
+import json
+from unittest.mock import patch
+from src.storage.logStore import LogStore, VaultLog
+
+def testAppendsAreVisibleAfterReopen(tmp_path):
+    """
+    Test that the index rebuilt from the segments matches what was written.
+    """
+    store = LogStore(str(tmp_path))
+    store.createVault("user", "work")
+    store.applyRecords("user", "work", [{"op": "put", "url": "a.com", "entry": {"username": "a", "password": "1"}}])
+    store.applyRecords("user", "work", [{"op": "put", "url": "b.com", "entry": {"username": "b", "password": "2"}}])
+    store.applyRecords("user", "work", [{"op": "del", "url": "a.com"}])
+
+    reopened = LogStore(str(tmp_path)).openVault("user", "work")
+
+    assert reopened.items() == {"b.com": {"username": "b", "password": "2"}}
+    assert reopened.deadRecords() == 2
+
+def testTornRecordIsDiscarded(tmp_path):
+    """
+    Test that a half-written record at the end of the log is cut off when the vault is opened.
+    """
+    vault = VaultLog(str(tmp_path / "work"))
+    vault.append([{"op": "put", "url": "a.com", "entry": {"username": "a", "password": "1"}}])
+
+    with open(vault.segmentPath(1), "ab") as file:
+        file.write(b'{"op":"put","url":"b.com","ent')
+
+    reopened = VaultLog(str(tmp_path / "work"))
+
+    assert reopened.urls() == ["a.com"]
+    reopened.append([{"op": "put", "url": "c.com", "entry": {"username": "c", "password": "3"}}])
+    assert VaultLog(str(tmp_path / "work")).urls() == ["a.com", "c.com"]
+
+def testCompactionKeepsOnlyLiveRecords(tmp_path):
+    """
+    Test that compaction rewrites the live records into a single segment.
+    """
+    vault = VaultLog(str(tmp_path / "work"))
+    for i in range(100):
+        vault.append([{"op": "put", "url": "a.com", "entry": {"username": "a", "password": str(i)}}])
+    vault.append([{"op": "put", "url": "b.com", "entry": {"username": "b", "password": "x"}}])
+
+    assert vault.needsCompaction(64, 0.5)
+    vault.compact()
+
+    assert vault.deadRecords() == 0
+    assert len(VaultLog.listSegmentIds(vault.directory)) == 1
+    assert VaultLog(str(tmp_path / "work")).get("a.com") == {"username": "a", "password": "99"}
+
+def testHeaderSurvivesCompactionAndReopen(tmp_path):
+    """
+    Test that the vault header is carried over by compaction and restored when the vault is opened.
+    """
+    vault = VaultLog(str(tmp_path / "work"))
+    vault.append([{"op": "header", "header": {"version": 1}}])
+    vault.append([{"op": "put", "url": "a.com", "entry": {"username": "a", "password": "1"}}])
+    vault.compact()
+
+    reopened = VaultLog(str(tmp_path / "work"))
+    assert reopened.getHeader() == {"version": 1}
+    assert reopened.deadRecords() == 0
+
+def testLeftoverSegmentsCannotShadowAReplacedVault(tmp_path):
+    """
+    Test that segments surviving a crash during a rewrite are ignored once the new segment exists.
+    """
+    vault = VaultLog(str(tmp_path / "work"))
+    vault.append([{"op": "put", "url": "a.com", "entry": {"username": "a", "password": "old"}}])
+    with open(vault.segmentPath(1), "rb") as file:
+        oldSegment = file.read()
+
+    vault.replace({"b.com": {"username": "b", "password": "new"}})
+    with open(vault.segmentPath(1), "wb") as file:
+        file.write(oldSegment)
+
+    assert VaultLog(str(tmp_path / "work")).items() == {"b.com": {"username": "b", "password": "new"}}
+
+def testLegacyVaultIsMigratedOnFirstOpen(tmp_path):
+    """
+    Test that a legacy JSON vault is converted into a segment and the old file removed.
+    """
+    os.makedirs(tmp_path / "user")
+    with open(tmp_path / "user" / "social.json", "w") as file:
+        json.dump({"a.com": {"username": "a", "password": "1"}}, file, indent=4)
+
+    store = LogStore(str(tmp_path))
+
+    assert store.listCategories("user") == ["social"]
+    assert store.openVault("user", "social").get("a.com") == {"username": "a", "password": "1"}
+    assert not os.path.exists(tmp_path / "user" / "social.json")
+
+def testVaultInUseIsNeverEvictedAndReopened(tmp_path):
+    """
+    Test that eviction only closes unused vaults, so a vault in use is never opened a second time.
+    """
+    store = LogStore(str(tmp_path))
+    store.createVault("user", "work")
+    store.createVault("user", "social")
+
+    with patch.object(LogStore, "MAX_OPEN_VAULTS", 1):
+        with store.useVault("user", "work") as work:
+            store.applyRecords("user", "social", [{"op": "put", "url": "b.com", "entry": {"username": "b", "password": "2"}}])
+            assert store.openVault("user", "work") is work
+            work.append([{"op": "put", "url": "a.com", "entry": {"username": "a", "password": "1"}}])
+
+        store.applyRecords("user", "social", [{"op": "put", "url": "c.com", "entry": {"username": "c", "password": "3"}}])
+
+        assert list(store.vaults) == [("user", "social")]
+        assert store.references == {}
+        assert store.getEntry("user", "work", "a.com") == {"username": "a", "password": "1"}
@@ -0,0 +1,97 @@
+import os
+import json
+import threading
+from unittest.mock import patch
+from serverlog.logWriter import LogWriter
+from serverlog.logger import Logger
+from response.response import Response
+
+def testRecordsFromManyThreadsAreWrittenWhole(tmp_path):
+    writer = LogWriter(str(tmp_path / "logs" / "log.txt"), flushInterval=60)
+    writer.start()
+
+    def logMany(thread):
+        for i in range(200):
+            writer.submit(f"thread {thread} record {i}\n")
+
+    threads = [threading.Thread(target=logMany, args=(thread,)) for thread in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+
+    lines = (tmp_path / "logs" / "log.txt").read_text().splitlines()
+    assert sorted(lines) == sorted(f"thread {t} record {i}" for t in range(8) for i in range(200))
+    assert writer.statistics() == {"queued": 0, "written": 1600, "dropped": 0}
+
+def testFlushWritesQueuedRecordsBeforeTheInterval(tmp_path):
+    writer = LogWriter(str(tmp_path / "log.txt"), flushInterval=60)
+    writer.start()
+    writer.submit("first\n")
+
+    assert writer.flush(timeout=5) is True
+    assert (tmp_path / "log.txt").read_text() == "first\n"
+    writer.close()
+
+def testRecordsAreDroppedAndCountedWhenTheQueueIsFull(tmp_path):
+    writer = LogWriter(str(tmp_path / "log.txt"), queueSize=2)
+
+    assert [writer.submit(f"{i}\n") for i in range(5)] == [True, True, False, False, False]
+    assert writer.statistics() == {"queued": 2, "written": 0, "dropped": 3}
+
+def testAlwaysPolicyFsyncsEveryBatch(tmp_path):
+    writer = LogWriter(str(tmp_path / "log.txt"), flushInterval=60, fsyncPolicy="always")
+
+    with patch("serverlog.logWriter.os.fsync") as mock_fsync:
+        writer.start()
+        writer.submit("record\n")
+        writer.flush(timeout=5)
+        writer.close()
+
+    assert mock_fsync.called
+
+def testLoggerDrainsOnShutdown(tmp_path):
+    with patch.object(Logger, "LOG_DIR", str(tmp_path)):
+        Logger.shutdown()
+        Logger.log("alice", "get", Response(True, "ok"))
+        Logger.log("alice", "find", Response(False, "missing"))
+        Logger.shutdown()
+
+        records = [json.loads(line) for line in (tmp_path / "audit.jsonl").read_text().splitlines()]
+
+    assert [(r["user"], r["command"], r["status"], r["message"]) for r in records] == [
+        ("alice", "get", True, "ok"), ("alice", "find", False, "missing")
+    ]
+
+def testFileIsHandedOverWhenItReachesTheRotationSize(tmp_path):
+    rotated = []
+
+    def archive(path):
+        rotated.append(open(path).read())
+        os.remove(path)
+
+    writer = LogWriter(str(tmp_path / "log.txt"), flushInterval=60, rotateBytes=10, onRotate=archive)
+    writer.start()
+    writer.submit("0123456789\n")
+    writer.flush(timeout=5)
+    writer.submit("next\n")
+    writer.close()
+
+    assert rotated == ["0123456789\n"]
+    assert (tmp_path / "log.txt").read_text() == "next\n"
+
+def testRotationSizeIsCountedInBytes(tmp_path):
+    rotated = []
+
+    def archive(path):
+        rotated.append(open(path, encoding="utf-8").read())
+        os.remove(path)
+
+    writer = LogWriter(str(tmp_path / "log.txt"), flushInterval=60, rotateBytes=10, onRotate=archive)
+    writer.start()
+    writer.submit("ééééé\n")
+    writer.flush(timeout=5)
+    writer.close()
+
+    assert rotated == ["ééééé\n"]
@@ -1,16 +1,53 @@
 from src.commands.authentication.register import Register
 from src.commands.authentication.login import Login
 from src.response.response import Response
-from unittest.mock import patch, mock_open
+from storage.accountStore import AccountStore
+from unittest.mock import patch
 
-@patch("os.path.exists", return_value=True)
-@patch("builtins.open", new_callable=mock_open, read_data='{"newuser": {"password": "encrypted123"}}')
 @patch("src.commands.authentication.login.Crypt.generateKey", return_value=b"key123")
 @patch("src.commands.authentication.login.Crypt.decryptPassword", return_value="mypassword")
-def testLoginUser(mock_decrypt, mock_key, mock_open_file, mock_exists):
+def testLoginUser(mock_decrypt, mock_key, account_store, login_hasher):
+    AccountStore.addAccount("newuser", {"password": "encrypted123"})
     command = type("Command", (object,), {"parameters": ["newuser", "mypassword"]})
     response = Login.loginUser(command)
 
     assert response.status is True
     assert "successfully logged in" in response.description
-    mock_open_file.assert_called()
\ No newline at end of file
+    mock_decrypt.assert_called_with("encrypted123", b"key123")
+
+def testLegacyAccountIsRehashedOnLogin(account_store, login_hasher):
+    with patch("src.commands.authentication.login.Crypt.decryptPassword", return_value="mypassword"):
+        AccountStore.addAccount("newuser", {"password": "encrypted123"})
+        Login.loginUser(type("Command", (object,), {"parameters": ["newuser", "mypassword"]}))
+
+    account = AccountStore.getAccount("newuser")
+    assert "password" not in account
+    assert account["passwordHash"].startswith("$argon2id$")
+
+    response = Login.loginUser(type("Command", (object,), {"parameters": ["newuser", "mypassword"]}))
+    assert response.status is True
+
+def testLoginWithWrongPassword(account_store, login_hasher):
+    AccountStore.addAccount("newuser", {"passwordHash": login_hasher.hashPassword("mypassword")})
+    response = Login.loginUser(type("Command", (object,), {"parameters": ["newuser", "wrong"]}))
+
+    assert response.status is False
+    assert "Wrong password" in response.description
+
+def testOutdatedHashIsUpgradedOnLogin(account_store, login_hasher):
+    outdatedHash = login_hasher.hashPassword("mypassword")
+    AccountStore.addAccount("newuser", {"passwordHash": outdatedHash})
+
+    with patch.dict(login_hasher.cost, {"timeCost": login_hasher.cost["timeCost"] + 1}):
+        response = Login.loginUser(type("Command", (object,), {"parameters": ["newuser", "mypassword"]}))
+
+    assert response.status is True
+    assert AccountStore.getAccount("newuser")["passwordHash"] != outdatedHash
+
+def testLoginUnknownUser(account_store):
+    AccountStore.addAccount("newuser", {"password": "encrypted123"})
+    command = type("Command", (object,), {"parameters": ["otheruser", "mypassword"]})
+    response = Login.loginUser(command)
+
+    assert response.status is False
+    assert "was not found" in response.description
@@ -0,0 +1,38 @@
+from unittest.mock import patch
+from utils.lruCache import LruCache
+
+def testLeastRecentlyUsedItemIsEvicted():
+    cache = LruCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats() == {"hits": 3, "misses": 1, "evictions": 1, "items": 2}
+
+def testGetOrCreateOnlyCreatesMissingItems():
+    cache = LruCache(4)
+    created = []
+
+    def create():
+        created.append(True)
+        return object()
+
+    first = cache.getOrCreate("key", create)
+    assert cache.getOrCreate("key", create) is first
+    assert len(created) == 1
+    assert cache.pop("key") is first
+    assert len(cache) == 0
+
+def testItemsExpireAfterTheTimeToLive():
+    cache = LruCache(4, ttl=10)
+    with patch("utils.lruCache.time.monotonic", return_value=100.0):
+        cache.put("key", "value")
+        assert cache.get("key") == "value"
+
+    with patch("utils.lruCache.time.monotonic", return_value=110.0):
+        assert cache.get("key") is None
+        assert len(cache) == 0
+        assert cache.getOrCreate("key", lambda: "fresh") == "fresh"
@@ -0,0 +1,67 @@
+import pytest
+from src.commands.entry.entryExractor import Extractor
+from src.commands.vault.vaultLister import VaultLister
+from src.commands.pagination import Pagination
+from src.response.response import Response
+from storage.vaultStorage import VaultStorage
+
+def listCommand(*parameters):
+    return type("Command", (), {"parameters": list(parameters)})()
+
+def testListCategoryPagesThroughSortedUrls(vault_storage):
+    VaultStorage.createVault("alice", "work")
+    for index in [5, 3, 9, 1, 7, 2, 8, 4, 6]:
+        VaultStorage.putEntry("alice", "work", f"site{index}.com", {"username": "user", "password": "encrypted"})
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        parameters = ["work", "4"] + ([cursor] if cursor else [])
+        response = Extractor.listUrlsInCategory("alice", listCommand(*parameters))
+        assert response.status is True
+        seen += response.description.split(": ", 1)[1].split(", ")
+        pages += 1
+        cursor = response.nextCursor
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == [f"site{index}.com" for index in range(1, 10)]
+
+def testCursorSurvivesConcurrentChanges(vault_storage):
+    VaultStorage.createVault("alice", "work")
+    for url in ["a.com", "b.com", "c.com", "d.com"]:
+        VaultStorage.putEntry("alice", "work", url, {"username": "user", "password": "encrypted"})
+
+    first = Extractor.listUrlsInCategory("alice", listCommand("work", "2"))
+    VaultStorage.deleteEntry("alice", "work", "b.com")
+    VaultStorage.putEntry("alice", "work", "bb.com", {"username": "user", "password": "encrypted"})
+    second = Extractor.listUrlsInCategory("alice", listCommand("work", "2", first.nextCursor))
+
+    assert first.description.endswith("a.com, b.com")
+    assert second.description.endswith("bb.com, c.com")
+    assert second.nextCursor is not None
+
+def testListVaultsIsPaginated(vault_storage):
+    for category in ["work", "default", "social"]:
+        VaultStorage.createVault("alice", category)
+
+    first = VaultLister.listVaults("alice", listCommand("2"))
+    second = VaultLister.listVaults("alice", listCommand("2", first.nextCursor))
+
+    assert first.description == "Available vaults: default, social"
+    assert second.description == "Available vaults: work"
+    assert second.nextCursor is None
+
+@pytest.mark.parametrize("parameters", [["0"], ["abc"], ["10", "not-a-cursor"]])
+def testInvalidPaginationParameters(parameters):
+    with pytest.raises(ValueError):
+        Pagination.parseArguments(parameters)
+
+def testNextCursorRoundTrip():
+    response = Response(True, "page", nextCursor=Pagination.encodeCursor("site.com"))
+    restored = Response.fromJson(response.toJson())
+
+    assert Pagination.decodeCursor(restored.nextCursor) == "site.com"
+    assert "nextCursor" not in Response(True, "last page").toDict()
@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import patch
+from src.commands.commandExecutor import CommandExecutor
+from src.commands.command import Command
+from commands.password.passwordAuditor import PasswordAuditor
+from commands.password.passwordSafetyChecker import SafetyChecker
+from response.response import Response
+
+@pytest.fixture
+def executor(vault_storage):
+    executor = CommandExecutor("auditUser")
+    entries = [
+        ("a.com", "Tr0ub4dor&3-horse-staple", "default"),
+        ("b.com", "Tr0ub4dor&3-horse-staple", "work"),
+        ("c.com", "123456", "work"),
+        ("d.com", "aaaaaaaaaaaaaaaa", "default"),
+        ("e.com", "k9#Vq!2mZ@x7Lp$w", "finance"),
+    ]
+    for url, password, category in entries:
+        assert executor.executeOperation(Command("save-password", [url, "user", password, category])).status
+    return executor
+
+def exposures(passwords):
+    return [42 if password == "123456" else 0 for password in passwords]
+
+def testAuditReportsReusedWeakAndBreachedPasswords(executor):
+    with patch.object(SafetyChecker, "exposureCounts", side_effect=exposures) as mock_counts:
+        response = executor.executeOperation(Command("audit"))
+
+    assert response.status is True
+    lines = response.description.split("\n")
+    assert lines[0] == "Audited 5 passwords in 3 vault(s): 2 reused in 1 group(s), 2 weak, 1 breached."
+    assert lines[1] == "Reused: default/a.com, work/b.com"
+    assert lines[2] == "Weak: default/d.com, work/c.com"
+    assert lines[3] == "Breached: work/c.com (42 times)"
+    assert len(mock_counts.call_args.args[0]) == 4
+
+def testAuditStreamsProgressAndReportsBreachCheckErrors(executor):
+    updates = []
+    failure = Response(False, "API key is missing. Set ENZOIC_API_KEY in environment variables.")
+
+    with patch.object(PasswordAuditor, "CHUNK_SIZE", 2), \
+         patch.object(SafetyChecker, "exposureCounts", side_effect=lambda passwords: [failure] * len(passwords)):
+        response = executor.executeOperation(Command("audit"), updates.append)
+
+    assert [Response.fromJson(update.toJson()).partial for update in updates] == [True, True, True]
+    assert updates[-1].description == "Audit: breach-checked 4/4 distinct passwords..."
+    assert response.status is True and response.partial is False
+    assert response.description.endswith(f"Breach check incomplete: {failure.description}")
+
+def testAuditRequiresSavedPasswords(vault_storage):
+    response = CommandExecutor("nobody").executeOperation(Command("audit"))
+
+    assert response.status is False
+
+def testAuditSkipsRemoteBreachChecksAboveTheCap(executor, monkeypatch):
+    monkeypatch.delenv(SafetyChecker.CORPUS_ENV, raising=False)
+
+    with patch.object(PasswordAuditor, "MAX_REMOTE_CHECKS", 3), \
+         patch.object(SafetyChecker, "exposureCounts") as mock_counts:
+        response = executor.executeOperation(Command("audit"))
+
+    mock_counts.assert_not_called()
+    assert response.description.split("\n")[0].endswith("0 breached.")
+    assert response.description.endswith(
+        "Breach check skipped: 4 distinct passwords exceed the 3 remote lookups an audit may make. "
+        "Set BREACH_CORPUS_DIR to a local breach corpus to check them all."
+    )
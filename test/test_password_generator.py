@@ -0,0 +1,87 @@
+import string
+import pytest
+from unittest.mock import patch
+from src.commands.commandExecutor import CommandExecutor
+from src.commands.command import Command
+from commands.password.passwordGenerator import PasswordGenerator, PasswordPolicy
+from storage.vaultStorage import VaultStorage
+
+def testGeneratedPasswordsContainEveryRequiredClass():
+    passwords = PasswordGenerator.generateMany(200, PasswordPolicy(length=8))
+
+    assert len(set(passwords)) == 200
+    for password in passwords:
+        assert len(password) == 8
+        assert any(c in string.ascii_lowercase for c in password)
+        assert any(c in string.ascii_uppercase for c in password)
+        assert any(c in string.digits for c in password)
+        assert any(c in PasswordPolicy.CLASSES["s"] for c in password)
+
+def testBatchIsDrawnWithOneUrandomCall():
+    with patch("commands.password.passwordGenerator.os.urandom", wraps=__import__("os").urandom) as mock_urandom:
+        PasswordGenerator.generateMany(50)
+
+    mock_urandom.assert_called_once()
+
+def testPolicyExcludesAmbiguousCharacters():
+    policy = PasswordPolicy(length=32, requiredClasses="luds", excludeAmbiguous=True)
+
+    for password in PasswordGenerator.generateMany(100, policy):
+        assert not set(password) & set(PasswordPolicy.AMBIGUOUS)
+
+def testPronounceablePasswordsAlternateConsonantsAndVowels():
+    for password in PasswordGenerator.generateMany(20, PasswordPolicy(length=12, requiredClasses="lds", pronounceable=True)):
+        letters = password[:9]
+        assert all(c in PasswordPolicy.CONSONANTS for c in letters[::2])
+        assert all(c in PasswordPolicy.VOWELS for c in letters[1::2])
+        assert password[9:11].isdigit() and password[11] in PasswordPolicy.PRONOUNCEABLE_SPECIALS
+
+@pytest.mark.parametrize("pronounceable", [False, True])
+@pytest.mark.parametrize("classes", ["l", "u", "d", "s", "lu", "ud", "ls", "luds"])
+def testEveryRequiredClassIsPresentInBothModes(classes, pronounceable):
+    policy = PasswordPolicy(length=10, requiredClasses=classes, excludeAmbiguous=True, pronounceable=pronounceable)
+
+    for password in PasswordGenerator.generateMany(50, policy):
+        for requiredClass in classes:
+            assert any(c in PasswordPolicy.CLASSES[requiredClass] for c in password), (classes, password)
+
+def testPronounceablePolicyTooShortForItsClassesIsRejected():
+    with pytest.raises(ValueError):
+        PasswordPolicy(length=4, requiredClasses="luds", pronounceable=True).layout()
+
+@pytest.mark.parametrize("options", [["length=2"], ["classes=x"], ["colour=blue"], ["length=abc"]])
+def testInvalidPolicyOptionsAreRejected(options):
+    with pytest.raises(ValueError):
+        PasswordPolicy.fromOptions(options)
+
+def testGenerateBatchSavesAllPasswordsWithOneVaultWrite(vault_storage):
+    executor = CommandExecutor("batchUser")
+    command = Command("generate-batch", ["work", "alice", "a.com", "b.com", "c.com", "length=20", "no-ambiguous"])
+
+    with patch.object(VaultStorage, "writeRecords", wraps=VaultStorage.writeRecords) as mock_write:
+        response = executor.executeOperation(command)
+
+    assert response.status is True
+    mock_write.assert_called_once()
+    passwords = set()
+    for url in ("a.com", "b.com", "c.com"):
+        extracted = executor.executeOperation(Command("get", ["password", url, "work"]))
+        assert extracted.status is True
+        passwords.add(extracted.description)
+    assert len(passwords) == 3
+
+def testGenerateBatchRejectsAnInvalidPolicy(vault_storage):
+    response = CommandExecutor("batchUser").executeOperation(Command("generate-batch", ["work", "alice", "a.com", "length=3"]))
+
+    assert response.status is False
+    assert response.description.startswith("Invalid password policy")
+
+def testGenerateBatchKeepsWebsitesWithAQueryString(vault_storage):
+    executor = CommandExecutor("batchUser")
+    command = Command("generate-batch", ["work", "bob", "example.com/login?next=home", "length=20"])
+
+    response = executor.executeOperation(command)
+
+    assert response.status is True
+    extracted = executor.executeOperation(Command("get", ["password", "example.com/login?next=home", "work"]))
+    assert extracted.status is True and "example.com/login?next=home" in extracted.description
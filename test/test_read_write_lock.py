@@ -0,0 +1,74 @@
+import threading
+import time
+from storage.readWriteLock import LockStats, ReadWriteLock
+from storage.vaultStorage import VaultStorage
+
+def testReadersShareTheLock():
+    lock = ReadWriteLock()
+    inside = threading.Barrier(3, timeout=2)
+
+    def read():
+        with lock.reading():
+            inside.wait()
+
+    threads = [threading.Thread(target=read) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not inside.broken
+
+def testWriterExcludesReadersAndRecordsWait():
+    stats = LockStats()
+    lock = ReadWriteLock(stats)
+    events = []
+
+    def read():
+        with lock.reading():
+            events.append("read")
+
+    lock.acquireWrite()
+    reader = threading.Thread(target=read)
+    reader.start()
+    time.sleep(0.05)
+    events.append("write-done")
+    lock.releaseWrite()
+    reader.join()
+
+    assert events == ["write-done", "read"]
+    snapshot = stats.snapshot()
+    assert snapshot["writes"] == 1 and snapshot["reads"] == 1
+    assert snapshot["contended"] == 1
+    assert snapshot["maxWaitMs"] > 0
+
+def testWriterCanReenter():
+    lock = ReadWriteLock()
+
+    with lock.writing():
+        with lock.writing():
+            with lock.reading():
+                pass
+
+    with lock.writing():
+        pass
+
+def testConcurrentReadModifyWriteLosesNoUpdates(vault_storage):
+    VaultStorage.createVault("alice", "default")
+    VaultStorage.putEntry("alice", "default", "site", {"username": "a", "count": 0})
+
+    def increment():
+        for _ in range(25):
+            with VaultStorage.lockVault("alice", "default"):
+                entry = VaultStorage.getEntry("alice", "default", "site")
+                VaultStorage.putEntry("alice", "default", "site", {**entry, "count": entry["count"] + 1})
+
+    threads = [threading.Thread(target=increment) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    VaultStorage.cache.clear()
+    assert VaultStorage.getEntry("alice", "default", "site")["count"] == 200
+    assert VaultStorage.lockStatistics()["writes"] > 0
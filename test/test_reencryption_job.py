@@ -0,0 +1,122 @@
+import time
+import base64
+import hashlib
+from unittest.mock import patch
+from cryptography.fernet import Fernet
+from cryptographing.reencryptionJob import ReencryptionJob, reencryptTokens
+from cryptographing.vaultCipher import VaultCipher
+from cryptographing.vaultKeyring import VaultKeyring
+from storage.vaultStorage import VaultStorage
+from storage.storeLock import StoreLock
+from utils.tokenBucket import TokenBucket
+
+def keyOf(seed):
+    return base64.urlsafe_b64encode(hashlib.sha256(seed.encode()).digest())
+
+def oldKeyFor(user):
+    return keyOf("old-" + user)
+
+def newKeyFor(user):
+    return keyOf("new-" + user)
+
+def saveVault(user, category, passwords):
+    VaultStorage.createVault(user, category)
+    cipher = Fernet(oldKeyFor(user))
+    VaultStorage.applyRecords(user, category, [
+        {"op": "put", "url": url, "entry": {"username": user, "password": cipher.encrypt(password.encode()).decode()}}
+        for url, password in passwords.items()
+    ])
+
+def decryptVault(user, category, userKey):
+    cipher = VaultCipher(VaultKeyring.unwrapHeader(VaultStorage.getVaultHeader(user, category), VaultCipher(userKey)))
+    return {url: cipher.decrypt(entry["password"].encode()).decode() for url, entry in VaultStorage.loadVault(user, category).items()}
+
+def testReencryptTokensIsIdempotent():
+    oldToken = Fernet(keyOf("old")).encrypt(b"secret").decode()
+    newToken = VaultCipher(keyOf("new")).encrypt(b"other").decode()
+    foreignToken = Fernet(keyOf("foreign")).encrypt(b"lost").decode()
+
+    rotated, kept, unreadable = reencryptTokens([keyOf("old")], keyOf("new"), [oldToken, newToken, foreignToken])
+
+    assert rotated.startswith("2.")
+    assert VaultCipher(keyOf("new")).decrypt(rotated.encode()) == b"secret"
+    assert kept == newToken
+    assert unreadable is None
+
+def testJobRotatesEveryVaultAndResumes(vault_storage, tmp_path_factory):
+    checkpoints = str(tmp_path_factory.mktemp("checkpoints"))
+    saveVault("alice", "work", {f"site{i}.com": f"password{i}" for i in range(30)})
+    saveVault("alice", "social", {"a.com": "1"})
+    saveVault("bob", "default", {"b.com": "2"})
+    reports = []
+
+    job = ReencryptionJob(oldKeyFor, newKeyFor, checkpoints, workers=1, chunkSize=8, progress=reports.append)
+    report = job.run()
+
+    assert report["users"] == 2 and report["usersDone"] == 2
+    assert report["vaults"] == 3 and report["entries"] == 32
+    assert report["failedVaults"] == []
+    assert [progress["vaults"] for progress in reports] == [1, 2, 3]
+    assert decryptVault("alice", "work", newKeyFor("alice"))["site7.com"] == "password7"
+    assert decryptVault("bob", "default", newKeyFor("bob")) == {"b.com": "2"}
+
+    VaultStorage.cache.clear()
+    with patch.object(VaultStorage, "replaceVault") as mock_replace:
+        report = ReencryptionJob(oldKeyFor, newKeyFor, checkpoints, workers=1).run()
+
+    assert report["usersSkipped"] == 2
+    mock_replace.assert_not_called()
+
+def testJobOnlyRewrapsVaultsWithDataKey(vault_storage, tmp_path_factory):
+    VaultStorage.createVault("alice", "work")
+    keyring = VaultKeyring("alice", VaultCipher(oldKeyFor("alice")))
+    VaultStorage.putEntry("alice", "work", "a.com", {"username": "alice", "password": keyring.cipherFor("work").encrypt(b"secret").decode()})
+    before = VaultStorage.loadVault("alice", "work")
+
+    with patch.object(VaultStorage, "replaceVault") as mock_replace:
+        report = ReencryptionJob(oldKeyFor, newKeyFor, str(tmp_path_factory.mktemp("checkpoints")), workers=1).run()
+
+    mock_replace.assert_not_called()
+    assert report["rewrappedVaults"] == 1 and report["entries"] == 0
+    assert VaultStorage.loadVault("alice", "work") == before
+    assert decryptVault("alice", "work", newKeyFor("alice")) == {"a.com": "secret"}
+
+def testJobLeavesVaultWithUnreadablePasswordUntouched(vault_storage, tmp_path_factory):
+    checkpoints = tmp_path_factory.mktemp("checkpoints")
+    saveVault("alice", "work", {"a.com": "1", "b.com": "2"})
+    foreignToken = Fernet(keyOf("foreign")).encrypt(b"3").decode()
+    VaultStorage.putEntry("alice", "work", "c.com", {"username": "alice", "password": foreignToken})
+    before = VaultStorage.loadVault("alice", "work")
+
+    report = ReencryptionJob(oldKeyFor, newKeyFor, str(checkpoints), workers=1).run()
+
+    assert report["usersDone"] == 0
+    assert [failure["category"] for failure in report["failedVaults"]] == ["work"]
+    VaultStorage.cache.clear()
+    assert VaultStorage.loadVault("alice", "work") == before
+
+    assert list(checkpoints.iterdir()) == []
+
+def testTokenBucketLimitsRate():
+    bucket = TokenBucket(rate=100, capacity=10)
+
+    assert bucket.tryAcquire(10) is True
+    assert bucket.tryAcquire(5) is False
+
+    start = time.monotonic()
+    bucket.acquire(5)
+    assert time.monotonic() - start >= 0.04
+
+def testKeyRotationAndServersExcludeEachOther(tmp_path):
+    path = str(tmp_path / "store.lock")
+    firstServer, secondServer, rotation = StoreLock(path), StoreLock(path), StoreLock(path)
+
+    assert firstServer.acquire(exclusive=False)
+    assert secondServer.acquire(exclusive=False)
+    assert not rotation.acquire(exclusive=True)
+
+    firstServer.release()
+    secondServer.release()
+    assert rotation.acquire(exclusive=True)
+    assert not firstServer.acquire(exclusive=False)
+    rotation.release()
@@ -45,3 +45,13 @@ def test_response_from_json_missing_fields():
     assert response.status is False
     assert response.description == "No description provided."
 
+def testResponseResultsRoundTrip():
+    """
+    Test that the per sub-command results of a batch response survive serialization.
+    """
+    response = Response(True, "Batch executed", [Response(True, "Saved"), Response(False, "Not found")])
+    restored = Response.fromJson(response.toJson())
+
+    assert [result.status for result in restored.results] == [True, False]
+    assert restored.results[1].description == "Not found"
+    assert "results" not in json.loads(Response(True, "Plain").toJson())
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from src.commands.password.passwordSafetyChecker import SafetyChecker
+from utils.lruCache import LruCache
+from utils.tokenBucket import TokenBucket
+
+def sha256(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+class StandInApi(BaseHTTPRequestHandler):
+    """Answers like the Enzoic password API, after rate limiting the first `throttled` requests."""
+
+    exposures = {sha256("password"): 12, sha256("letmein"): 3}
+    requests = []
+    throttled = 0
+
+    def do_POST(self):
+        prefix = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["partialSHA256"]
+        StandInApi.requests.append(prefix)
+
+        if StandInApi.throttled > 0:
+            StandInApi.throttled -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        candidates = [{"sha256": hashed, "exposureCount": count} for hashed, count in StandInApi.exposures.items() if hashed.startswith(prefix)]
+        body = json.dumps({"candidates": candidates}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def stand_in_api(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInApi)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    StandInApi.requests = []
+    StandInApi.throttled = 0
+    monkeypatch.delenv(SafetyChecker.CORPUS_ENV, raising=False)
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    monkeypatch.setenv("ENZOIC_API_KEY", "test-key")
+    monkeypatch.setenv(SafetyChecker.API_URL_ENV, f"http://127.0.0.1:{server.server_address[1]}/v1/passwords")
+
+    with patch.object(SafetyChecker, "candidateCache", LruCache(16, ttl=60)), \
+         patch.object(SafetyChecker, "rateLimiter", TokenBucket(1000)), \
+         patch.object(SafetyChecker, "session", None):
+        yield StandInApi
+        SafetyChecker.session.close()
+
+    server.shutdown()
+    server.server_close()
+
+def testRemoteLookupsAreCachedByPrefix(stand_in_api):
+    exposed = SafetyChecker.checkPasswordSecurity("password")
+    again = SafetyChecker.checkPasswordSecurity("password")
+    safe = SafetyChecker.checkPasswordSecurity("a much better passphrase")
+
+    assert not exposed.status and "12 times" in exposed.description
+    assert not again.status and "12 times" in again.description
+    assert safe.status
+    assert stand_in_api.requests == [sha256("password")[:10], sha256("a much better passphrase")[:10]]
+
+def testBatchCheckSharesLookupsAndBacksOffWhenRateLimited(stand_in_api):
+    stand_in_api.throttled = 2
+    passwords = ["password", "letmein", "password", "correct horse battery staple"]
+
+    responses = SafetyChecker.checkPasswordsSecurity(passwords, concurrency=2)
+
+    assert [response.status for response in responses] == [False, False, False, True]
+    assert "3 times" in responses[1].description
+    assert sorted(set(stand_in_api.requests)) == sorted({sha256(password)[:10] for password in passwords})
+    assert len(stand_in_api.requests) == 3 + 2
+
+def testSingleCheckReportsRateLimit(stand_in_api):
+    stand_in_api.throttled = 1
+
+    response = SafetyChecker.checkPasswordSecurity("password")
+
+    assert not response.status and response.description == "Too many requests. Please try again later."
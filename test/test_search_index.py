@@ -0,0 +1,59 @@
+from src.commands.entry.entryExractor import Extractor
+from storage.searchIndex import SearchIndex
+from storage.vaultStorage import VaultStorage
+
+URLS = {
+    "https://github.com": "work",
+    "gist.github.com": "work",
+    "www.gitlab.com": "default",
+    "google.com": "default",
+    "mail.google.com": "social",
+}
+
+def buildIndex():
+    index = SearchIndex()
+    loadUser = lambda user: {"work": ["https://github.com", "gist.github.com"], "default": ["www.gitlab.com", "google.com"], "social": ["mail.google.com"]}
+    return index, loadUser
+
+def testPrefixMatchesRankBeforeSubstringAndFuzzyMatches():
+    index, loadUser = buildIndex()
+
+    results, hasMore = index.search("alice", "github", loadUser)
+
+    assert [url for url, _ in results] == ["https://github.com", "gist.github.com"]
+    assert results[0][1] == ["work"]
+    assert hasMore is False
+
+def testTypoTolerantMatch():
+    index, loadUser = buildIndex()
+
+    results, _ = index.search("alice", "githb.com", loadUser)
+
+    assert "https://github.com" in [url for url, _ in results]
+
+def testSearchIsPaginatedAndFollowsMutations():
+    index, loadUser = buildIndex()
+    index.search("alice", "g", loadUser)
+
+    index.applyRecords("alice", "default", [{"op": "del", "url": "www.gitlab.com"}])
+    index.applyRecords("alice", "work", [{"op": "put", "url": "gitea.io", "entry": {}}])
+
+    firstPage, firstHasMore = index.search("alice", "g", loadUser, 0, 2)
+    secondPage, secondHasMore = index.search("alice", "g", loadUser, 2, 2)
+
+    assert (firstHasMore, secondHasMore) == (True, False)
+    assert [url for url, _ in firstPage + secondPage] == ["gist.github.com", "gitea.io", "https://github.com", "google.com"]
+    assert "www.gitlab.com" not in [url for url, _ in index.search("alice", "gitlab", loadUser)[0]]
+
+def testSearchCommand(vault_storage):
+    for url, category in URLS.items():
+        VaultStorage.createVault("alice", category)
+        VaultStorage.putEntry("alice", category, url, {"username": "user", "password": "encrypted"})
+
+    response = Extractor.searchUrls("alice", type("Command", (object,), {"parameters": ["google"]}))
+    missing = Extractor.searchUrls("alice", type("Command", (object,), {"parameters": ["zzz"]}))
+
+    assert response.status is True
+    assert response.description.index("google.com") < response.description.index("mail.google.com")
+    assert "mail.google.com (social)" in response.description
+    assert missing.status is False
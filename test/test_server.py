@@ -0,0 +1,41 @@
+import time
+import socket
+import threading
+from unittest.mock import patch
+from src.server import Server
+from src.protocol.framing import FramedSocket
+from src.response.response import Response
+
+def waitFor(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for the server."
+        time.sleep(0.01)
+
+@patch("serverlog.logger.Logger.log")
+def testServerRejectsClientsWhenQueueIsFull(mock_log):
+    """
+    Test that once every worker is busy and the queue is full, new clients get a busy response.
+    """
+    server = Server("127.0.0.1", 0, workers=1, queueSize=1)
+    threading.Thread(target=server.start, daemon=True).start()
+
+    served = socket.create_connection(("127.0.0.1", server.port))
+    waitFor(lambda: server.getStats()["active"] == 1)
+
+    waiting = socket.create_connection(("127.0.0.1", server.port))
+    waitFor(lambda: server.getStats()["queued"] == 1)
+
+    rejected = FramedSocket(socket.create_connection(("127.0.0.1", server.port)))
+    response = Response.fromJson(rejected.receiveMessage())
+
+    assert response.status is False
+    assert response.description == Server.BUSY_MESSAGE
+    assert server.getStats()["rejected"] == 1
+
+    served.close()
+    waitFor(lambda: server.getStats() == {"active": 1, "queued": 0, "rejected": 1, "served": 1})
+
+    waiting.close()
+    rejected.close()
+    server.stop()
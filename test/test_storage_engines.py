@@ -0,0 +1,96 @@
+import os
+import sys
+import pytest
+import subprocess
+from unittest.mock import patch
+from src.commands.command import Command
+from src.commands.entry.entrySaver import EntrySaver
+from src.commands.entry.entryExractor import Extractor
+from storage.vaultStorage import VaultStorage
+from storage.logStore import LogStore
+from storage.sqliteStore import SqliteStore
+
+@pytest.fixture(params=["file", "sqlite"])
+def engine(request, tmp_path):
+    engine = LogStore(str(tmp_path / "vaults")) if request.param == "file" else SqliteStore(str(tmp_path / "vaults.db"))
+    yield engine
+    engine.close()
+
+def testEngineEntryOperations(engine):
+    """
+    Test the storage interface contract shared by every engine.
+    """
+    assert not engine.userExists("user")
+    assert engine.createVault("user", "work") is True
+    assert engine.createVault("user", "work") is False
+
+    engine.putEntry("user", "work", "a.com", {"username": "a", "password": "1"})
+    engine.applyRecords("user", "work", [
+        {"op": "put", "url": "b.com", "entry": {"username": "b", "password": "2"}},
+        {"op": "put", "url": "a.com", "entry": {"username": "a", "password": "3"}}
+    ])
+
+    assert engine.userExists("user")
+    assert engine.listCategories("user") == ["work"]
+    assert engine.getEntry("user", "work", "a.com") == {"username": "a", "password": "3"}
+    assert sorted(engine.listUrls("user", "work")) == ["a.com", "b.com"]
+
+    assert engine.deleteEntry("user", "work", "a.com") is True
+    assert engine.deleteEntry("user", "work", "a.com") is False
+    assert engine.loadVault("user", "work") == {"b.com": {"username": "b", "password": "2"}}
+
+def testEngineMissingVault(engine):
+    """
+    Test that every engine reports a missing vault the same way.
+    """
+    assert not engine.vaultExists("user", "finance")
+
+    with pytest.raises(FileNotFoundError):
+        engine.getEntry("user", "finance", "a.com")
+
+def testCommandsRunOnSqliteEngine(tmp_path):
+    """
+    Test that the vault commands work unchanged on top of the SQLite engine.
+    """
+    with patch.object(VaultStorage, "engine", SqliteStore(str(tmp_path / "vaults.db"))):
+        saved = EntrySaver.savePassword("sqlUser", Command("save-password", ["example.com", "me", "secret", "work"]))
+        VaultStorage.cache.clear()
+        response = Extractor.extractCredentials("sqlUser", Command("get", ["both", "example.com", "work"]))
+
+    assert saved.status is True
+    assert response.status is True
+    assert "secret" in response.description
+
+def testEngineReplaceVault(engine):
+    """
+    Test that replacing a vault swaps its whole content and header, and that its owner is listed.
+    """
+    engine.createVault("user", "work")
+    engine.applyRecords("user", "work", [
+        {"op": "put", "url": "a.com", "entry": {"username": "a", "password": "1"}},
+        {"op": "put", "url": "b.com", "entry": {"username": "b", "password": "2"}}
+    ])
+
+    engine.setVaultHeader("user", "work", {"version": 1})
+    assert engine.getVaultHeader("user", "work") == {"version": 1}
+
+    engine.replaceVault("user", "work", {"b.com": {"username": "b", "password": "3"}, "c.com": {"username": "c", "password": "4"}}, {"version": 2})
+
+    assert engine.getVaultHeader("user", "work") == {"version": 2}
+    assert engine.listUsers() == ["user"]
+    assert engine.loadVault("user", "work") == {"b.com": {"username": "b", "password": "3"}, "c.com": {"username": "c", "password": "4"}}
+
+def testImportingVaultStorageCreatesNoEngine():
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    probe = "from storage.vaultStorage import VaultStorage; print(VaultStorage.engine is None)"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=src, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "True"
+
+def testDefaultEngineIsCreatedOnFirstUse(tmp_path):
+    with patch.object(VaultStorage, "engine", None), patch.object(VaultStorage, "VAULTS_DIR", str(tmp_path / "vaults")):
+        engine = VaultStorage.getEngine()
+
+        assert isinstance(engine, LogStore)
+        assert VaultStorage.getEngine() is engine
+    engine.close()
@@ -0,0 +1,61 @@
+import time
+import pytest
+from strength.strengthData import StrengthData
+from strength.strengthEstimator import StrengthEstimator
+from src.commands.password.passwordSafetyChecker import SafetyChecker
+
+def testCompiledDataMatchesTheWordLists():
+    with open(StrengthData.COMPILED_PATH, "rb") as compiled:
+        assert compiled.read() == StrengthData.compile()
+
+def testCompiledDataAnswersLookups():
+    data = StrengthData.parse(StrengthData.compile())
+
+    assert data.lookup("password") == (2, "passwords")
+    assert data.lookup("passw") == (0, None)
+    assert data.lookup("zzzq")[0] == -1
+    assert data.graphs["qwerty"]["q"] == [None, "1!", "2@", "wW", "aA", None]
+
+    with pytest.raises(ValueError):
+        StrengthData.parse(b"nonsense")
+
+@pytest.mark.parametrize("password, pattern", [
+    ("password", "dictionary"),
+    ("P@ssw0rd", "dictionary"),
+    ("Michael", "dictionary"),
+    ("zxcvfr", "spatial"),
+    ("aaaaaaaaaa", "repeat"),
+    ("lmnopq", "sequence"),
+    ("19/04/1987", "date"),
+])
+def testPredictablePasswordsAreWeak(password, pattern):
+    estimate = StrengthEstimator.estimate(password)
+
+    assert estimate.score < StrengthEstimator.WEAK_SCORE
+    assert [match.pattern for match in estimate.sequence] == [pattern]
+    assert estimate.warning
+
+def testRandomAndPassphrasePasswordsAreStrong():
+    for password in ["k9#Vq!2mZ@x7Lp$w", "correcthorsebatterystaple"]:
+        estimate = StrengthEstimator.estimate(password)
+        assert estimate.score == 4 and estimate.warning == ""
+
+    words = StrengthEstimator.estimate("correcthorsebatterystaple").sequence
+    assert [match.token for match in words] == ["correct", "horse", "battery", "staple"]
+
+def testEstimatesTakeWellUnderAMillisecond():
+    passwords = ["password1", "k9#Vq!2mZ@x7Lp$w", "correcthorsebatterystaple", "michael1987", "qwerty12345"] * 40
+    StrengthEstimator.estimate("warm up")
+
+    start = time.perf_counter()
+    for password in passwords:
+        StrengthEstimator.estimate(password)
+
+    assert (time.perf_counter() - start) / len(passwords) < 0.001
+
+def testSafetyCheckerReportsWeakPasswordsOffline():
+    weak = SafetyChecker.checkPasswordStrength("qwerty123")
+    strong = SafetyChecker.checkPasswordStrength("k9#Vq!2mZ@x7Lp$w")
+
+    assert weak.status is False and "This is a very common password." in weak.description
+    assert strong.status is True
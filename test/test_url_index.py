@@ -0,0 +1,73 @@
+from unittest.mock import patch
+from src.commands.entry.entryExractor import Extractor
+from src.commands.entry.entryRemover import EntryRemover
+from storage.urlIndex import UrlIndex
+from storage.vaultStorage import VaultStorage
+
+def saveEntries(user, entries):
+    for category, url in entries:
+        VaultStorage.createVault(user, category)
+        VaultStorage.putEntry(user, category, url, {"username": "user", "password": "encrypted"})
+
+def testFindCategoriesIsBuiltFromVaultsAndKeptCurrent(vault_storage):
+    saveEntries("alice", [("default", "example.com"), ("work", "example.com"), ("work", "other.com")])
+    VaultStorage.cache.clear()
+
+    assert VaultStorage.findCategories("alice", "example.com") == ["default", "work"]
+
+    saveEntries("alice", [("social", "example.com")])
+    VaultStorage.deleteEntry("alice", "default", "example.com")
+
+    with patch.object(VaultStorage, "listUserUrls") as mock_load:
+        assert VaultStorage.findCategories("alice", "example.com") == ["social", "work"]
+        assert VaultStorage.findCategories("alice", "missing.com") == []
+    mock_load.assert_not_called()
+
+def testRemoveAllOnlyTouchesVaultsHoldingTheUrl(vault_storage):
+    saveEntries("alice", [("default", "example.com"), ("work", "other.com"), ("social", "example.com")])
+
+    command = type("Command", (object,), {"parameters": ["example.com"]})
+    with patch.object(VaultStorage, "deleteEntry", wraps=VaultStorage.deleteEntry) as mock_delete:
+        response = EntryRemover.removeAll("alice", command)
+
+    assert response.status is True
+    assert "2 vault(s)" in response.description
+    assert sorted(call.args[1] for call in mock_delete.call_args_list) == ["default", "social"]
+    assert VaultStorage.findCategories("alice", "example.com") == []
+
+def testFindCommand(vault_storage):
+    saveEntries("alice", [("work", "example.com")])
+
+    found = Extractor.findUrl("alice", type("Command", (object,), {"parameters": ["example.com"]}))
+    missing = Extractor.findUrl("alice", type("Command", (object,), {"parameters": ["missing.com"]}))
+
+    assert found.status is True
+    assert "work" in found.description
+    assert missing.status is False
+
+def testMutationsDuringBuildAreReplayed():
+    index = UrlIndex()
+
+    def loadUser(user):
+        index.applyRecords(user, "work", [{"op": "put", "url": "late.com", "entry": {}}])
+        index.applyRecords(user, "default", [{"op": "del", "url": "early.com"}])
+        return {"default": ["early.com"]}
+
+    assert index.categoriesFor("alice", "late.com", loadUser) == ["work"]
+    assert index.categoriesFor("alice", "early.com", loadUser) == []
+
+def testConcurrentBuildsOfOneUserEachReplayTheirMutations():
+    index = UrlIndex()
+
+    def loadQuickly(user):
+        return {"default": []}
+
+    def loadSlowly(user):
+        index.build(user, loadQuickly)
+        index.applyRecords(user, "work", [{"op": "put", "url": "late.com", "entry": {}}])
+        return {"default": []}
+
+    index.build("alice", loadSlowly)
+
+    assert index.categoriesFor("alice", "late.com", loadQuickly) == ["work"]
+    assert index.building == {}
@@ -0,0 +1,54 @@
+import pytest
+from unittest.mock import patch
+from src.storage.vaultCache import VaultCache
+from src.commands.command import Command
+from src.commands.entry.entrySaver import EntrySaver
+from src.commands.entry.entryExractor import Extractor
+from storage.vaultStorage import VaultStorage
+
+def testCacheCountsHitsAndMisses():
+    """
+    Test that lookups are counted as hits or misses and return copies.
+    """
+    cache = VaultCache()
+    assert cache.get("user", "default") is None
+
+    cache.put("user", "default", {"example.com": {"username": "a", "password": "b"}})
+    cached = cache.get("user", "default")
+    cached["other.com"] = {}
+
+    assert "other.com" not in cache.get("user", "default")
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+def testCacheEvictsLeastRecentlyUsedOverBudget():
+    """
+    Test that the least recently used vault is evicted once the memory budget is exceeded.
+    """
+    vault = {"example.com": {"username": "a", "password": "b"}}
+    cache = VaultCache(maxBytes=3 * VaultCache.estimateSize(vault))
+
+    cache.put("user", "default", vault)
+    cache.put("user", "work", vault)
+    cache.put("user", "social", vault)
+    cache.get("user", "default")
+    cache.put("user", "finance", vault)
+
+    assert cache.contains("user", "default")
+    assert not cache.contains("user", "work")
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= cache.maxBytes
+
+def testReadsAfterWriteDoNotTouchDisk(vault_storage):
+    """
+    Test that a vault written through the storage layer is read back from memory.
+    """
+    saved = EntrySaver.savePassword("cachedUser", Command("save-password", ["example.com", "me", "secret", "work"]))
+    assert saved.status is True
+
+    with patch("builtins.open", side_effect=AssertionError("disk was touched")):
+        response = Extractor.extractCredentials("cachedUser", Command("get", ["password", "example.com", "work"]))
+
+    assert response.status is True
+    assert "secret" in response.description
+    assert VaultStorage.cache.stats()["hits"] >= 1
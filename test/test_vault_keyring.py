@@ -0,0 +1,78 @@
+import pytest
+import threading
+from src.commands.commandExecutor import CommandExecutor
+from src.commands.command import Command
+from cryptographing.vaultCipher import VaultCipher
+from cryptographing.vaultKeyring import VaultKeyring
+from storage.vaultStorage import VaultStorage
+
+def testNewVaultGetsItsOwnDataKey(vault_storage):
+    """
+    Test that passwords are encrypted with a per-vault data key stored wrapped in the vault header.
+    """
+    executor = CommandExecutor("alice")
+    assert executor.executeOperation(Command("save-password", ["a.com", "alice", "secret", "work"])).status
+    assert executor.executeOperation(Command("save-password", ["b.com", "alice", "other", "social"])).status
+
+    userCipher = executor.keyring.userCipher
+    workKey = VaultKeyring.unwrapHeader(VaultStorage.getVaultHeader("alice", "work"), userCipher)
+    socialKey = VaultKeyring.unwrapHeader(VaultStorage.getVaultHeader("alice", "social"), userCipher)
+
+    assert workKey != socialKey
+    assert VaultCipher(workKey).decrypt(VaultStorage.getEntry("alice", "work", "a.com")["password"].encode()) == b"secret"
+
+    VaultStorage.cache.clear()
+    response = CommandExecutor("alice").executeOperation(Command("get", ["password", "a.com", "work"]))
+    assert "secret" in response.description
+
+def testLegacyVaultKeepsUsingTheUserKey(vault_storage):
+    """
+    Test that a vault written before envelope encryption stays readable and is not given a data key.
+    """
+    userCipher = VaultCipher(VaultCipher.generateKey())
+    VaultStorage.createVault("alice", "work")
+    VaultStorage.putEntry("alice", "work", "a.com", {"username": "alice", "password": userCipher.encrypt(b"secret").decode()})
+
+    keyring = VaultKeyring("alice", userCipher)
+
+    assert keyring.cipherFor("work") is userCipher
+    assert VaultStorage.getVaultHeader("alice", "work") is None
+
+def testDataKeyIsUnwrappedOnceAndNeedsTheUserKey(vault_storage):
+    """
+    Test that a vault is unlocked lazily once per keyring and that another user key cannot unwrap it.
+    """
+    userCipher = VaultCipher(VaultCipher.generateKey())
+    VaultStorage.createVault("alice", "work")
+
+    keyring = VaultKeyring("alice", userCipher)
+    assert keyring.ciphers == {}
+    assert keyring.cipherFor("work") is keyring.cipherFor("work")
+
+    with pytest.raises(ValueError):
+        VaultKeyring("alice", VaultCipher(VaultCipher.generateKey())).cipherFor("work")
+
+    rewrapped = VaultKeyring.rewrapHeader(VaultStorage.getVaultHeader("alice", "work"), userCipher, VaultCipher(VaultCipher.generateKey()))
+    assert rewrapped != VaultStorage.getVaultHeader("alice", "work")
+
+@pytest.mark.parametrize("command", [
+    Command("save-password", ["a.com", "alice", "secret", "work"]),
+    Command("generate-password", ["a.com", "alice", "work"]),
+    Command("generate-batch", ["work", "alice", "a.com", "b.com"]),
+])
+def testCipherIsResolvedUnderTheVaultLockOfTheWrite(vault_storage, command):
+    """
+    Test that the vault cipher is chosen while holding the lock a re-encryption needs, so a vault cannot be
+    migrated to a data key between choosing the cipher and appending the entry.
+    """
+    executor = CommandExecutor("alice")
+    cipherFor = executor.keyring.cipherFor
+    heldLock = []
+
+    def checkedCipherFor(category):
+        heldLock.append(VaultStorage.vaultLock("alice", category).writer == threading.get_ident())
+        return cipherFor(category)
+
+    executor.keyring.cipherFor = checkedCipherFor
+    assert executor.executeOperation(command).status is True
+    assert heldLock == [True]